@@ -0,0 +1,146 @@
+'''
+Compare the CPU time taken per frame to draw many game items, one draw call
+per item as Render.draw_world_items does, and in one draw call using a Batch,
+which uploads every item's transform as a single buffer.
+
+No OpenGL context is needed: GL functions are replaced by ones which only
+count their calls, so this measures the Python and driver-call overhead per
+frame, not the time the GPU takes to draw.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_batch.py [item_count ...]
+'''
+from __future__ import division, print_function
+
+import random
+import sys
+from timeit import default_timer
+
+import numpy
+from OpenGL import GL
+
+from gloopy.color import Color
+from gloopy.gameitem import GameItem
+from gloopy.geom.orientation import Orientation
+from gloopy.geom.vector import Vector
+from gloopy.shapes.cube import Cube
+from gloopy.view import batch, glyph, render, vertex_format
+from gloopy.view.batch import Batch, merge_shapes
+from gloopy.view.glyph import Glyph
+
+
+IDENTITY = numpy.identity(4, dtype=numpy.float32)
+
+
+class CountingGL(object):
+    '''
+    Stands in for an OpenGL module. GL functions do nothing but count how
+    often they are called.
+    '''
+    def __init__(self):
+        self.count = 0
+
+    def __getattr__(self, name):
+        if not name.startswith('gl'):
+            return getattr(GL, name)
+        def call(*args):
+            self.count += 1
+            return 1
+        return call
+
+
+class FakeShader(object):
+
+    attrib = dict(position=0, color=1, normal=2, item=3)
+
+    def use(self):
+        pass
+
+    def set_matrix(self, name, matrix):
+        # as Shader.set_matrix, which makes one GL call
+        batch.GL.glUniformMatrix4fv(0, 1, False, matrix)
+
+    @staticmethod
+    def unuse():
+        pass
+
+
+def make_items(count):
+    shapes = [Cube(1, color) for color in (Color.Red, Color.Green)]
+    return [
+        GameItem(
+            shape=random.choice(shapes),
+            position=Vector.RandomCube(100),
+            orientation=Orientation(Vector.RandomSphere(1)),
+        )
+        for _ in range(count)
+    ]
+
+
+class FakeRender(object):
+
+    class projection(object):
+        matrix = IDENTITY
+
+    class modelview(object):
+        matrix = IDENTITY
+
+
+def per_item_frame(items, glyphs):
+    render.Render.draw_world_items(FakeRender, [
+        (item.transform.array, glyphs[id(item.shape)])
+        for item in items
+    ])
+
+
+def timed(function, *args):
+    start = default_timer()
+    function(*args)
+    return default_timer() - start
+
+
+def bench(count, gl):
+    items = make_items(count)
+
+    glyphs = {}
+    for item in items:
+        if id(item.shape) not in glyphs:
+            glyphs[id(item.shape)] = Glyph(
+                *merge_shapes([item.shape])[:2], shader=FakeShader())
+    gl.count = 0
+    per_item = timed(per_item_frame, items, glyphs)
+    per_item_calls = gl.count
+
+    merge = timed(merge_shapes, [item.shape for item in items])
+
+    b = Batch(FakeShader())
+    for item in items:
+        b.add(item)
+    b.draw(IDENTITY, IDENTITY)
+    gl.count = 0
+    batched = timed(b.draw, IDENTITY, IDENTITY)
+    batched_calls = gl.count
+
+    print(
+        '%6d items  per item %7.4fs %7d GL calls  batched %7.4fs %3d GL calls'
+        '  x%-4.0f merge %.3fs' % (
+            count, per_item, per_item_calls, batched, batched_calls,
+            per_item / batched, merge,
+        )
+    )
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [512, 5000, 50000]
+    gl = CountingGL()
+    render.gl = glyph.GL = vertex_format.GL = batch.GL = gl
+    # Shader.unuse calls OpenGL directly
+    render.Shader = FakeShader
+    random.seed(0)
+    for count in counts:
+        bench(count, gl)
+
+
+if __name__ == '__main__':
+    main()
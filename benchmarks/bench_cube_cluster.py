@@ -0,0 +1,83 @@
+'''
+Compare the triangle count and build time of cube clusters built three
+ways: the original one Cube per location in a MultiShape, CubeCluster
+(which omits hidden faces), and CubeCluster with greedy meshing.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_cube_cluster.py [radius]
+'''
+from __future__ import division, print_function
+
+import sys
+from itertools import product
+from timeit import default_timer
+
+import numpy
+import pyglet
+# loading bitmaps does not need a window
+pyglet.options['shadow_window'] = False
+
+from gloopy.color import Color
+from gloopy.geom.vector import Vector
+from gloopy.shapes.cube import Cube
+from gloopy.shapes.cube_groups import BitmapAsDict, CubeCluster
+from gloopy.shapes.multishape import MultiShape
+from gloopy.view.shape_to_glyph import shape_to_arrays
+
+
+def naive_cube_cluster(locations, edge):
+    multi = MultiShape()
+    for location, color in locations.items():
+        multi.add(
+            Cube(edge=edge, colors=color),
+            position=Vector(*location),
+        )
+    return multi
+
+
+def voxel_ball(radius, edge):
+    '''
+    Return locations of a solid ball of cubes, in horizontal bands of color.
+    '''
+    colors = [Color.Red, Color.Yellow, Color.Blue]
+    return dict(
+        (
+            (x * edge, y * edge, z * edge),
+            colors[(y // 4) % len(colors)]
+        )
+        for x, y, z in product(range(-radius, radius + 1), repeat=3)
+        if x * x + y * y + z * z <= radius * radius
+    )
+
+
+def triangles(shape):
+    return int((numpy.diff(shape.face_offsets) - 2).sum())
+
+
+def bench(name, locations, edge):
+    print('%s: %d cubes' % (name, len(locations)))
+    for label, build in [
+        ('one Cube per location', naive_cube_cluster),
+        ('CubeCluster', CubeCluster),
+        ('CubeCluster greedy', lambda l, e: CubeCluster(l, e, greedy=True)),
+    ]:
+        start = default_timer()
+        shape = build(locations, edge)
+        built = default_timer()
+        vertices, _ = shape_to_arrays(shape)
+        converted = default_timer()
+        print('    %-22s %8d triangles  build %6.3fs  to arrays %6.3fs' % (
+            label, triangles(shape), built - start, converted - built
+        ))
+
+
+def main():
+    radius = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for filename in ['invader1.png', 'invader2.png']:
+        bench(filename, BitmapAsDict(filename, edge=10), 10)
+    bench('voxel ball radius %d' % (radius,), voxel_ball(radius, 2), 2)
+
+
+if __name__ == '__main__':
+    main()
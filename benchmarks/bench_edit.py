@@ -0,0 +1,62 @@
+'''
+Compare the time taken to build the fractal tetrahedron (subdivide then
+stellate, eight times), and the number of change notifications sent:
+
+* calling each modifier on its own, so each recalculates normals and
+  notifies listeners when it finishes,
+* making all the calls within a single Shape.edit, as FractalTetra does.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_edit.py [iterations]
+'''
+from __future__ import division, print_function
+
+import math
+import sys
+from timeit import default_timer
+
+import numpy
+
+from gloopy.color import Color
+from gloopy.shapes.stellate import stellate
+from gloopy.shapes.subdivide import subdivide
+from gloopy.shapes.tetrahedron import Tetrahedron
+
+
+def modify(shape, iterations):
+    for i in range(iterations):
+        faces = numpy.flatnonzero(shape.face_categories == 0)
+        subdivide(shape, color=Color.Blue.tinted(Color.Red, i / 5))
+        stellate(shape, faces=faces, height=math.sqrt(2))
+
+
+def separately(shape, iterations):
+    modify(shape, iterations)
+
+
+def in_one_edit(shape, iterations):
+    with shape.edit():
+        modify(shape, iterations)
+
+
+def time(function, iterations):
+    shape = Tetrahedron(1, Color.Red)
+    notifications = []
+    shape.changed += notifications.append
+    start = default_timer()
+    function(shape, iterations)
+    # normals are needed to convert the shape to a glyph
+    shape.face_normals
+    return default_timer() - start, len(notifications), len(shape.faces)
+
+
+def main(iterations=8):
+    for function in [separately, in_one_edit]:
+        seconds, notifications, faces = time(function, iterations)
+        print('%-12s %7.3fs  %3d notifications  %d faces' % (
+            function.__name__, seconds, notifications, faces))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
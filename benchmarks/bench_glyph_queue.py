@@ -0,0 +1,97 @@
+'''
+Compare the time spent in World.add when populating the world with many
+items of distinct shapes: converting every glyph inside the item_added
+listener, as Render used to, or queueing them in a GlyphQueue, which then
+converts them across frames within a per-frame budget.
+
+No OpenGL context is needed: GL functions are replaced by ones which do
+nothing, so this measures the CPU cost of conversion.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_glyph_queue.py [item_count]
+'''
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+from OpenGL import GL
+
+from gloopy.color import Color
+from gloopy.gameitem import GameItem
+from gloopy.geom.vector import Vector
+from gloopy.shapes.cube import TruncatedCube
+from gloopy.view import glyph, vertex_format
+from gloopy.view.glyph import Glyph
+from gloopy.view.glyph_cache import GlyphCache
+from gloopy.view.glyph_queue import GlyphQueue
+from gloopy.view.modelview import look_at
+from gloopy.view.shape_to_glyph import shape_to_arrays
+from gloopy.world import World
+
+
+BUDGET = 0.004
+
+
+class NullGL(object):
+    '''
+    Stands in for an OpenGL module. GL functions do nothing.
+    '''
+    def __getattr__(self, name):
+        if not name.startswith('gl'):
+            return getattr(GL, name)
+        return lambda *args: 1
+
+
+class FakeShader(object):
+
+    attrib = dict(position=0, color=1, normal=2)
+
+
+def convert(shape):
+    return Glyph(*shape_to_arrays(shape), shader=FakeShader())
+
+
+def populate(world, count):
+    start = default_timer()
+    for index in range(count):
+        world.add(GameItem(
+            shape=TruncatedCube(1, 0.5, Color.Random(), Color.Random()),
+            position=Vector.RandomSphere(100),
+        ))
+    return default_timer() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    glyph.GL = vertex_format.GL = NullGL()
+
+    world = World()
+    glyphs = GlyphCache(convert)
+    def acquire(item):
+        item.glyph = [glyphs.acquire(item.shape)]
+    world.item_added += acquire
+    print('%d items, converted in World.add:  %.3fs in one frame' % (
+        count, populate(world, count)))
+
+    world = World()
+    queue = GlyphQueue(GlyphCache(convert))
+    world.item_added += queue.add
+    added = populate(world, count)
+    view = look_at((0, 0, 0), (0, 0, -1), (0, 1, 0))
+    frames = 0
+    longest = 0
+    while len(queue):
+        start = default_timer()
+        queue.convert(view, BUDGET)
+        longest = max(longest, default_timer() - start)
+        frames += 1
+    print(
+        '%d items, queued:  %.3fs in World.add, then %d frames of at most '
+        '%.4fs' % (count, added, frames, longest)
+    )
+
+
+if __name__ == '__main__':
+    main()
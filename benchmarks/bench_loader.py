@@ -0,0 +1,68 @@
+'''
+Compare the longest stall of the main loop when adding the 64k cube
+RgbCubeCluster: building it inside the key handler, as Controller.add_shape
+does, or on a Loader's background thread, as Controller.build_shape does,
+while the main thread keeps running simulated 60fps frames.
+
+Glyph conversion is included, via a stand-in for Render.prepare, but OpenGL
+upload is not, so no context is needed.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_loader.py [cube_count]
+'''
+from __future__ import division, print_function
+
+import random
+import sys
+import time
+from timeit import default_timer
+
+from gloopy.loader import Loader
+from gloopy.shapes.cube_groups import RgbCubeCluster
+from gloopy.view.render import STREAM_FACES
+from gloopy.view.shape_to_glyph import glyph_factory
+from gloopy.world import World
+
+
+FRAME = 1 / 60
+
+
+def build(cube_count):
+    random.seed(0)
+    return RgbCubeCluster(edge=4, cube_count=cube_count, scale=2, hole=15)
+
+
+def prepare(shape):
+    glyph_factory(shape, chunk_faces=STREAM_FACES, preload=True)
+
+
+def main():
+    cube_count = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+
+    start = default_timer()
+    prepare(build(cube_count))
+    print('in key handler:  one frame of %.3fs' % (default_timer() - start,))
+
+    world = World()
+    loader = Loader(world)
+    loader.prepare = prepare
+    loader.add(lambda: build(cube_count))
+    frames = 0
+    longest = 0
+    last = start = default_timer()
+    while loader.loading:
+        time.sleep(FRAME)
+        loader.update()
+        now = default_timer()
+        longest = max(longest, now - last)
+        last = now
+        frames += 1
+    print(
+        'on loader:       %.3fs over %d frames, longest frame %.3fs' % (
+            default_timer() - start, frames, longest)
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''
+Compare the time taken by the Ctrl-key shape modifiers on a large shape, a
+tetrahedron subdivided until it has hundreds of thousands of faces:
+
+* calling extrude_face and stellate_face once per face, and normalizing a
+  list of Vectors, as the modifiers originally did,
+* extrude, stellate and normalize, which modify all the selected faces at
+  once using FaceBatch.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_modifiers.py [subdivisions]
+'''
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+from gloopy.color import Color
+from gloopy.shapes.extrude import extrude, extrude_face
+from gloopy.shapes.normalize import normalize
+from gloopy.shapes.stellate import stellate, stellate_face
+from gloopy.shapes.subdivide import subdivide
+from gloopy.shapes.tetrahedron import Tetrahedron
+
+
+def each_extrude(shape, offset):
+    new_category = shape.next_category()
+    for face in range(len(shape.faces)):
+        extrude_face(shape, face, offset, new_category)
+
+
+def each_stellate(shape, height):
+    for face in range(len(shape.faces)):
+        stellate_face(shape, face, height)
+
+
+def each_normalize(shape):
+    shape.vertices = [v.normalized(1) for v in shape.vertices]
+
+
+MODIFIERS = [
+    ('extrude', each_extrude, lambda shape: extrude(shape, None, 0.5), 0.5),
+    ('stellate', each_stellate, lambda shape: stellate(shape, None, 1), 1),
+    ('stellate in', each_stellate,
+        lambda shape: stellate(shape, None, -0.33), -0.33),
+    ('normalize', each_normalize, normalize, None),
+]
+
+
+def large_shape(subdivisions):
+    shape = Tetrahedron(1, Color.Red)
+    for _ in range(subdivisions):
+        subdivide(shape, color=Color.Blue)
+    return shape
+
+
+def time(function, shape, *args):
+    start = default_timer()
+    function(shape, *args)
+    # include recalculating normals, as converting to a glyph would
+    shape.face_normals
+    return default_timer() - start
+
+
+def main(subdivisions=8):
+    print('%d faces' % (len(large_shape(subdivisions).faces),))
+    for name, each_face, batched, argument in MODIFIERS:
+        arguments = () if argument is None else (argument,)
+        before = time(each_face, large_shape(subdivisions), *arguments)
+        after = time(batched, large_shape(subdivisions))
+        print('%-12s per face %7.3fs  batched %7.3fs' % (name, before, after))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,98 @@
+'''
+Compare the time taken to flatten the nested MultiShapes of the coaxial rings
+scene (Controller.add_coaxial_rings: Rings of CubeCross MultiShapes) into a
+single mesh:
+
+* transforming one vertex at a time with Matrix * Vector and then
+  recalculating every face normal, as MultiShape originally did,
+* transforming each child's vertex array in one call, then recalculating
+  every face normal,
+* MultiShape.compile, which transforms all copies of each distinct child
+  shape in one call and rotates their existing normals.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_multishape.py [ring_count]
+'''
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+import numpy
+
+from gloopy.color import Color
+from gloopy.geom.vector import Vector
+from gloopy.shapes.cube_groups import CubeCross
+from gloopy.shapes.multishape import MultiShape
+from gloopy.shapes.ring import Ring, TriRings
+from gloopy.shapes.shape import get_normals
+from gloopy.view.shape_to_glyph import shape_to_arrays
+
+
+def coaxial_rings(count):
+    scene = MultiShape()
+    for index in range(count):
+        height = index - count // 2
+        radius = 3 + index % 8
+        scene.add(
+            Ring(
+                CubeCross(4, Color.Blue, Color.White),
+                radius * 6,
+                int(radius * 5),
+            ),
+            position=Vector(0, height * 6, 0),
+        )
+    return scene
+
+
+def legacy_flatten(shape):
+    vertices = numpy.array([
+        list(transform * vertex)
+        for child, transform in shape.children
+        for vertex in child.vertices
+    ])
+    indices = shape.face_indices
+    offsets = shape.face_offsets
+    return vertices, get_normals(vertices, indices, offsets[:-1])
+
+
+def per_child_flatten(shape):
+    vertices = numpy.concatenate([
+        transform.transform_vertices(child.vertices.array)
+        for child, transform in shape.children
+    ])
+    indices = shape.face_indices
+    offsets = shape.face_offsets
+    return vertices, get_normals(vertices, indices, offsets[:-1])
+
+
+def timed(function, *args):
+    start = default_timer()
+    function(*args)
+    return default_timer() - start
+
+
+def bench(name, shape):
+    # build the cached child lists and face arrays before timing
+    shape.children
+    shape.face_normals
+    legacy = timed(legacy_flatten, shape)
+    per_child = timed(per_child_flatten, shape)
+    compiled = timed(shape.compile)
+    compiled_glyph = timed(lambda: shape_to_arrays(shape.compile()))
+    print('%s, %d vertices' % (name, len(shape.vertices)))
+    print('  per vertex:                 %.4fs' % (legacy,))
+    print('  per child:                  %.4fs' % (per_child,))
+    print('  compile:                    %.4fs' % (compiled,))
+    print('  compile + shape_to_arrays:  %.4fs' % (compiled_glyph,))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 21
+    bench('coaxial rings (%d)' % (count,), coaxial_rings(count))
+    bench('TriRings', TriRings(CubeCross(4, Color.Red, Color.Blue), 60, 50))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+Time generating the 64k cube RgbCubeCluster, and converting it to glyph
+arrays, serially and with the work split across pools of worker processes.
+Speedups depend on the number of cores available.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_parallel.py [cube_count]
+'''
+from __future__ import division, print_function
+
+import os
+import random
+import sys
+from timeit import default_timer
+
+from gloopy.shapes.cube_groups import RgbCubeCluster
+from gloopy.util.parallel import get_pool
+from gloopy.view.shape_to_glyph import shape_to_arrays
+from gloopy.view.vertex_format import PACKED
+
+
+def timed(function, *args, **kwargs):
+    start = default_timer()
+    result = function(*args, **kwargs)
+    return default_timer() - start, result
+
+
+def main():
+    cube_count = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    print('%d cores, %d cubes' % (os.cpu_count(), cube_count))
+    for workers in [None, 2, 4, 8]:
+        if workers:
+            # start the pool's processes before timing
+            list(get_pool(workers).map(abs, range(workers)))
+        random.seed(0)
+        generate, shape = timed(
+            RgbCubeCluster, edge=4, cube_count=cube_count, scale=2,
+            hole=15, workers=workers,
+        )
+        convert, _ = timed(shape_to_arrays, shape, PACKED, workers=workers)
+        print(
+            'workers %-4s  generate %.3fs  shape_to_arrays %.3fs' % (
+                workers or 1, generate, convert)
+        )
+
+
+if __name__ == '__main__':
+    main()
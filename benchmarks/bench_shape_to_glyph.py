@@ -0,0 +1,92 @@
+'''
+Compare the time taken to convert large shapes into Glyph vertex and index
+arrays, using the original face-by-face loop and the vectorized
+shape_to_arrays. No OpenGL context is needed.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_shape_to_glyph.py [cube_count]
+'''
+from __future__ import division, print_function
+
+import random
+import sys
+from itertools import chain
+from timeit import default_timer
+
+from gloopy.color import Color
+from gloopy.shapes.cube_groups import CubeGlob, RgbCubeCluster
+from gloopy.view.glyph import GL, get_index_type, glarray
+from gloopy.view.shape_to_glyph import shape_to_arrays
+
+
+def legacy_tessellate(indices):
+    for index in range(1, len(indices) - 1):
+        yield indices[0]
+        yield indices[index]
+        yield indices[index + 1]
+
+
+def legacy_shape_to_arrays(shape):
+    '''
+    The face by face conversion which shape_to_arrays replaced, including the
+    copy into ctypes arrays which Glyph used to do.
+    '''
+    vertices = []
+    indices = []
+    next_index = 0
+    for face in shape.faces:
+        new_indices = {}
+        for old_index in face.indices:
+            vertices.extend( chain(
+                shape.vertices[old_index], face.color, face.normal
+            ) )
+            new_indices[old_index] = next_index
+            next_index += 1
+        indices.extend(
+            new_indices[old_index]
+            for old_index in legacy_tessellate(face.indices)
+        )
+    carray = (GL.GLfloat * len(vertices))()
+    carray[:] = vertices
+    index_type = get_index_type(len(vertices) // 10)
+    iarray = (index_type * len(indices))()
+    iarray[:] = indices
+    return carray, iarray
+
+
+def vectorized_shape_to_arrays(shape):
+    vertices, indices = shape_to_arrays(shape)
+    return glarray(GL.GLfloat, vertices), indices
+
+
+def timed(function, shape):
+    start = default_timer()
+    function(shape)
+    return default_timer() - start
+
+
+def bench(name, shape):
+    # MultiShape caches its flattened arrays, so build those before timing
+    # either conversion
+    shape.face_normals
+    legacy = timed(legacy_shape_to_arrays, shape)
+    vectorized = timed(vectorized_shape_to_arrays, shape)
+    print('%-28s %8d faces  legacy %7.3fs  vectorized %7.3fs  x%.0f' % (
+        name, len(shape.face_colors), legacy, vectorized, legacy / vectorized
+    ))
+
+
+def main():
+    cube_count = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+    random.seed(0)
+    bench(
+        'RgbCubeCluster(%d)' % (cube_count,),
+        RgbCubeCluster(edge=4, cube_count=cube_count, scale=2, hole=15),
+    )
+    random.seed(0)
+    bench('CubeGlob(2000)', CubeGlob(8, 150, 2000, Color.Red))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''
+Compare how many item orientations per second the Spinner and WobblySpinner
+movers can update: rebuilding an Orientation every tick, as they used to, or
+composing the quaternion held by each item's Transform in place. Both include
+producing the matrix that is drawn: Orientation.matrix for the former, the
+Transform's array for the latter, which it keeps up to date.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_spin.py [item_count]
+'''
+from __future__ import division, print_function
+
+import sys
+from math import cos, sin
+from timeit import default_timer
+
+from gloopy.gameitem import GameItem
+from gloopy.geom.orientation import Orientation
+from gloopy.geom.vector import Vector
+from gloopy.move import Spinner, WobblySpinner
+
+
+def legacy_spin(item, axis, dt):
+    item.legacy = item.legacy.rotate(axis, dt)
+    item.legacy.matrix
+
+
+def legacy_wobble(item, time, dt):
+    orientation = item.legacy.pitch(sin(time) * dt)
+    item.legacy = orientation.roll(cos(time * 1.5) * dt)
+    item.legacy.matrix
+
+
+def rate(update, items):
+    start = default_timer()
+    for frame in range(3):
+        for item in items:
+            update(item, frame / 60, 1 / 60)
+    return 3 * len(items) / (default_timer() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    axis = Vector(1, 2, 3).normalized()
+    items = [
+        GameItem(orientation=Orientation.Random(), legacy=Orientation())
+        for _ in range(count)
+    ]
+    spinner = Spinner(axis)
+    wobbly = WobblySpinner()
+    for name, legacy, update in [
+        ('Spinner', lambda i, t, dt: legacy_spin(i, axis, dt), spinner),
+        ('WobblySpinner', legacy_wobble, wobbly),
+    ]:
+        before = rate(legacy, items)
+        after = rate(update, items)
+        print('%-14s Orientation %8.0f/s  Transform %8.0f/s  x%.1f' % (
+            name, before, after, after / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''
+Compare the longest single stall caused by adding the 64k cube RgbCubeCluster
+to the world: converting and uploading its whole glyph at once, as
+shape_to_glyph does by default, or streaming it as a StreamingGlyph, one
+chunk per call to upload_next, as Render does over successive frames.
+
+No OpenGL context is needed: GL functions are replaced by ones which do
+nothing, so this measures the CPU time of conversion, not of the driver
+copying buffers to the GPU, which is spread across frames in the same way.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_stream.py [cube_count]
+'''
+from __future__ import division, print_function
+
+import random
+import sys
+from timeit import default_timer
+
+from OpenGL import GL
+
+from gloopy.shapes.cube_groups import RgbCubeCluster
+from gloopy.view import glyph, render, vertex_format
+from gloopy.view.glyph import Glyph, StreamingGlyph
+from gloopy.view.shape_to_glyph import shape_to_arrays, stream_arrays
+
+
+class NullGL(object):
+    '''
+    Stands in for an OpenGL module. GL functions do nothing.
+    '''
+    def __getattr__(self, name):
+        if not name.startswith('gl'):
+            return getattr(GL, name)
+        return lambda *args: 1
+
+
+class FakeShader(object):
+
+    attrib = dict(position=0, color=1, normal=2)
+
+
+def main():
+    cube_count = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    glyph.GL = vertex_format.GL = NullGL()
+    random.seed(0)
+    shape = RgbCubeCluster(edge=4, cube_count=cube_count, scale=2, hole=15)
+    print('%d cubes, %d faces' % (cube_count, len(shape.face_colors)))
+
+    start = default_timer()
+    Glyph(*shape_to_arrays(shape), shader=FakeShader())
+    print('all at once:  %.3fs in one frame' % (default_timer() - start,))
+
+    start = default_timer()
+    chunks, vertex_count, index_count, format = stream_arrays(
+        shape, chunk_faces=render.STREAM_FACES)
+    streamed = StreamingGlyph(
+        chunks, vertex_count, index_count, FakeShader(), format)
+    longest = created = default_timer() - start
+    frames = 0
+    while True:
+        start = default_timer()
+        uploaded = streamed.upload_next()
+        longest = max(longest, default_timer() - start)
+        if not uploaded:
+            break
+        frames += 1
+    print(
+        'streamed:     %.3fs to create, then %d chunks, longest frame %.3fs'
+        % (created, frames, longest)
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+'''
+Compare the time taken to repeatedly subdivide every face of a tetrahedron,
+as the fractal tetrahedron does:
+
+* calling subdivide_face once per face, as subdivide originally did,
+* subdivide, which splits all the selected faces with array operations.
+
+Usage, from the project root:
+
+    PYTHONPATH=src python benchmarks/bench_subdivide.py [iterations]
+'''
+from __future__ import division, print_function
+
+import sys
+from timeit import default_timer
+
+from gloopy.color import Color
+from gloopy.shapes.subdivide import subdivide, subdivide_face
+from gloopy.shapes.tetrahedron import Tetrahedron
+
+
+def each_face(shape, color):
+    edges = {}
+    new_category = shape.next_category()
+    for face in range(len(shape.faces)):
+        subdivide_face(shape, face, edges, color, new_category)
+
+
+def batched(shape, color):
+    subdivide(shape, color=color)
+
+
+def time(function, iterations):
+    shape = Tetrahedron(1, Color.Red)
+    start = default_timer()
+    for _ in range(iterations):
+        function(shape, Color.Blue)
+    return default_timer() - start, len(shape.faces)
+
+
+def main(iterations=7):
+    for name, function in [('per face', each_face), ('batched', batched)]:
+        seconds, faces = time(function, iterations)
+        print('%-10s %8.3fs  %d faces' % (name, seconds, faces))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
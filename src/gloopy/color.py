@@ -1,7 +1,7 @@
 from __future__ import division
 
+import random
 from collections import namedtuple
-from random import uniform
 
 
 
@@ -47,14 +47,15 @@ class Color(namedtuple('__BaseColor', 'r g b a')):
 
 
     @staticmethod
-    def Random():
+    def Random(rng=random):
         '''
-        Return a new random color
+        Return a new random color. `rng` is the random number generator
+        used, such as a random.Random instance, by default the global one.
         '''
         return Color(
-            uniform(0, Color.CHANNEL_MAX),
-            uniform(0, Color.CHANNEL_MAX),
-            uniform(0, Color.CHANNEL_MAX),
+            rng.uniform(0, Color.CHANNEL_MAX),
+            rng.uniform(0, Color.CHANNEL_MAX),
+            rng.uniform(0, Color.CHANNEL_MAX),
         )
 
 
@@ -1,6 +1,6 @@
 
 from .geom.vector import Vector
-from .geom.orientation import Orientation
+from .geom.transform import Transform
 
 
 class GameItem(object):
@@ -20,6 +20,12 @@ class GameItem(object):
         ``orientation``: specified as an
         :class:`~gloopy.geom.orientation.Orientation`.
 
+        ``position`` and ``orientation`` are both stored in ``transform``, a
+        :class:`~gloopy.geom.transform.Transform`, which is what Render draws
+        the item with. Getting either returns a new Vector or Orientation,
+        so movers which update them every frame should rather modify
+        ``transform`` in place.
+
         ``update``: a callable, of the signature:
         
             .. function:: update(self, time, dt)
@@ -31,9 +37,11 @@ class GameItem(object):
         you could use to move this item.
 
         ``glyph``: is used to store the shape converted into a VBO which OpenGL
-        can render. If you update a ``GameItem`` shape, you must also update
-        its glyph attribute using
-        :func:`~gloopy.view.shape_to_glyph.shape_to_glyph`.
+        can render. If you replace or modify a ``GameItem`` shape after adding
+        it to the world, you must call
+        :meth:`~gloopy.world.World.changed` to update its glyph, unless you
+        modify a Shape within :meth:`~gloopy.shapes.shape.Shape.edit`, as
+        shape modifiers do, which calls it for you.
 
         In addition, the attribute ``.id`` is assigned a unique integer.
     '''
@@ -47,11 +55,10 @@ class GameItem(object):
         self.shape = None
         self.glyph = None
 
-        self.position = Vector.origin
+        self.transform = Transform()
         self.velocity = None
         self.acceleration = None
 
-        self.orientation = Orientation.Identity
         self.angular_velocity = None
 
         self.update = None
@@ -69,6 +76,24 @@ class GameItem(object):
         )
 
 
+    def _get_position(self):
+        return self.transform.position
+
+    def _set_position(self, position):
+        self.transform.position = position
+
+    position = property(_get_position, _set_position)
+
+
+    def _get_orientation(self):
+        return self.transform.orientation
+
+    def _set_orientation(self, orientation):
+        self.transform.orientation = orientation
+
+    orientation = property(_get_orientation, _set_orientation)
+
+
     def _apply_kwargs(self, **kwargs):
         '''
         Attach the given kwargs as attributes on self
@@ -80,8 +105,16 @@ class GameItem(object):
                 if not isinstance(kwargs[attr], Vector):
                     kwargs[attr] = Vector(*kwargs[attr])
 
-        # attach all passed kwargs to ourself as attributes
+        # attach all passed kwargs to ourself as attributes. The properties
+        # must be set after any given transform.
+        properties = [
+            (attr, kwargs.pop(attr))
+            for attr in ['position', 'orientation']
+            if attr in kwargs
+        ]
         self.__dict__.update(kwargs)
+        for attr, value in properties:
+            setattr(self, attr, value)
 
 
 def position_or_gameitem(item):
@@ -1,4 +1,6 @@
 
+import numpy
+
 from .vector import Vector
 
 
@@ -9,13 +11,21 @@ class Matrix(object):
     .. function:: __init__(self, position=None, orientation=None)
 
         Creates a matrix representing the given orientation and offset.
+
+    `elements` is a contiguous array of 16 float64, in row-major order, with
+    the position in the last column. ``numpy.asarray(matrix)`` returns it as
+    a 4x4 view, uncopied. OpenGL expects column-major order, so `elements`
+    can only be passed to it uncopied by functions which transpose, such as
+    glMultTransposeMatrixd, or glUniformMatrix4dv with `transpose` GL_TRUE.
+    For the others, such as glMultMatrixd, use :attr:`column_major`.
     '''
     # ugly hack: orientation.py populates this to prevent cyclic imports
     _zero_rotation = None
 
     def __init__(self, position=None, orientation=None, elements=None):
-        if elements:
-            self.elements = elements
+        if elements is not None:
+            self.elements = numpy.ascontiguousarray(
+                elements, dtype=numpy.float64).reshape(16)
         else:
             if position is None:
                 position = Vector.origin
@@ -23,15 +33,36 @@ class Matrix(object):
                 orientation = Matrix._zero_rotation
             p = position
             o = orientation
-            self.elements = [
+            self.elements = numpy.array([
                   o.right.x,    o.right.y,    o.right.z, p.x,
                      o.up.x,       o.up.y,       o.up.z, p.y,
                -o.forward.x, -o.forward.y, -o.forward.z, p.z,
                           0,            0,            0,   1,
-            ]
+            ], dtype=numpy.float64)
 
     def __iter__(self):
-        return self.elements.__iter__()
+        return iter(self.elements.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.elements.reshape(4, 4)
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    @property
+    def array(self):
+        '''
+        The elements as a 4x4 array, sharing their memory.
+        '''
+        return self.elements.reshape(4, 4)
+
+    @property
+    def column_major(self):
+        '''
+        A new contiguous array of the 16 elements in OpenGL's column-major
+        order, as expected by glMultMatrixd and glLoadMatrixd.
+        '''
+        return numpy.ascontiguousarray(self.array.T).reshape(16)
 
     def __mul__(self, other):
         '''
@@ -40,61 +71,36 @@ class Matrix(object):
         our position.)
         '''
         if isinstance(other, Matrix):
-            sa = self.elements[0]
-            sb = self.elements[1]
-            sc = self.elements[2]
-            sd = self.elements[3]
-            se = self.elements[4]
-            sf = self.elements[5]
-            sg = self.elements[6]
-            sh = self.elements[7]
-            si = self.elements[8]
-            sj = self.elements[9]
-            sk = self.elements[10]
-            sl = self.elements[11]
-            sm = self.elements[12]
-            sn = self.elements[13]
-            so = self.elements[14]
-            sp = self.elements[15]
-            oa = other.elements[0]
-            ob = other.elements[1]
-            oc = other.elements[2]
-            od = other.elements[3]
-            oe = other.elements[4]
-            of = other.elements[5]
-            og = other.elements[6]
-            oh = other.elements[7]
-            oi = other.elements[8]
-            oj = other.elements[9]
-            ok = other.elements[10]
-            ol = other.elements[11]
-            om = other.elements[12]
-            on = other.elements[13]
-            oo = other.elements[14]
-            op = other.elements[15]
-            return Matrix(elements=[
-                sa * oa + sb * oe + sc * oi + sd * om,
-                sa * ob + sb * of + sc * oj + sd * on,
-                sa * oc + sb * og + sc * ok + sd * oo,
-                sa * od + sb * oh + sc * ol + sd * op,
-                se * oa + sf * oe + sg * oi + sh * om,
-                se * ob + sf * of + sg * oj + sh * on,
-                se * oc + sf * og + sg * ok + sh * oo,
-                se * od + sf * oh + sg * ol + sh * op,
-                si * oa + sj * oe + sk * oi + sl * om,
-                si * ob + sj * of + sk * oj + sl * on,
-                si * oc + sj * og + sk * ok + sl * oo,
-                si * od + sj * oh + sk * ol + sl * op,
-                sm * oa + sn * oe + so * oi + sp * om,
-                sm * ob + sn * of + so * oj + sp * on,
-                sm * oc + sn * og + so * ok + sp * oo,
-                sm * od + sn * oh + so * ol + sp * op,
-            ])
+            return Matrix(elements=self.array @ other.array)
         elif isinstance(other, Vector):
-            e = self.elements
-            return Vector(
-                other.x * e[0] + other.y * e[1] + other.z * e[2]   + e[3],
-                other.x * e[4] + other.y * e[5] + other.z * e[6]   + e[7],
-                other.x * e[8] + other.y * e[9] + other.z * e[10]  + e[11],
-            )
+            x, y, z = self.transform_vertices(
+                numpy.array(other, dtype=numpy.float64)).tolist()
+            return Vector(x, y, z)
+        return NotImplemented
 
+    def multiply_all(self, others):
+        '''
+        Return a list of new Matrices, the product of self with each of the
+        given Matrices, calculated in a single operation.
+        '''
+        others = list(others)
+        if not others:
+            return []
+        products = self.array @ numpy.array(
+            [other.elements for other in others]).reshape(-1, 4, 4)
+        return [Matrix(elements=product) for product in products]
+
+    def transform_vertices(self, vertices):
+        '''
+        Return the given N x 3 array of vertices (or a single vertex of
+        shape (3,)), rotated and translated by this matrix.
+        '''
+        array = self.array
+        return vertices @ array[:3, :3].T + array[:3, 3]
+
+    def transform_normals(self, normals):
+        '''
+        Return the given N x 3 array of normals (or a single normal),
+        rotated but not translated by this matrix.
+        '''
+        return normals @ self.array[:3, :3].T
@@ -1,6 +1,6 @@
 
+import random
 from math import pi, degrees
-from random import uniform
 
 from OpenGL import GL
 
@@ -75,12 +75,13 @@ class Orientation(object):
 
 
     @staticmethod
-    def Random():
+    def Random(rng=random):
         '''
-        Return a new random Orientation
+        Return a new random Orientation, drawn from the random number
+        generator `rng`, by default the global one.
         '''
-        fwd = Vector.RandomSphere(1)
-        return Orientation(fwd).roll(uniform(-pi, +pi))
+        fwd = Vector.RandomSphere(1, rng)
+        return Orientation(fwd).roll(rng.uniform(-pi, +pi))
 
 
     def _set_forward(self, new):
@@ -167,18 +168,16 @@ class Orientation(object):
         )
 
 
-    # This method is an ugly performance hack. Orientation shouldn't need
-    # to import matrix, nor to know about ctypes. One day this will be
-    # replaced by replacing every gameitem's position and orientation
-    # attributes with a single attribute which stores position and
-    # orientation stored natively as a ctypes matrix suitable for passing 
-    # directly to glMultMatrix or shader uniforms.
+    # Render no longer uses this: gameitems now store their position and
+    # orientation together in a Transform, whose array is passed directly
+    # to shader uniforms.
     @property
     def matrix(self):
         '''
         The matrix that the OpenGL modelview matrix should be multiplied by
         to represent this orientation. It's likely that this method will
-        disappear in later releases of Gloopy.
+        disappear in later releases of Gloopy; use
+        :class:`~gloopy.geom.transform.Transform` instead.
         '''
         if self._matrix is None:
             self._matrix = matrix_type( *Matrix(Vector.origin, self) )
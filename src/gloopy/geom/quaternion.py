@@ -0,0 +1,267 @@
+import random
+from math import acos, cos, pi, sin, sqrt
+
+from .vector import Vector
+from .matrix import Matrix
+from .orientation import Orientation, matrix_type
+
+
+class Quaternion(object):
+    '''
+    An orientation stored as a unit quaternion, (w, x, y, z).
+
+    .. function:: __init__(forward=None, up=None)
+
+        Constructs the same orientation as :class:`Orientation` would, given
+        the same arguments.
+
+    Quaternion provides the same attributes and methods as
+    :class:`~gloopy.geom.orientation.Orientation`, so can be used in its
+    place, but is much cheaper to rotate. `forward`, `up` and `right` are
+    calculated each time they are used.
+
+    In addition, :meth:`compose` and :meth:`normalize` modify the
+    quaternion in place, without creating a new object, and :meth:`slerp`
+    interpolates between two orientations.
+    '''
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, forward=None, up=None):
+        if forward is None and up is None:
+            self.w, self.x, self.y, self.z = 1.0, 0.0, 0.0, 0.0
+        else:
+            self._set_basis(Orientation(forward, up))
+
+    @staticmethod
+    def from_components(w, x, y, z):
+        quaternion = Quaternion()
+        quaternion.w, quaternion.x, quaternion.y, quaternion.z = w, x, y, z
+        return quaternion
+
+    @staticmethod
+    def from_axis_angle(axis, angle):
+        '''
+        Return the rotation about the given unit axis that
+        :meth:`Orientation.rotate` would make.
+        '''
+        # Vector.rotate turns clockwise when looking along the axis
+        half = -angle / 2
+        s = sin(half)
+        return Quaternion.from_components(
+            cos(half), axis[0] * s, axis[1] * s, axis[2] * s)
+
+    @staticmethod
+    def from_orientation(orientation):
+        '''
+        Return a new Quaternion equal to the given Orientation or Quaternion.
+        '''
+        if isinstance(orientation, Quaternion):
+            return orientation.copy()
+        quaternion = Quaternion()
+        quaternion._set_basis(orientation)
+        return quaternion
+
+    @staticmethod
+    def Random(rng=random):
+        '''
+        Return a new random Quaternion, drawn from the random number
+        generator `rng`, by default the global one.
+        '''
+        return Quaternion(
+            Vector.RandomSphere(1, rng)).roll(rng.uniform(-pi, +pi))
+
+
+    def _set_basis(self, orientation):
+        # the rotation matrix has columns right, up and -forward
+        m00, m10, m20 = orientation.right
+        m01, m11, m21 = orientation.up
+        m02, m12, m22 = -orientation.forward
+        trace = m00 + m11 + m22
+        if trace > 0:
+            s = sqrt(trace + 1) * 2
+            w = s / 4
+            x = (m21 - m12) / s
+            y = (m02 - m20) / s
+            z = (m10 - m01) / s
+        elif m00 > m11 and m00 > m22:
+            s = sqrt(1 + m00 - m11 - m22) * 2
+            w = (m21 - m12) / s
+            x = s / 4
+            y = (m01 + m10) / s
+            z = (m02 + m20) / s
+        elif m11 > m22:
+            s = sqrt(1 + m11 - m00 - m22) * 2
+            w = (m02 - m20) / s
+            x = (m01 + m10) / s
+            y = s / 4
+            z = (m12 + m21) / s
+        else:
+            s = sqrt(1 + m22 - m00 - m11) * 2
+            w = (m10 - m01) / s
+            x = (m02 + m20) / s
+            y = (m12 + m21) / s
+            z = s / 4
+        self.w, self.x, self.y, self.z = w, x, y, z
+        self.normalize()
+
+
+    def __repr__(self):
+        return 'Quaternion(%s, up=%s)' % (self.forward, self.up)
+
+    def __eq__(self, other):
+        if isinstance(other, Quaternion):
+            # q and -q represent the same orientation
+            return (
+                (self.w, self.x, self.y, self.z) ==
+                    (other.w, other.x, other.y, other.z) or
+                (self.w, self.x, self.y, self.z) ==
+                    (-other.w, -other.x, -other.y, -other.z)
+            )
+        return (
+            isinstance(other, Orientation) and
+            self.forward == other.forward and
+            self.up == other.up)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None # Quaternions are mutable, so do not allow hashing
+
+    def copy(self):
+        return Quaternion.from_components(self.w, self.x, self.y, self.z)
+
+
+    def __mul__(self, other):
+        '''
+        Return a new Quaternion, rotated first by `other` then by self.
+        '''
+        return self.copy().compose(other)
+
+    def compose(self, other):
+        '''
+        Set self to the product self * other, the rotation by `other`
+        followed by the rotation by self. Returns self.
+        '''
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        self.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        self.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        self.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        self.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        return self
+
+    def normalize(self):
+        '''
+        Scale self back to unit length, correcting the rounding errors which
+        accumulate over many compositions. Returns self.
+        '''
+        length = sqrt(
+            self.w * self.w + self.x * self.x +
+            self.y * self.y + self.z * self.z)
+        self.w /= length
+        self.x /= length
+        self.y /= length
+        self.z /= length
+        return self
+
+    def conjugate(self):
+        '''
+        Return the inverse rotation, as a new Quaternion.
+        '''
+        return Quaternion.from_components(self.w, -self.x, -self.y, -self.z)
+
+
+    def basis(self):
+        '''
+        Return the nine floats of this orientation's rotation matrix, as
+        three rows: `right`, `up` and `-forward`. This is the order of the
+        first three columns of an OpenGL column-major matrix.
+        '''
+        w, x, y, z = self.w, self.x, self.y, self.z
+        xx, yy, zz = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        wx, wy, wz = w * x, w * y, w * z
+        return (
+            1 - 2 * (yy + zz), 2 * (xy + wz), 2 * (xz - wy),
+            2 * (xy - wz), 1 - 2 * (xx + zz), 2 * (yz + wx),
+            2 * (xz + wy), 2 * (yz - wx), 1 - 2 * (xx + yy),
+        )
+
+    @property
+    def right(self):
+        return Vector(*self.basis()[0:3])
+
+    @property
+    def up(self):
+        return Vector(*self.basis()[3:6])
+
+    @property
+    def forward(self):
+        return -Vector(*self.basis()[6:9])
+
+    @property
+    def matrix(self):
+        '''
+        The matrix that the OpenGL modelview matrix should be multiplied by
+        to represent this orientation, as :attr:`Orientation.matrix`.
+        '''
+        return matrix_type( *Matrix(Vector.origin, self) )
+
+
+    def rotate(self, axis, angle):
+        '''
+        Return a new Quaternion, rotated about the given axis by the given
+        angle, as :meth:`Orientation.rotate`.
+        '''
+        return Quaternion.from_axis_angle(axis, angle).compose(self)
+
+    def roll(self, angle):
+        '''
+        Return a new Quaternion, rotated about the 'forward' axis
+        (ie. +ve angle rolls to the right.)
+        '''
+        return self.copy().compose(
+            Quaternion.from_axis_angle(Vector.z_axis, angle))
+
+    def yaw(self, angle):
+        '''
+        Return a new Quaternion, rotated about the 'down' axis
+        (ie. +ve angle yaws to the right.)
+        '''
+        return self.copy().compose(
+            Quaternion.from_axis_angle(Vector.y_axis, angle))
+
+    def pitch(self, angle):
+        '''
+        Return a new Quaternion, rotated about the 'right' axis
+        (ie. +ve angle pitches up.)
+        '''
+        return self.copy().compose(
+            Quaternion.from_axis_angle(Vector.x_axis, -angle))
+
+
+    def slerp(self, other, t):
+        '''
+        Return a new Quaternion, interpolated along the shortest arc from
+        self (when t is 0) to `other` (when t is 1).
+        '''
+        w, x, y, z = other.w, other.x, other.y, other.z
+        dot = self.w * w + self.x * x + self.y * y + self.z * z
+        if dot < 0:
+            w, x, y, z, dot = -w, -x, -y, -z, -dot
+        if dot > 0.9995:
+            # nearly parallel: interpolate linearly, avoiding sin(0)
+            a, b = 1 - t, t
+        else:
+            theta = acos(dot)
+            a = sin((1 - t) * theta) / sin(theta)
+            b = sin(t * theta) / sin(theta)
+        return Quaternion.from_components(
+            a * self.w + b * w,
+            a * self.x + b * x,
+            a * self.y + b * y,
+            a * self.z + b * z,
+        ).normalize()
+
+
+Quaternion.Identity = Quaternion()
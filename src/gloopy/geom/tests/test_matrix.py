@@ -1,6 +1,8 @@
 
 from unittest import TestCase, main
 
+import numpy
+
 from ..orientation import Orientation
 from ..matrix import Matrix
 from ..vector import Vector
@@ -55,6 +57,76 @@ class TestMatrix(TestCase):
         self.assertEqual(matrix * vert - position, (3, 2, -1))
 
 
+    def testMulMatrix(self):
+        first = Matrix(Vector(1, 2, 3), Orientation((4, 5, 6)))
+        second = Matrix(Vector(-1, 0, 2), Orientation((0, 1, 1)))
+        vert = Vector(0.5, -1, 2)
+
+        product = first * second
+
+        expected = first * (second * vert)
+        for actual, wanted in zip(product * vert, expected):
+            self.assertAlmostEqual(actual, wanted, places=12)
+
+    def testMultiplyAll(self):
+        first = Matrix(Vector(1, 2, 3), Orientation((4, 5, 6)))
+        others = [
+            Matrix(Vector(-1, 0, 2), Orientation((0, 1, 1))),
+            Matrix(Vector(3, 3, 3), Orientation(Vector.x_axis)),
+        ]
+
+        products = first.multiply_all(others)
+
+        self.assertEqual(len(products), 2)
+        for product, other in zip(products, others):
+            self.assertEqual(list(product), list(first * other))
+        self.assertEqual(first.multiply_all([]), [])
+
+    def testTransformVertices(self):
+        matrix = Matrix(Vector(10, 20, 30), Orientation(Vector.y_axis))
+        vertices = numpy.array([[1, 2, 3], [0, 0, 0], [-1, 5, 2]])
+
+        transformed = matrix.transform_vertices(vertices)
+
+        self.assertEqual(
+            transformed.tolist(),
+            [list(matrix * Vector(*vertex)) for vertex in vertices.tolist()]
+        )
+
+    def testTransformNormalsIgnoresPosition(self):
+        matrix = Matrix(Vector(10, 20, 30), Orientation(Vector.y_axis))
+        normals = numpy.array([[1, 0, 0], [0, 0, 1]])
+
+        self.assertEqual(
+            matrix.transform_normals(normals).tolist(),
+            [[1, 0, 0], [0, 1, 0]]
+        )
+
+    def testElementsAreSharedNotCopied(self):
+        matrix = Matrix(Vector(1, 2, 3))
+        self.assertEqual(matrix.elements.dtype, numpy.float64)
+        self.assertTrue(matrix.elements.flags.c_contiguous)
+        self.assertTrue(
+            numpy.shares_memory(numpy.asarray(matrix), matrix.elements))
+        self.assertEqual(numpy.asarray(matrix).shape, (4, 4))
+
+
+    def testColumnMajorIsReadByOpenGLAsTheSameTransform(self):
+        matrix = Matrix(Vector(1, 2, 3), Orientation((1, 2, 3)))
+        vertex = Vector(0.5, -1, 2)
+
+        # OpenGL reads 16 elements as the columns of the matrix
+        gl_matrix = matrix.column_major.reshape(4, 4).T
+        x, y, z, w = gl_matrix @ [vertex.x, vertex.y, vertex.z, 1]
+
+        expected = matrix * vertex
+        self.assertAlmostEqual(x, expected.x)
+        self.assertAlmostEqual(y, expected.y)
+        self.assertAlmostEqual(z, expected.z)
+        self.assertEqual(w, 1)
+        self.assertTrue(matrix.column_major.flags.c_contiguous)
+
+
 if __name__ == '__main__':
     main()
 
@@ -0,0 +1,99 @@
+from math import pi
+from unittest import TestCase, main
+
+from ..orientation import Orientation
+from ..quaternion import Quaternion
+from ..vector import Vector
+
+
+class TestQuaternion(TestCase):
+
+    def assertSameOrientation(self, actual, expected):
+        for attr in ['forward', 'up', 'right']:
+            for a, e in zip(getattr(actual, attr), getattr(expected, attr)):
+                self.assertAlmostEqual(a, e, places=12)
+
+    def testConstructionDefaults(self):
+        q = Quaternion()
+        self.assertEqual(q.forward, Vector.neg_z_axis)
+        self.assertEqual(q.up, Vector.y_axis)
+        self.assertEqual(q.right, Vector.x_axis)
+        self.assertEqual(q, Orientation.Identity)
+        self.assertEqual(q, Quaternion.Identity)
+
+    def testConstructionMatchesOrientation(self):
+        for args in [
+            ((1, 2, 3),),
+            (Vector.x_axis, Vector.z_axis),
+            (Vector.y_axis,),
+            (Vector.neg_y_axis,),
+            (Vector.z_axis,),
+        ]:
+            self.assertSameOrientation(
+                Quaternion(*args), Orientation(*args))
+
+    def testEqualityIgnoresSign(self):
+        q = Quaternion((1, 2, 3))
+        negated = Quaternion.from_components(-q.w, -q.x, -q.y, -q.z)
+        self.assertEqual(q, negated)
+        self.assertNotEqual(q, Quaternion())
+
+    def testRotationsMatchOrientation(self):
+        o = Orientation((1, 2, 3))
+        q = Quaternion((1, 2, 3))
+        axis = Vector(3, -1, 2).normalized()
+        self.assertSameOrientation(q.rotate(axis, 0.4), o.rotate(axis, 0.4))
+        for name in ['roll', 'yaw', 'pitch']:
+            self.assertSameOrientation(
+                getattr(q, name)(0.4), getattr(o, name)(0.4))
+
+    def testRotationsReturnNewQuaternion(self):
+        q = Quaternion()
+        q.rotate(Vector.x_axis, 1)
+        q.roll(1)
+        self.assertEqual(q, Quaternion.Identity)
+
+    def testMatrixMatchesOrientation(self):
+        o = Orientation((1, 2, 3))
+        q = Quaternion((1, 2, 3))
+        for a, e in zip(q.matrix, o.matrix):
+            self.assertAlmostEqual(a, e, places=6)
+
+    def testComposeInPlace(self):
+        q = Quaternion((1, 2, 3))
+        spin = Quaternion.from_axis_angle(Vector.y_axis, 0.5)
+        expected = q.yaw(0.5)
+
+        self.assertIs(q.compose(spin), q)
+
+        self.assertSameOrientation(q, expected)
+
+    def testMultiplyAndConjugate(self):
+        q = Quaternion((1, 2, 3)).roll(0.3)
+        self.assertSameOrientation(q * q.conjugate(), Quaternion.Identity)
+
+    def testNormalize(self):
+        q = Quaternion.from_components(2, 0, 0, 0)
+        self.assertIs(q.normalize(), q)
+        self.assertEqual((q.w, q.x, q.y, q.z), (1, 0, 0, 0))
+
+    def testSlerp(self):
+        start = Quaternion()
+        end = start.rotate(Vector.y_axis, pi / 2)
+
+        self.assertSameOrientation(start.slerp(end, 0), start)
+        self.assertSameOrientation(start.slerp(end, 1), end)
+        self.assertSameOrientation(
+            start.slerp(end, 0.5), start.rotate(Vector.y_axis, pi / 4))
+
+    def testSlerpTakesShortestArc(self):
+        start = Quaternion()
+        end = start.rotate(Vector.x_axis, 0.2)
+        negated = Quaternion.from_components(-end.w, -end.x, -end.y, -end.z)
+
+        self.assertSameOrientation(
+            start.slerp(negated, 0.5), start.rotate(Vector.x_axis, 0.1))
+
+
+if __name__ == '__main__':
+    main()
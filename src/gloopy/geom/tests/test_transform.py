@@ -0,0 +1,120 @@
+from math import pi
+from unittest import TestCase, main
+
+import numpy
+
+from ..orientation import Orientation
+from ..transform import Transform
+from ..vector import Vector
+
+
+def assertVectorsAlmostEqual(test, actual, expected):
+    test.assertTrue(
+        numpy.allclose(actual, expected, atol=1e-6),
+        '%s != %s' % (actual, expected)
+    )
+
+
+def apply(transform, point):
+    # the array is column-major, so transforms row vectors on the left
+    return (numpy.append(point, 1) @ transform.array.reshape(4, 4))[:3]
+
+
+class TestTransform(TestCase):
+
+    def testDefaultIsIdentity(self):
+        transform = Transform()
+        self.assertEqual(transform.array.dtype, numpy.float32)
+        self.assertEqual(
+            transform.array.tolist(),
+            numpy.identity(4).reshape(16).tolist()
+        )
+        self.assertEqual(transform.position, Vector.origin)
+        self.assertEqual(transform.orientation, Orientation.Identity)
+
+    def testArrayIsMatrixInColumnMajorOrder(self):
+        position = Vector(1, 2, 3)
+        orientation = Orientation((4, 5, 6))
+
+        transform = Transform(position, orientation)
+
+        # as drawn by glTranslate(position), glMultMatrix(orientation.matrix)
+        expected = list(orientation.matrix)
+        expected[12:15] = position
+        assertVectorsAlmostEqual(self, transform.array, expected)
+
+    def testPositionAndOrientation(self):
+        orientation = Orientation((4, 5, 6))
+        transform = Transform((1, 2, 3), orientation)
+
+        self.assertEqual(transform.position, Vector(1, 2, 3))
+        self.assertTrue(isinstance(transform.position, Vector))
+        assertVectorsAlmostEqual(
+            self, transform.orientation.forward, orientation.forward)
+        assertVectorsAlmostEqual(
+            self, transform.orientation.up, orientation.up)
+
+    def testTranslateInPlace(self):
+        transform = Transform((1, 2, 3))
+        array = transform.array
+
+        self.assertIs(transform.translate(Vector(1, 1, -1)), transform)
+
+        self.assertIs(transform.array, array)
+        self.assertEqual(transform.position, Vector(2, 3, 2))
+
+    def testRotateMatchesOrientation(self):
+        orientation = Orientation((1, 2, 3))
+        transform = Transform((1, 2, 3), orientation)
+        axis = Vector(1, -1, 2).normalized()
+
+        transform.rotate(axis, 0.7)
+
+        expected = orientation.rotate(axis, 0.7)
+        assertVectorsAlmostEqual(self, transform.forward, expected.forward)
+        assertVectorsAlmostEqual(self, transform.up, expected.up)
+        assertVectorsAlmostEqual(self, transform.right, expected.right)
+        self.assertEqual(transform.position, Vector(1, 2, 3))
+
+    def testRollYawPitchMatchOrientation(self):
+        orientation = Orientation((1, 2, 3))
+        for name in ['roll', 'yaw', 'pitch']:
+            transform = Transform(orientation=orientation)
+            getattr(transform, name)(0.3)
+            expected = getattr(orientation, name)(0.3)
+            assertVectorsAlmostEqual(
+                self, transform.forward, expected.forward)
+            assertVectorsAlmostEqual(self, transform.up, expected.up)
+
+    def testRepeatedRotationStaysOrthonormal(self):
+        transform = Transform()
+        axis = Vector(1, 2, 3).normalized()
+        for _ in range(2000):
+            transform.rotate(axis, 0.01)
+
+        basis = transform.array.reshape(4, 4)[:3, :3].astype(numpy.float64)
+        assertVectorsAlmostEqual(self, basis @ basis.T, numpy.identity(3))
+
+    def testComposeAppliesOtherFirst(self):
+        first = Transform((1, 2, 3), Orientation((4, 5, 6)))
+        second = Transform((-2, 0, 1), Orientation((0, 1, 1)))
+        point = (0.5, -1, 2)
+        expected = apply(first, apply(second, point))
+
+        first.compose(second)
+
+        assertVectorsAlmostEqual(self, apply(first, point), expected)
+
+    def testInvert(self):
+        transform = Transform((1, 2, 3), Orientation((4, 5, 6)).roll(pi / 3))
+        inverse = transform.copy().invert()
+
+        assertVectorsAlmostEqual(
+            self,
+            inverse.compose(transform).array,
+            numpy.identity(4).reshape(16),
+        )
+
+
+if __name__ == '__main__':
+    main()
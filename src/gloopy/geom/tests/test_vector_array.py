@@ -0,0 +1,112 @@
+from math import pi
+from unittest import TestCase, main
+
+import numpy
+
+from ..vector import Vector, VectorArray
+
+
+VECTORS = [Vector(1, 2, 3), Vector(-4, 5, 0.5), Vector(0, 0, 7)]
+OTHERS = [Vector(3, 0, 1), Vector(2, -2, 2), Vector(1, 1, 0)]
+
+
+class TestVectorArray(TestCase):
+
+    def assertVectorsEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertEqual(a, e)
+
+    def testConstructor(self):
+        array = VectorArray(VECTORS)
+        self.assertEqual(array.array.shape, (3, 3))
+        self.assertEqual(array.array.dtype, numpy.float64)
+        self.assertEqual(VectorArray().array.shape, (0, 3))
+
+    def testConstructorDoesNotCopyArrays(self):
+        data = numpy.zeros((4, 3), dtype=numpy.float32)
+        array = VectorArray(data, numpy.float32)
+        self.assertTrue(array.array is data)
+
+    def testToVectors(self):
+        vectors = VectorArray(VECTORS).to_vectors()
+        self.assertVectorsEqual(vectors, VECTORS)
+        self.assertTrue(all(isinstance(v, Vector) for v in vectors))
+
+    def testIndexing(self):
+        array = VectorArray(VECTORS)
+        self.assertEqual(len(array), 3)
+        self.assertEqual(array[1], VECTORS[1])
+        self.assertTrue(isinstance(array[1], Vector))
+        self.assertVectorsEqual(array[1:], VECTORS[1:])
+        self.assertVectorsEqual(list(array), VECTORS)
+
+    def testArithmetic(self):
+        a = VectorArray(VECTORS)
+        b = VectorArray(OTHERS)
+        self.assertVectorsEqual(-a, [-v for v in VECTORS])
+        self.assertVectorsEqual(
+            a + b, [v + o for v, o in zip(VECTORS, OTHERS)])
+        self.assertVectorsEqual(
+            a - b, [v - o for v, o in zip(VECTORS, OTHERS)])
+        self.assertVectorsEqual(
+            a + (1, 2, 3), [v + (1, 2, 3) for v in VECTORS])
+        self.assertVectorsEqual(
+            (1, 2, 3) - a, [(1, 2, 3) - v for v in VECTORS])
+        self.assertVectorsEqual(a * 2, [v * 2 for v in VECTORS])
+        self.assertVectorsEqual(2 * a, [v * 2 for v in VECTORS])
+        self.assertVectorsEqual(a / 2, [v / 2 for v in VECTORS])
+        self.assertVectorsEqual(
+            a * [1, 2, 3], [v * s for v, s in zip(VECTORS, [1, 2, 3])])
+        self.assertRaises(TypeError, lambda: a + 4)
+
+    def testLength(self):
+        a = VectorArray(VECTORS)
+        for actual, v in zip(a.length, VECTORS):
+            self.assertAlmostEqual(actual, v.length)
+        for actual, v in zip(a.length2, VECTORS):
+            self.assertAlmostEqual(actual, v.length2)
+
+    def testNormalized(self):
+        a = VectorArray(VECTORS)
+        self.assertVectorsEqual(
+            a.normalized(), [v.normalized() for v in VECTORS])
+        self.assertVectorsEqual(
+            a.normalized(3), [v.normalized(3) for v in VECTORS])
+
+    def testCrossAndDot(self):
+        a = VectorArray(VECTORS)
+        b = VectorArray(OTHERS)
+        self.assertVectorsEqual(
+            a.cross(b), [v.cross(o) for v, o in zip(VECTORS, OTHERS)])
+        self.assertVectorsEqual(
+            a.cross(Vector.x_axis), [v.cross(Vector.x_axis) for v in VECTORS])
+        for actual, v, o in zip(a.dot(b), VECTORS, OTHERS):
+            self.assertAlmostEqual(actual, v.dot(o))
+
+    def testAngle(self):
+        a = VectorArray(VECTORS)
+        for actual, v, o in zip(a.angle(OTHERS), VECTORS, OTHERS):
+            self.assertAlmostEqual(actual, v.angle(o))
+
+    def testRotate(self):
+        a = VectorArray(VECTORS)
+        axis = Vector(1, 2, 3).normalized()
+        self.assertVectorsEqual(
+            a.rotate(axis, 0.7), [v.rotate(axis, 0.7) for v in VECTORS])
+        self.assertVectorsEqual(
+            a.rotateX(pi/3), [v.rotateX(pi/3) for v in VECTORS])
+        self.assertVectorsEqual(
+            a.rotateY(pi/3), [v.rotateY(pi/3) for v in VECTORS])
+        self.assertVectorsEqual(
+            a.rotateZ(pi/3), [v.rotateZ(pi/3) for v in VECTORS])
+
+    def testOperationsPreserveDtype(self):
+        a = VectorArray(VECTORS, numpy.float32)
+        self.assertEqual((a + (1, 1, 1)).array.dtype, numpy.float32)
+        self.assertEqual(a.normalized().array.dtype, numpy.float32)
+        self.assertEqual(a.rotate(Vector.y_axis, 1).array.dtype, numpy.float32)
+
+
+if __name__ == '__main__':
+    main()
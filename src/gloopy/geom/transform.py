@@ -0,0 +1,176 @@
+import numpy
+
+from .vector import Vector
+from .orientation import Orientation
+from .quaternion import Quaternion
+
+
+class Transform(object):
+    '''
+    A position and orientation, stored together as a 4x4 matrix.
+
+    .. function:: __init__(position=None, orientation=None)
+
+        `position`: a :class:`~gloopy.geom.vector.Vector` or 3-tuple,
+        defaults to the origin.
+
+        `orientation`: an :class:`~gloopy.geom.orientation.Orientation` or
+        :class:`~gloopy.geom.quaternion.Quaternion`, defaults to
+        Orientation.Identity.
+
+    `array` is a buffer of 16 float32, the matrix in OpenGL's column-major
+    order, which can be passed unconverted to glUniformMatrix4fv. Its columns
+    are `right`, `up` and `-forward`, followed by `position`.
+
+    `rotation` is a :class:`~gloopy.geom.quaternion.Quaternion` holding the
+    same orientation, which rotations are applied to before being copied
+    into `array`. Neither should be modified other than by the methods
+    here.
+
+    The methods that translate, rotate, compose and invert all modify this
+    buffer in place, and return self.
+    '''
+    def __init__(self, position=None, orientation=None):
+        self.array = numpy.identity(4, dtype=numpy.float32).reshape(16)
+        self.rotation = Quaternion()
+        if position is not None:
+            self.position = position
+        if orientation is not None:
+            self.orientation = orientation
+
+    def __repr__(self):
+        return 'Transform(%s, %s)' % (self.position, self.orientation)
+
+    def copy(self):
+        transform = Transform()
+        transform.array[:] = self.array
+        transform.rotation = self.rotation.copy()
+        return transform
+
+    @property
+    def _rows(self):
+        # each row is one column of the matrix
+        return self.array.reshape(4, 4)
+
+
+    def _get_position(self):
+        x, y, z = self.array[12:15].tolist()
+        return Vector(x, y, z)
+
+    def _set_position(self, position):
+        self.array[12:15] = position
+
+    position = property(_get_position, _set_position, None,
+            'The position, as a Vector')
+
+
+    def _get_orientation(self):
+        return Orientation(self.forward, self.up)
+
+    def _set_orientation(self, orientation):
+        if orientation is None:
+            orientation = Orientation.Identity
+        self.rotation = Quaternion.from_orientation(orientation)
+        self._update_basis()
+
+    orientation = property(_get_orientation, _set_orientation, None,
+            'The orientation, as a new Orientation')
+
+
+    @property
+    def right(self):
+        x, y, z = self.array[0:3].tolist()
+        return Vector(x, y, z)
+
+    @property
+    def up(self):
+        x, y, z = self.array[4:7].tolist()
+        return Vector(x, y, z)
+
+    @property
+    def forward(self):
+        x, y, z = (-self.array[8:11]).tolist()
+        return Vector(x, y, z)
+
+
+    def _update_basis(self):
+        '''
+        Copy self.rotation into the first three columns of self.array.
+        '''
+        r0, r1, r2, u0, u1, u2, b0, b1, b2 = self.rotation.basis()
+        self.array[:11] = (r0, r1, r2, 0, u0, u1, u2, 0, b0, b1, b2)
+
+
+    def translate(self, offset):
+        '''
+        Move the position by `offset`.
+        '''
+        self.array[12:15] += offset
+        return self
+
+
+    def rotate(self, axis, angle):
+        '''
+        Rotate the orientation about the given world-space axis, which must
+        be of unit length, as :meth:`Orientation.rotate` does. The position
+        is unchanged.
+        '''
+        self.rotation = Quaternion.from_axis_angle(axis, angle).compose(
+            self.rotation).normalize()
+        self._update_basis()
+        return self
+
+    def roll(self, angle):
+        '''
+        Rotate about the forward axis, as :meth:`Orientation.roll`.
+        '''
+        return self.rotate_locally(
+            Quaternion.from_axis_angle(Vector.z_axis, angle))
+
+    def yaw(self, angle):
+        '''
+        Rotate about the up axis, as :meth:`Orientation.yaw`.
+        '''
+        return self.rotate_locally(
+            Quaternion.from_axis_angle(Vector.y_axis, angle))
+
+    def pitch(self, angle):
+        '''
+        Rotate about the right axis, as :meth:`Orientation.pitch`.
+        '''
+        return self.rotate_locally(
+            Quaternion.from_axis_angle(Vector.x_axis, -angle))
+
+    def rotate_locally(self, quaternion):
+        '''
+        Rotate by the given :class:`~gloopy.geom.quaternion.Quaternion`,
+        whose axes are those of this transform's own orientation, rather
+        than world axes.
+        '''
+        self.rotation.compose(quaternion).normalize()
+        self._update_basis()
+        return self
+
+
+    def compose(self, other):
+        '''
+        Set this transform to the result of applying `other`, then this
+        transform, i.e. the matrix product self * other.
+        '''
+        self._rows[:] = other._rows @ self._rows
+        self.rotation.compose(other.rotation).normalize()
+        self._update_basis()
+        return self
+
+
+    def invert(self):
+        '''
+        Set this transform to its inverse. Transforms only ever contain
+        rotations and translations, so this is cheaper than a general matrix
+        inverse.
+        '''
+        rows = self._rows
+        rows[3, :3] = -(rows[:3, :3] @ rows[3, :3])
+        self.rotation = self.rotation.conjugate()
+        self._update_basis()
+        return self
@@ -1,7 +1,11 @@
 from __future__ import division
 from collections import namedtuple
+import random
 from math import acos, cos, sin, sqrt
-from random import randint, uniform
+
+import numpy
+
+from ..util.arrays import reserve
 
 
 EPSILON = 1e-7
@@ -78,11 +82,14 @@ class Vector(namedtuple('VectorBase', 'x y z')):
 
 
     @staticmethod
-    def RandomCube(size, ints=False):
+    def RandomCube(size, ints=False, rng=random):
         '''
         A new random Vector, evenly distributed within a cube of `size` sides.
+
+        These Random methods draw from `rng`, such as a random.Random
+        instance, by default the global random number generator.
         '''
-        rand = randint if ints else uniform
+        rand = rng.randint if ints else rng.uniform
         return Vector(
             rand(-size/2, +size/2),
             rand(-size/2, +size/2),
@@ -90,22 +97,23 @@ class Vector(namedtuple('VectorBase', 'x y z')):
         )
 
     @staticmethod
-    def RandomSphere(radius):
+    def RandomSphere(radius, rng=random):
         '''
         A new random Vector, evenly distributed within a sphere of `radius`.
         '''
         while True:
-            p = Vector.RandomCube(radius)
+            p = Vector.RandomCube(radius, rng=rng)
             if p.length2 < radius ** 2:
                 return p
 
     @staticmethod
-    def RandomShell(radius):
+    def RandomShell(radius, rng=random):
         '''
-        A new random Vector, evenly distributed on surface a sphere of `radius`.
+        A new random Vector, evenly distributed on surface a sphere of
+        `radius`.
         '''
         while True:
-            p = Vector.RandomCube(radius)
+            p = Vector.RandomCube(radius, rng=rng)
             if p.length2 < radius ** 2:
                 return p.normalized() * radius
 
@@ -243,3 +251,242 @@ Vector.neg_x_axis = Vector(-1,  0,  0)
 Vector.neg_y_axis = Vector( 0, -1,  0)
 Vector.neg_z_axis = Vector( 0,  0, -1)
 
+
+
+class VectorArray(object):
+    '''
+    An N x 3 array of floats, stored contiguously in a numpy array, which
+    supports the same operations as Vector, applied to every row in a single
+    call. Use this instead of a list of Vector when operating on many vertices
+    at once.
+
+    .. function:: __init__(data=(), dtype=numpy.float64)
+
+        `data`: a sequence of Vector (or 3-tuples), or an N x 3 numpy array.
+        An existing numpy array of the requested `dtype` is used without
+        copying it.
+
+    The underlying numpy array is exposed as the `array` attribute.
+
+    Arithmetic operators are supported:
+
+    .. function:: __neg__(): unary minus to invert every row
+    .. function:: __add__(other): add another VectorArray row by row, or
+        add a single Vector or 3-tuple to every row
+    .. function:: __sub__(other): subtraction, as for addition
+    .. function:: __mul__(scalar): scale every row by a float, or row by row
+        by a sequence of N floats
+    .. function:: __div__(scalar): as for multiplication (truediv also
+        supported)
+
+    Indexing by an integer returns a single Vector, while indexing by a slice
+    or by an array of indices returns a new VectorArray. Iteration yields
+    Vectors.
+
+    Like a list, a VectorArray can be grown in-place using `append` and
+    `extend`. This replaces the `array` attribute with a longer array, so
+    don't hang on to references to the old one.
+    '''
+
+    __slots__ = ['array', '_buffer']
+
+    def __init__(self, data=(), dtype=numpy.float64):
+        if isinstance(data, VectorArray):
+            data = data.array
+        array = numpy.asarray(data, dtype=dtype)
+        if array.ndim != 2:
+            array = array.reshape(-1, 3)
+        self.array = array
+        # storage for 'array', with spare capacity for appending to
+        self._buffer = array
+
+    def __repr__(self):
+        return '<VectorArray %d vectors>' % (len(self),)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, numpy.integer)):
+            return Vector(*self.array[index].tolist())
+        return VectorArray(self.array[index], self.array.dtype)
+
+    def append(self, vector):
+        '''
+        Append a single Vector (or 3-tuple) to the end of the array.
+        '''
+        self._reserve(1)
+        self.array[-1] = vector
+
+    def extend(self, vectors):
+        '''
+        Append a sequence of Vectors, or another VectorArray, to the end of
+        the array.
+        '''
+        vectors = VectorArray(vectors, self.array.dtype).array
+        start = len(self.array)
+        self._reserve(len(vectors))
+        self.array[start:] = vectors
+
+    def _reserve(self, extra):
+        used = len(self.array)
+        self._buffer = reserve(self._buffer, used, extra)
+        self.array = self._buffer[:used + extra]
+
+    def to_vectors(self):
+        '''
+        Return a new list of Vector, one for each row.
+        '''
+        return list(map(Vector._make, self.array.tolist()))
+
+    def _new(self, array):
+        return VectorArray(
+            array.astype(self.array.dtype, copy=False), self.array.dtype)
+
+    def _operand(self, other):
+        if isinstance(other, VectorArray):
+            return other.array
+        other = numpy.asarray(other)
+        if other.ndim == 0 or other.shape[-1] != 3:
+            raise TypeError('cannot combine VectorArray with %r' % (other,))
+        return other
+
+    @staticmethod
+    def _scalars(scalar):
+        scalar = numpy.asarray(scalar)
+        if scalar.ndim == 1:
+            return scalar[:, numpy.newaxis]
+        return scalar
+
+    def __neg__(self):
+        return self._new(-self.array)
+
+    def __add__(self, other):
+        return self._new(self.array + self._operand(other))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self._new(self.array - self._operand(other))
+
+    def __rsub__(self, other):
+        return self._new(self._operand(other) - self.array)
+
+    def __mul__(self, scalar):
+        return self._new(self.array * self._scalars(scalar))
+
+    def __rmul__(self, scalar):
+        return self.__mul__(scalar)
+
+    def __truediv__(self, scalar):
+        return self._new(self.array / self._scalars(scalar))
+
+    __div__ = __truediv__
+
+
+    @property
+    def length(self):
+        '''
+        Array of N lengths, one for each row.
+        '''
+        return numpy.sqrt(self.length2)
+
+    @property
+    def length2(self):
+        '''
+        Array of N lengths squared. Cheaper to calculate.
+        '''
+        return numpy.einsum('ij,ij->i', self.array, self.array)
+
+    def normalized(self, length=1):
+        '''
+        Return a new VectorArray, each row in the same direction as before,
+        but with the given length (a float, or a sequence of N floats.)
+        '''
+        return self._new(
+            self.array * self._scalars(numpy.divide(length, self.length))
+        )
+
+    def cross(self, other):
+        '''
+        Return a new VectorArray, the cross product of each row with the
+        corresponding row of `other`, or with `other` if it is a single vector.
+        '''
+        return self._new(numpy.cross(self.array, self._operand(other)))
+
+    def dot(self, other):
+        '''
+        Return an array of N scalar dot products.
+        '''
+        return (self.array * self._operand(other)).sum(axis=-1)
+
+    def angle(self, other):
+        '''
+        Return an array of N angles, between each row and `other`
+        '''
+        other = VectorArray(self._operand(other))
+        cosine = self.dot(other) / (self.length * other.length)
+        return numpy.arccos(numpy.clip(cosine, -1, 1))
+
+
+    def rotateX(self, angle):
+        '''
+        return a new VectorArray, rotated `angle` radians about the X axis
+        '''
+        sina = sin(angle)
+        cosa = cos(angle)
+        return self._transform([
+            [1,     0,    0],
+            [0,  cosa, sina],
+            [0, -sina, cosa],
+        ])
+
+    def rotateY(self, angle):
+        '''
+        return a new VectorArray, rotated `angle` radians about the Y axis
+        '''
+        sina = sin(angle)
+        cosa = cos(angle)
+        return self._transform([
+            [cosa, 0, -sina],
+            [   0, 1,     0],
+            [sina, 0,  cosa],
+        ])
+
+    def rotateZ(self, angle):
+        '''
+        return a new VectorArray, rotated `angle` radians about the Z axis
+        '''
+        sina = sin(angle)
+        cosa = cos(angle)
+        return self._transform([
+            [ cosa, sina, 0],
+            [-sina, cosa, 0],
+            [    0,    0, 1],
+        ])
+
+    def rotate(self, axis, angle):
+        '''
+        Return a new VectorArray, rotated about the given axis. Rotates
+        exactly as :meth:`Vector.rotate` does, but builds the rotation matrix
+        just once for all rows.
+        '''
+        x, y, z = axis
+        c = cos(-angle)
+        t = 1 - c
+        s = sin(-angle)
+        return self._transform([
+            [t * x * x + c,     t * x * y - s * z, t * x * z + s * y],
+            [t * x * y + s * z, t * y * y + c,     t * y * z - s * x],
+            [t * x * z - s * y, t * y * z + s * x, t * z * z + c    ],
+        ])
+
+    def _transform(self, rows):
+        '''
+        Return a new VectorArray, every row multiplied by the given 3x3 matrix
+        '''
+        return self._new(self.array @ numpy.array(rows).T)
@@ -0,0 +1,144 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .color import Color
+from .gameitem import GameItem
+from .geom.vector import Vector
+from .move import Spinner
+from .shapes.cube import Cube
+
+
+log = logging.getLogger(__name__)
+
+
+class _Pending(object):
+
+    __slots__ = ['future', 'placeholder', 'finish']
+
+    def __init__(self, future, placeholder, finish):
+        self.future = future
+        self.placeholder = placeholder
+        # called on the main thread with the result
+        self.finish = finish
+
+
+class Loader(object):
+    '''
+    Builds expensive shapes on a background thread, so that the main loop
+    keeps rendering meanwhile, and adds each to the world as a new GameItem
+    once it is built.
+
+    .. function:: __init__(world, placeholder=None)
+
+        `world`: the :class:`~gloopy.world.World` items are added to.
+
+        `placeholder`: the shape shown, spinning, where each item will
+        appear, while its shape is built. Defaults to a small grey cube. If
+        it is False, nothing is shown.
+
+    `prepare` is an optional callable, which is passed each shape, on the
+    background thread, once it is built, to do any further work that does
+    not need OpenGL. :meth:`~gloopy.view.render.Render.prepare`, which
+    converts shapes into glyph arrays, is set as this by
+    :func:`~gloopy.mainloop.mainloop`.
+
+    :meth:`update` must be called on the main thread every frame, to add
+    items whose shapes are ready, and :meth:`shutdown` when the main loop
+    ends.
+    '''
+    def __init__(self, world, placeholder=None):
+        self.world = world
+        if placeholder is None:
+            placeholder = Cube(1, Color.Grey)
+        self.placeholder = placeholder
+        self.prepare = None
+        self.pending = []
+        # one thread, so that shapes are built in the order requested
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+
+    def add(self, build, callback=None, **kwargs):
+        '''
+        Call `build()` on the background thread. Once it returns a shape,
+        or list of shapes, add a new GameItem with that shape, and the given
+        keyword arguments, to the world, then call `callback(item)`, if
+        given.
+
+        Returns the placeholder item, which is in the world until then, or
+        None if there is no placeholder. Placeholder items have a
+        `placeholder` attribute which is True.
+        '''
+        placeholder = None
+        if self.placeholder is not False:
+            placeholder = GameItem(
+                shape=self.placeholder,
+                position=kwargs.get('position', Vector.origin),
+                update=Spinner(Vector.y_axis, speed=3),
+                placeholder=True,
+            )
+            self.world.add(placeholder)
+        def finish(shape):
+            item = GameItem(shape=shape, **kwargs)
+            self.world.add(item)
+            if callback is not None:
+                callback(item)
+
+        future = self._executor.submit(self._build, build)
+        self.pending.append(_Pending(future, placeholder, finish))
+        return placeholder
+
+
+    def run(self, function, callback):
+        '''
+        Call `function()` on the background thread, after any builds already
+        requested, then `callback(result)` on the main thread, from
+        :meth:`update`. Nothing is added to the world.
+        '''
+        future = self._executor.submit(function)
+        self.pending.append(_Pending(future, None, callback))
+
+
+    def _build(self, build):
+        shape = build()
+        if self.prepare is not None:
+            self.prepare(shape)
+        return shape
+
+
+    @property
+    def loading(self):
+        '''
+        The number of shapes still being built, or functions passed to
+        :meth:`run` still to be called.
+        '''
+        return len(self.pending)
+
+
+    def update(self):
+        '''
+        Add an item to the world for each shape which has been built since
+        the last call, replacing its placeholder, and make the callbacks of
+        functions passed to :meth:`run` which have returned, in the order
+        they were requested. Builds and functions which raised an exception
+        are logged and skipped.
+        '''
+        while self.pending and self.pending[0].future.done():
+            pending = self.pending.pop(0)
+            placeholder = pending.placeholder
+            if placeholder is not None and placeholder.id in self.world.items:
+                self.world.remove(placeholder)
+            try:
+                result = pending.future.result()
+            except Exception:
+                log.exception('building shape failed')
+                continue
+            pending.finish(result)
+
+
+    def shutdown(self):
+        '''
+        Cancel the builds which have not started yet, so that exiting need
+        not wait for them. A build which is already running can't be
+        interrupted, so still finishes before the interpreter exits.
+        '''
+        self._executor.shutdown(wait=False, cancel_futures=True)
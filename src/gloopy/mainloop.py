@@ -8,17 +8,19 @@ from .view.render import Render
 
 
 
-def mainloop(world, window, options, camera):
+def mainloop(world, window, options, camera, loader=None):
 
     time = 0.0
     timerate = 1.0
 
     render = Render(world, window, camera, options)
     render.init()
+    if loader is not None:
+        loader.prepare = render.prepare
 
     def draw():
         render.draw_window(
-            (item.position, item.orientation, item.glyph[item.frame])
+            (item.transform.array, item.glyph[item.frame])
             for item in world
             if item.glyph and hasattr(item, 'frame') and item.glyph[item.frame]
         )
@@ -54,6 +56,9 @@ def mainloop(world, window, options, camera):
         dt = min(dt, 1.0 / 30) * timerate
         time += dt
 
+        if loader is not None:
+            loader.update()
+
         for item in world:
             if item.update:
                 item.update(item, time, dt)
@@ -64,3 +69,6 @@ def mainloop(world, window, options, camera):
     pyglet.clock.schedule(update)
     pyglet.app.run()
 
+    if loader is not None:
+        loader.shutdown()
+
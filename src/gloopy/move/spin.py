@@ -2,6 +2,8 @@
 from math import cos, sin
 
 from gloopy.geom.orientation import Orientation
+from gloopy.geom.quaternion import Quaternion
+from gloopy.geom.vector import Vector
 
 
 class Spinner(object):
@@ -16,7 +18,7 @@ class Spinner(object):
         self.orientation=orientation
 
     def __call__(self, item, time, dt):
-        item.orientation = item.orientation.rotate(self.axis, self.speed * dt)
+        item.transform.rotate(self.axis, self.speed * dt)
 
 
 class WobblySpinner(object):
@@ -27,6 +29,10 @@ class WobblySpinner(object):
         self.speed = speed
 
     def __call__(self, item, time, dt):
-        orientation = item.orientation.pitch(sin(time) * dt * self.speed)
-        item.orientation = orientation.roll(cos(time * 1.5) * dt * self.speed)
+        # pitch, then roll
+        rotation = Quaternion.from_axis_angle(
+            Vector.x_axis, -sin(time) * dt * self.speed)
+        rotation.compose(Quaternion.from_axis_angle(
+            Vector.z_axis, cos(time * 1.5) * dt * self.speed))
+        item.transform.rotate_locally(rotation)
 
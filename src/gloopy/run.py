@@ -4,9 +4,10 @@ import logging
 import math
 import os
 import platform
+import random
 import sys
-from random import randint, uniform
 
+import numpy
 import pyglet
 from pyglet.event import EVENT_HANDLED
 from pyglet.window import key
@@ -15,6 +16,7 @@ from gloopy.color import Color
 from gloopy.geom.vector import Vector
 from gloopy.geom.orientation import Orientation
 from gloopy.gameitem import GameItem
+from gloopy.loader import Loader
 from gloopy.mainloop import mainloop
 from gloopy.move import Spinner, WobblySpinner, WobblyOrbit
 from gloopy.move.cycle_frames import CycleFrames
@@ -34,8 +36,9 @@ from gloopy.shapes.shape import Shape
 from gloopy.shapes.stellate import stellate
 from gloopy.shapes.subdivide import subdivide
 from gloopy.shapes.tetrahedron import Tetrahedron, DualTetrahedron
-from gloopy.view.shape_to_glyph import shape_to_glyph
+from gloopy.util import path
 from gloopy.util.options import Options
+from gloopy.view.disk_cache import CachedShape, DiskCache
 from gloopy.world import World
 
 
@@ -45,18 +48,38 @@ log = logging.getLogger(__name__)
 def _get_selected_faces(shape, category):
     if shape is None:
         return None
-    return [
-        index
-        for index, face in enumerate(shape.faces)
-        if category is None or face.category == category
-    ]
+    categories = shape.face_categories
+    if category is None:
+        return numpy.arange(len(categories))
+    return numpy.flatnonzero(categories == category)
+
+
+def _unwrap(shape):
+    if isinstance(shape, CachedShape):
+        return shape.shape
+    return shape
+
+
+def FractalTetra(rng=random):
+    color1 = Color.Random(rng)
+    color2 = Color.Random(rng)
+    shape = Tetrahedron(1, color1)
+    with shape.edit():
+        for i in range(8):
+            faces = _get_selected_faces(shape, 0)
+            subdivide(shape, color=color1.tinted(color2, i/5))
+            stellate(shape, faces=faces, height=math.sqrt(2))
+    return shape
 
 
 class Controller(object):
 
-    def __init__(self, world, camera):
+    def __init__(self, world, camera, cache=None, workers=None, loader=None):
         self.world = world
         self.camera = camera
+        self.cache = cache
+        self.workers = workers
+        self.loader = loader
         self.camera_radius = 3
         self.selected_item = None
         self.face_category = None
@@ -76,17 +99,32 @@ class Controller(object):
         world.add(self.highlight)
 
     def add_shape(self, shape, **kwargs):
-        self.selected_item = GameItem(shape=shape, **kwargs)
+        item = GameItem(shape=shape, **kwargs)
+        self.world.add(item)
+        self._select(item)
+        return item
+
+    def build_shape(self, build, **kwargs):
+        '''
+        Add an item whose shape is returned by `build()`, like add_shape. If
+        there is a loader, the shape is built on its background thread, and
+        the item is added and selected once it is ready.
+        '''
+        if self.loader is None:
+            return self.add_shape(build(), **kwargs)
+        self.loader.add(build, callback=self._select, **kwargs)
+
+    def _select(self, item):
+        self.selected_item = item
         self.face_category = None
-        self.world.add(self.selected_item)
         self._update_highlight_shape()
-        return self.selected_item
 
     def _get_next_selectable_item(self):
         shape_ids = [
             item.id
             for item in self.world
             if item.shape and item is not self.highlight
+            and not getattr(item, 'placeholder', False)
         ]
         if shape_ids:
             return self.world[max(shape_ids)]
@@ -95,23 +133,47 @@ class Controller(object):
         self.show_highlight = not self.show_highlight
         self._update_highlight_shape()
 
+    def _loaded_shape(self, item, then):
+        '''
+        Return the shape of the given item, for the highlight and modifiers
+        to work on. If it is a CachedShape whose real shape hasn't been
+        generated, return None instead, and generate it on the loader's
+        thread, calling `then()` once it exists. Shapes are not generated on
+        this thread while there is a loader, since that would stall
+        rendering.
+        '''
+        shape = item.shape
+        if not isinstance(shape, CachedShape):
+            return shape
+        if shape.shape is None:
+            if self.loader is None:
+                return shape.build()
+            self.loader.run(shape.build, lambda _: then())
+        return shape.shape
+
     def _get_highlight_shape(self, selected_item, category):
         if not self.show_highlight:
             return None
         if selected_item is None:
             return None
-        color = (
-            Color.Red
-            if isinstance(selected_item.shape, MultiShape) else
-            Color.White
-        )
-        return Shape(
-            vertices=selected_item.shape.vertices,
-            faces=[
-                list(selected_item.shape.faces)[idx].indices
-                for idx in _get_selected_faces(selected_item.shape, category)
-            ],
-            colors=color,
+        shape = self._loaded_shape(
+            selected_item, self._update_highlight_shape)
+        if shape is None:
+            return None
+        color = Color.Red if isinstance(shape, MultiShape) else Color.White
+        faces = _get_selected_faces(shape, category)
+        sizes = numpy.diff(shape.face_offsets)
+        selected = numpy.zeros(len(sizes), dtype=bool)
+        selected[faces] = True
+        indices = shape.face_indices[numpy.repeat(selected, sizes)]
+        sizes = sizes[faces]
+        colors = numpy.empty((len(faces), 4), dtype=numpy.float32)
+        colors[:] = color
+        return Shape.from_arrays(
+            shape.vertices,
+            indices,
+            numpy.append(0, numpy.cumsum(sizes)),
+            colors,
         )
 
     def _update_highlight_shape(self):
@@ -122,13 +184,7 @@ class Controller(object):
             self.highlight.shape = [shape, None]
         else:
             self.highlight.shape = None
-
-        if self.highlight.shape:
-            self.highlight.glyph = [
-                shape_to_glyph(shape) for shape in self.highlight.shape
-            ]
-        else:
-            self.highlight.glyph = None
+        self.world.changed(self.highlight)
 
     def remove_shape(self):
         if self.selected_item:
@@ -147,16 +203,24 @@ class Controller(object):
 
     def select_next_faces(self):
         if self.selected_item:
+            shape = self._loaded_shape(
+                self.selected_item, self._update_highlight_shape)
+            if shape is None:
+                return
             if self.face_category is None:
                 self.face_category = 0
-            elif self.face_category < self.selected_item.shape.next_category():
+            elif self.face_category < shape.next_category():
                 self.face_category += 1
         self._update_highlight_shape()
 
     def select_prev_faces(self):
         if self.selected_item:
+            shape = self._loaded_shape(
+                self.selected_item, self._update_highlight_shape)
+            if shape is None:
+                return
             if self.face_category is None:
-                self.face_category = self.selected_item.shape.next_category() - 1
+                self.face_category = shape.next_category() - 1
             elif self.face_category >= 0:
                 self.face_category -= 1
         self._update_highlight_shape()
@@ -181,8 +245,8 @@ class Controller(object):
 
 
     def add_coaxial_rings(self):
-        height = randint(-10, 11)
-        radius = randint(3, 10)
+        height = random.randint(-10, 11)
+        radius = random.randint(3, 10)
         color1 = Color.Blue.tinted(Color.Grey, abs(height/10))
         color2 = Color.Blue.tinted(Color.White, abs(height/10))
         return self.add_shape(
@@ -193,36 +257,52 @@ class Controller(object):
             ),
             position=Vector(0, height * 6, 0),
             orientation=Orientation(Vector.y_axis),
-            update=Spinner(Vector.y_axis, speed=uniform(-1, 1)),
+            update=Spinner(Vector.y_axis, speed=random.uniform(-1, 1)),
         )
 
+    def generate(self, generator, **params):
+        '''
+        Return the shape created by `generator(rng=rng, **params)`, where
+        `rng` is a random.Random of its own, so that generating shapes on
+        the loader's thread doesn't use the global random number generator.
+        If a disk cache is in use, the shape is generated from a fixed
+        random seed, and its glyph is read from the cache when possible.
+        '''
+        if self.cache is None:
+            return generator(rng=random.Random(), **params)
+        return CachedShape(self.cache, generator, params)
+
     def add_fractal_tetra(self):
-        color1 = Color.Random()
-        color2 = Color.Random()
-        shape = Tetrahedron(1, color1)
-        for i in range(8):
-            faces = _get_selected_faces(shape, 0)
-            subdivide(shape, color=color1.tinted(color2, i/5))
-            stellate(shape, faces=faces, height=math.sqrt(2))
-        return self.add_shape(shape)
+        return self.build_shape(lambda: self.generate(FractalTetra))
 
     def mod_shape(self, modifier, *args):
-        if isinstance(self.selected_item.shape, MultiShape):
+        # edits of a cached shape wait until it has been generated
+        item = self.selected_item
+        shape = self._loaded_shape(
+            item, lambda: self._modify(item, modifier, args))
+        if shape is not None:
+            self._modify(item, modifier, args)
+
+    def _modify(self, item, modifier, args):
+        if item is not self.selected_item:
+            # deselected while its shape was generated
+            return
+        shape = _unwrap(item.shape)
+        if isinstance(shape, MultiShape):
             self.show_highlight = True
             self._update_highlight_shape()
             return
-        faces = _get_selected_faces(
-            self.selected_item.shape, self.face_category)
-        modifier(self.selected_item.shape, faces, *args)
-        self.selected_item.glyph = [shape_to_glyph(self.selected_item.shape)]
+        faces = _get_selected_faces(shape, self.face_category)
+        # the world updates the item's glyph when the edit ends
+        with shape.edit():
+            modifier(shape, faces, *args)
         self._update_highlight_shape()
 
     def mod_extrude(self, length):
         self.mod_shape(extrude, length)
 
     def mod_normalize(self):
-        normalize(self.selected_item.shape)
-        self.selected_item.glyph = [shape_to_glyph(self.selected_item.shape)]
+        self.mod_shape(lambda shape, faces: normalize(shape))
 
     def mod_subdivide(self):
         self.mod_shape(subdivide)
@@ -234,8 +314,7 @@ class Controller(object):
         self.mod_shape(stellate, amount)
 
     def recolor(self, shape, faces, color):
-        for face_index in faces:
-            shape.faces[face_index].color = color
+        shape.face_colors[faces] = color
 
     def mod_color(self):
         self.mod_shape(self.recolor, Color.Random())
@@ -303,19 +382,34 @@ def create_keyhandler(controller):
         ),
         key.U: controller.add_coaxial_rings,
 
-        key.Z: lambda: controller.add_shape(
-            CubeGlob(4, 70, 1000, Color.DarkRed)
+        key.Z: lambda: controller.build_shape(
+            lambda: controller.generate(
+                CubeGlob, size=4, radius=70, number=1000,
+                colors=Color.DarkRed, workers=controller.workers,
+            )
         ),
-        key.X: lambda: controller.add_shape(
-            CubeGlob(8, 150, 2000, Color.Red)
+        key.X: lambda: controller.build_shape(
+            lambda: controller.generate(
+                CubeGlob, size=8, radius=150, number=2000, colors=Color.Red,
+                workers=controller.workers,
+            )
         ),
-        key.C: lambda: controller.add_shape(
-            RgbCubeCluster(edge=4, cube_count=64000, scale=2, hole=15)
+        key.C: lambda: controller.build_shape(
+            lambda: controller.generate(
+                RgbCubeCluster, edge=4, cube_count=64000, scale=2, hole=15,
+                workers=controller.workers,
+            )
         ),
-        key.V: lambda: controller.add_shape(
-            [
-                BitmapCubeCluster('invader1.png', edge=10),
-                BitmapCubeCluster('invader2.png', edge=10)
+        key.V: lambda: controller.build_shape(
+            lambda: [
+                BitmapCubeCluster(
+                    'invader1.png', edge=10, greedy=True,
+                    workers=controller.workers,
+                ),
+                BitmapCubeCluster(
+                    'invader2.png', edge=10, greedy=True,
+                    workers=controller.workers,
+                ),
             ],
             position=Vector.RandomShell(350),
             update=CycleFrames(1),
@@ -395,8 +489,14 @@ def main():
     )
     world = World(Color(0.3, 0.4, 0.7))
     window = create_window(options)
-    window.push_handlers(create_keyhandler(Controller(world, camera)))
-    mainloop(world, window, options, camera)
+    cache = DiskCache(path.CACHE) if options.cache else None
+    loader = Loader(world)
+    window.push_handlers(
+        create_keyhandler(
+            Controller(world, camera, cache, options.workers, loader)
+        )
+    )
+    mainloop(world, window, options, camera, loader)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+from __future__ import division
+
+from functools import wraps
+
+import numpy
+
+from .shape import _gather
+
+
+def edits(modifier):
+    '''
+    Decorate a shape modifier, which takes the shape as its first argument,
+    so that it makes all its changes within a single
+    :meth:`~gloopy.shapes.shape.Shape.edit`.
+    '''
+    @wraps(modifier)
+    def edit(shape, *args, **kwargs):
+        with shape.edit():
+            return modifier(shape, *args, **kwargs)
+    return edit
+
+
+class FaceBatch(object):
+    '''
+    The selected faces of a shape, gathered into arrays, so that shape
+    modifiers can operate on all of them at once, rather than on one face at
+    a time.
+
+    .. function:: __init__(shape, faces=None)
+
+        `shape`: the Shape to be modified. Doesn't work on MultiShapes.
+
+        `faces`: an iterable of integer face indices. Defaults to all faces.
+
+    Per-face arrays have one row for each selected face, in the order given:
+    `faces`, `sizes`, `firsts` (the position of each face's first corner in
+    the per-corner arrays), and the properties `colors`, `categories`,
+    `normals` and `centroids`.
+
+    Per-corner arrays have one row for each index of every selected face,
+    face after face: `corners`, the vertex index at each corner, and
+    `following` and `preceding`, the positions in the per-corner arrays of
+    the next and previous corners around the same face.
+
+    A modifier typically adds new vertices with :meth:`add_vertices`, then
+    passes the new faces to :meth:`replace`, which leaves the shape's faces
+    in the same order as calling `shape.replace_face` on each face in turn
+    would.
+
+    `repeated` is True if `faces` names any face more than once. Such faces
+    must be modified one at a time, since each repetition operates on the
+    result of the last.
+    '''
+    def __init__(self, shape, faces=None):
+        self.shape = shape
+        count = len(shape.faces)
+        if faces is None:
+            self.faces = numpy.arange(count)
+            self.repeated = False
+        else:
+            faces = numpy.array(list(faces), dtype=numpy.intp)
+            # negative indices count from the end, as in shape.faces
+            self.faces = numpy.where(faces < 0, faces + count, faces)
+            self.repeated = bool(
+                len(faces) and numpy.bincount(self.faces).max() > 1)
+
+        self.sizes = shape._sizes.array[self.faces].astype(numpy.intp)
+        self.firsts = numpy.cumsum(self.sizes) - self.sizes
+        self.corners = shape._indices.array[
+            _gather(shape._starts.array[self.faces], self.sizes)]
+
+        # position of each corner within its own face
+        firsts = self.per_corner(self.firsts)
+        sides = self.per_corner(self.sizes)
+        self._local = numpy.arange(len(self.corners)) - firsts
+        self.following = firsts + (self._local + 1) % sides
+        self.preceding = firsts + (self._local - 1) % sides
+        # each face's corners, last to first
+        self._reverse = firsts + sides - 1 - self._local
+
+
+    def __len__(self):
+        return len(self.faces)
+
+
+    @property
+    def colors(self):
+        return self.shape.face_colors[self.faces]
+
+    @property
+    def categories(self):
+        return self.shape.face_categories[self.faces]
+
+    # only the selected faces are recalculated, since others might be
+    # replaced before their normals are needed
+
+    @property
+    def normals(self):
+        self.shape._refresh(self.faces)
+        return self.shape._normals.array[self.faces].astype(numpy.float64)
+
+    @property
+    def centroids(self):
+        self.shape._refresh(self.faces)
+        return self.shape._centroids.array[self.faces]
+
+
+    def per_corner(self, values):
+        '''
+        Return the given per-face array repeated for each corner of its face.
+        '''
+        return numpy.repeat(values, self.sizes, axis=0)
+
+
+    def add_vertices(self, positions):
+        '''
+        Append the given N x 3 array of positions to the shape's vertices,
+        and return an array of their indices.
+        '''
+        vertices = self.shape.vertices
+        start = len(vertices)
+        vertices.extend(positions)
+        return numpy.arange(start, len(vertices))
+
+
+    def replace(
+        self, corner_faces, colors, categories,
+        centers=None, center_colors=None, center_categories=None,
+    ):
+        '''
+        Replace each selected face with a new face for each of its corners.
+        `corner_faces` is an array with a row of vertex indices for every
+        corner, and `colors` and `categories` are per-corner arrays, or
+        single values.
+
+        If `centers` is given, it is a per-corner array of vertex indices,
+        which forms one more new face in place of each selected face, with
+        per-face (or single) `center_colors` and `center_categories`. The
+        corner faces follow all existing faces, last corner first, as they
+        would if the center face ended the list passed to
+        `shape.replace_face`.
+
+        Otherwise, each face's last corner face takes its place, and the
+        others follow all existing faces.
+        '''
+        shape = self.shape
+        count = len(self.corners)
+        corner_faces = numpy.asarray(corner_faces)
+        colors = numpy.broadcast_to(
+            numpy.asarray(colors, dtype=numpy.float32), (count, 4))
+        categories = numpy.broadcast_to(categories, (count,))
+
+        if centers is None:
+            last = self.firsts + self.sizes - 1
+            shape._set_faces(
+                self.faces,
+                corner_faces[last].ravel(),
+                numpy.full(len(self), corner_faces.shape[1], numpy.int32),
+                colors[last],
+                categories[last],
+            )
+            appended = self._reverse[self._local != 0]
+        else:
+            shape._set_faces(
+                self.faces, centers, self.sizes.astype(numpy.int32),
+                center_colors, center_categories)
+            appended = self._reverse
+
+        shape._add_faces(
+            corner_faces[appended].ravel(),
+            numpy.full(len(appended), corner_faces.shape[1], numpy.int32),
+            colors[appended],
+            categories[appended],
+        )
@@ -15,6 +15,26 @@ def _logical_xor(a, b):
     return bool(a) ^ bool(b)
 
 
+# faces of a cuboid whose vertices are ordered as generated by
+# product((-x, +x), (-y, +y), (-z, +z)), and the direction each face points
+CUBOID_FACES = [
+    [0, 1, 3, 2], # left
+    [4, 6, 7, 5], # right
+    [7, 3, 1, 5], # front
+    [0, 2, 6, 4], # back
+    [3, 7, 6, 2], # +y top
+    [1, 0, 4, 5], # -y bottom
+]
+CUBOID_FACE_DIRECTIONS = [
+    (-1, 0, 0),
+    (+1, 0, 0),
+    (0, 0, +1),
+    (0, 0, -1),
+    (0, +1, 0),
+    (0, -1, 0),
+]
+
+
 def Cube(radius=None, colors=None, edge=None):
     '''
     Return a new Shape, shaped like a cube.
@@ -39,15 +59,7 @@ def Cuboid(x, y, z, colors=None):
     one for each face.
     '''
     verts = list(product((-x/2, +x/2), (-y/2, +y/2), (-z/2, +z/2)))
-    faces = [
-        [0, 1, 3, 2], # left
-        [4, 6, 7, 5], # right
-        [7, 3, 1, 5], # front
-        [0, 2, 6, 4], # back
-        [3, 7, 6, 2], # +y top
-        [1, 0, 4, 5], # -y bottom
-    ]
-    return Shape(verts, faces, colors)
+    return Shape(verts, CUBOID_FACES, colors)
 
 
 def TruncatedCube(edge, truncation=0.67, color1=None, color2=None):
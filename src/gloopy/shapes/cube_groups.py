@@ -1,21 +1,52 @@
 '''
-Factory functions that return a single MultiShape instance formed by
+Factory functions that return a single MultiShape or Shape instance formed by
 composing several cubes
 '''
 from __future__ import division
 
 from itertools import repeat, product
+import random
 from os.path import join
-from random import randint
 
+import numpy
 from pyglet import image
 
-from .cube import Cube
+from .cube import CUBOID_FACES, CUBOID_FACE_DIRECTIONS, Cube
 from .multishape import MultiShape
+from .shape import Shape
 from ..color import Color
 from ..geom.orientation import Orientation
 from ..geom.vector import Vector
 from ..util import path
+from ..util.parallel import chunk_slices, map_chunks, merge_indexed
+
+
+# generators with a `workers` argument only split work into chunks of at
+# least this many cubes, since smaller chunks are not worth sending to
+# another process
+MIN_CHUNK = 4096
+
+
+def _chunk_rngs(count, workers, rng):
+    '''
+    Return (count, rng) for each chunk of `count` randomly generated items.
+    If there is only one chunk, because there are no workers or too few
+    items, it is generated in this process using the given random number
+    generator `rng` as it is. Otherwise, map_chunks runs the chunks in
+    worker processes, and each gets its own random.Random, seeded from
+    `rng`, so the result is still determined by its state. No generator is
+    ever reseeded.
+    '''
+    chunks = chunk_slices(count, workers, MIN_CHUNK)
+    if not workers or workers < 2 or len(chunks) < 2:
+        return [(count, rng)]
+    return [
+        (
+            chunk.stop - chunk.start,
+            random.Random(rng.randint(0, 2 ** 32 - 1)),
+        )
+        for chunk in chunks
+    ]
 
 
 def CubeCross(edge, color1, color2):
@@ -57,23 +88,46 @@ def CubeCorners(edge, color1, color2):
     return multi
 
 
-def CubeGlob(size, radius, number, colors):
+def CubeGlob(size, radius, number, colors, workers=None, rng=random):
     '''
     Return a new Shape consisting of a random glob of cubes arranged in a
     spherical shell.
+
+    `workers`: if greater than one, the random placement of cubes is split
+    into chunks, generated in that many worker processes.
+
+    `rng`: the random number generator used, such as a random.Random
+    instance. Defaults to the global one.
     '''
     glob = MultiShape()
     cube = Cube(size, colors)
-    for _ in range(number):
-        glob.add(
-            cube,
-            position=Vector.RandomShell(radius),
-            orientation=Orientation.Random()
-        )
+    for placements in map_chunks(
+        _glob_placements,
+        [
+            (count, radius, chunk_rng)
+            for count, chunk_rng in _chunk_rngs(number, workers, rng)
+        ],
+        workers
+    ):
+        for position, orientation in placements:
+            glob.add(cube, position=position, orientation=orientation)
     return glob
 
 
-def RgbCubeCluster(edge, cube_count, scale=1, hole=0):
+def _glob_placements(count, radius, rng):
+    '''
+    Return a list of `count` random (position, orientation) in a spherical
+    shell, drawn from the random number generator `rng`.
+    '''
+    return [
+        (Vector.RandomShell(radius, rng), Orientation.Random(rng))
+        for _ in range(count)
+    ]
+
+
+def RgbCubeCluster(
+    edge, cube_count, scale=1, hole=0, workers=None, rng=random
+):
     '''
     Return a new Shape consisting of a random array of cubes arranged within
     a large cube-shaped volume. The small cubes are colored by their position
@@ -87,15 +141,40 @@ def RgbCubeCluster(edge, cube_count, scale=1, hole=0):
 
     `hole`: if >0, leave an empty hole of this radius in the middle of the
         volume.
+
+    `workers`: if greater than one, both choosing the cube locations and
+        building the cluster from them are split into chunks, run in that
+        many worker processes.
+
+    `rng`: the random number generator used, such as a random.Random
+        instance. Defaults to the global one.
+    '''
+    locations = {}
+    for chunk in map_chunks(
+        _rgb_locations,
+        [
+            (count, scale, hole, chunk_rng)
+            for count, chunk_rng in _chunk_rngs(cube_count, workers, rng)
+        ],
+        workers
+    ):
+        locations.update(chunk)
+    return CubeCluster(locations, edge=edge, workers=workers)
+
+
+def _rgb_locations(cube_count, scale, hole, rng):
+    '''
+    Return a dict of `cube_count` random cube locations for RgbCubeCluster,
+    mapped to their color, drawn from the random number generator `rng`.
     '''
     locations = {}
 
     SIZE = 256
     for _ in range(cube_count):
         while True:
-            r = randint(0, SIZE - 1)
-            g = randint(0, SIZE - 1)
-            b = randint(0, SIZE - 1)
+            r = rng.randint(0, SIZE - 1)
+            g = rng.randint(0, SIZE - 1)
+            b = rng.randint(0, SIZE - 1)
             pos = scale * Vector(
                 r - SIZE / 2,
                 g - SIZE / 2,
@@ -110,26 +189,182 @@ def RgbCubeCluster(edge, cube_count, scale=1, hole=0):
             b / SIZE * Color.CHANNEL_MAX,
         )
         locations[pos] = color
-    return CubeCluster(locations, edge=edge)
+    return locations
 
 
-def CubeCluster(locations, edge=1):
+def CubeCluster(locations, edge=1, greedy=False, workers=None):
     '''
     Returns a new shape, consisting of a cluster of cubes.
 
     :param locations: maps location of cubes to their color.
     :type locations: dict
 
-    In future could be optimised to remove faces of cubes which are never
-    visible due to abutting a neighbour.
+    Faces where two cubes abut, which can never be visible, are omitted.
+    Cubes abut if their locations differ by exactly `edge` along one axis.
+
+    If `greedy` is True, adjacent coplanar faces of the same color are also
+    merged into larger rectangles, which produces far fewer faces for
+    voxel-style shapes. This requires all cubes to lie on a single grid of
+    spacing `edge`, otherwise ValueError is raised.
+
+    If `workers` is greater than one, the cubes are split into chunks, whose
+    vertices and faces are built in that many worker processes, then merged.
+    Greedy meshing is always done in this process.
     '''
-    multi = MultiShape()
-    for location, color in locations.items():
-        multi.add(
-            Cube(edge=edge, colors=color),
-            position=Vector(*location),
-        )
-    return multi
+    positions = numpy.array(
+        [tuple(location) for location in locations], dtype=numpy.float64
+    ).reshape(-1, 3)
+    colors = numpy.array(
+        list(locations.values()), dtype=numpy.float32).reshape(-1, 4)
+
+    if greedy:
+        return Shape(*_greedy_mesh(positions, colors, edge))
+
+    chunks = chunk_slices(len(positions), workers, MIN_CHUNK)
+    return Shape(*merge_indexed(map_chunks(
+        _cluster_chunk,
+        [(positions, colors[chunk], edge, chunk) for chunk in chunks],
+        workers
+    )))
+
+
+def _cluster_chunk(positions, colors, edge, chunk):
+    '''
+    Return (vertices, faces, colors) of the exposed faces of the cubes at
+    positions[chunk], whose colors are given, hiding faces which abut any
+    of the cubes in `positions`.
+    '''
+    corners = numpy.array(list(product((-edge / 2, +edge / 2), repeat=3)))
+    vertices = (
+        positions[chunk, numpy.newaxis, :] + corners).reshape(-1, 3)
+
+    cubes, sides = numpy.nonzero(
+        _exposed_sides(positions[chunk], edge, positions))
+    faces = (
+        cubes[:, numpy.newaxis] * len(corners) +
+        numpy.array(CUBOID_FACES)[sides]
+    )
+    return vertices, faces, colors[cubes]
+
+
+# subdivisions of the cube edge used to compare cube locations
+_GRID = 1024
+
+def _exposed_sides(positions, edge, occupied=None):
+    '''
+    Given an N x 3 array of cube positions, return an N x 6 boolean array,
+    which is False for each side of each cube, as ordered in CUBOID_FACES,
+    which abuts another cube. `occupied` is an M x 3 array of the positions
+    of all cubes, if `positions` is only some of them.
+    '''
+    exposed = numpy.ones((len(positions), len(CUBOID_FACES)), dtype=bool)
+    if len(positions) == 0:
+        return exposed
+    if occupied is None:
+        occupied = positions
+
+    # each location as a single integer, so that neighbours can be looked
+    # up with a sorted search
+    grid = numpy.round(positions / edge * _GRID).astype(numpy.int64)
+    occupied_grid = numpy.round(occupied / edge * _GRID).astype(numpy.int64)
+    low = occupied_grid.min(axis=0) - _GRID
+    extent = occupied_grid.max(axis=0) + _GRID - low + 1
+    def encode(grid):
+        grid = grid - low
+        return (grid[:, 0] * extent[1] + grid[:, 1]) * extent[2] + grid[:, 2]
+
+    occupied = numpy.sort(encode(occupied_grid))
+    for side, direction in enumerate(CUBOID_FACE_DIRECTIONS):
+        neighbours = encode(grid + numpy.array(direction) * _GRID)
+        found = numpy.searchsorted(occupied, neighbours)
+        found[found == len(occupied)] = 0
+        exposed[:, side] = occupied[found] != neighbours
+    return exposed
+
+
+def _greedy_mesh(positions, colors, edge):
+    '''
+    Given N x 3 cube positions on a grid of spacing `edge`, and their
+    N x 4 colors, return (vertices, faces, colors) of the exposed surface
+    of the cubes, with coplanar adjacent faces of the same color merged
+    into rectangles.
+    '''
+    if len(positions) == 0:
+        return numpy.empty((0, 3)), numpy.empty((0, 4), dtype=int), colors
+
+    grid = numpy.round(positions / edge * _GRID).astype(numpy.int64)
+    if numpy.any((grid - grid[0]) % _GRID):
+        raise ValueError('cube locations do not lie on a grid of %s' % (edge,))
+    cells = (grid - grid.min(axis=0)) // _GRID
+    origin = grid.min(axis=0) / _GRID * edge
+
+    # a volume of color ids, 0 for empty, padded with empty cells all round
+    palette, ids = numpy.unique(colors, axis=0, return_inverse=True)
+    volume = numpy.zeros(cells.max(axis=0) + 3, dtype=numpy.int32)
+    volume[tuple((cells + 1).T)] = ids.ravel() + 1
+
+    vertices = []
+    faces = []
+    face_colors = []
+    vertex_count = 0
+    for direction in CUBOID_FACE_DIRECTIONS:
+        axis = numpy.flatnonzero(direction)[0]
+        sign = direction[axis]
+        exposed = numpy.where(
+            numpy.roll(volume, -sign, axis=axis) == 0, volume, 0)
+        # the two axes within each layer, in increasing order
+        u_axis, v_axis = [a for a in range(3) if a != axis]
+        layers = numpy.moveaxis(exposed, axis, 0)
+        for layer in numpy.flatnonzero(layers.any(axis=(1, 2))):
+            quads = numpy.array(_greedy_rectangles(layers[layer]))
+            corners = numpy.empty((len(quads), 4, 3))
+            corners[:, :, axis] = layer + sign / 2
+            # corners wound anticlockwise in (u, v)
+            for corner, (u, v) in enumerate([(0, 1), (2, 1), (2, 3), (0, 3)]):
+                corners[:, corner, u_axis] = quads[:, u] - 0.5
+                corners[:, corner, v_axis] = quads[:, v] - 0.5
+            # u x v points along +axis, except for the y axis
+            if (1 if axis != 1 else -1) != sign:
+                corners = corners[:, ::-1]
+            vertices.append(origin + (corners.reshape(-1, 3) - 1) * edge)
+            faces.append(
+                vertex_count + numpy.arange(len(quads) * 4).reshape(-1, 4))
+            face_colors.append(palette[quads[:, 4] - 1])
+            vertex_count += len(quads) * 4
+
+    return (
+        numpy.concatenate(vertices),
+        numpy.concatenate(faces),
+        numpy.concatenate(face_colors),
+    )
+
+
+def _greedy_rectangles(grid):
+    '''
+    Cover the non-zero cells of the given 2D array of ids with rectangles,
+    each covering cells of a single id. Returns a list of rectangles as
+    (u0, v0, u1, v1, id), covering cells grid[u0:u1, v0:v1].
+    '''
+    rectangles = []
+    done = grid == 0
+    height, width = grid.shape
+    for u0, v0 in zip(*numpy.nonzero(grid)):
+        if done[u0, v0]:
+            continue
+        id = grid[u0, v0]
+        v1 = v0 + 1
+        while v1 < width and grid[u0, v1] == id and not done[u0, v1]:
+            v1 += 1
+        u1 = u0 + 1
+        while (
+            u1 < height and
+            numpy.all(grid[u1, v0:v1] == id) and
+            not numpy.any(done[u1, v0:v1])
+        ):
+            u1 += 1
+        done[u0:u1, v0:v1] = True
+        rectangles.append((u0, v0, u1, v1, id))
+    return rectangles
 
 
 def BitmapAsDict(filename, edge=1):
@@ -153,6 +388,8 @@ def BitmapAsDict(filename, edge=1):
     return locations
 
 
-def BitmapCubeCluster(filename, edge=1):
-    return CubeCluster( BitmapAsDict(filename, edge), edge=edge )
-
+def BitmapCubeCluster(filename, edge=1, greedy=False, workers=None):
+    return CubeCluster(
+        BitmapAsDict(filename, edge), edge=edge, greedy=greedy,
+        workers=workers,
+    )
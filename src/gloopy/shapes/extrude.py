@@ -1,6 +1,10 @@
 from __future__ import division
 
+import numpy
+
+from .batch import FaceBatch, edits
 from .shape import add_vertex, Face
+from ..color import Color
 
 
 def extrude_face(shape, face_index, offset, new_category):
@@ -35,6 +39,7 @@ def extrude_face(shape, face_index, offset, new_category):
     shape.replace_face(face_index, new_faces)
 
     
+@edits
 def extrude(shape, faces=None, offset=0):
     """
     Modify the given shape in-place, by extruding the specified faces by
@@ -43,11 +48,40 @@ def extrude(shape, faces=None, offset=0):
     `faces` is an iterable of integer face indices upon which to operate. If
     omitted, it defaults to all faces.
 
+    All the faces are extruded at once, with array operations, giving the
+    same result as calling :func:`extrude_face` on each face in turn.
+
     Doesn't work on Multishapes. This should get fixed in a future release.
     """
-    if faces is None:
-        faces = range(len(shape.faces))
+    batch = FaceBatch(shape, faces)
     new_category = shape.next_category()
-    for face in faces:
-        extrude_face(shape, face, offset, new_category)
+    if batch.repeated:
+        for face in batch.faces.tolist():
+            extrude_face(shape, face, offset, new_category)
+        return
+    if not len(batch):
+        return
+
+    # new vertices, each corner moved along its face's normal
+    corners = batch.corners
+    moved = shape.vertices.array[corners].astype(numpy.float64)
+    moved += batch.per_corner(batch.normals * offset)
+    ends = batch.add_vertices(moved)
 
+    # new faces for edges of extrusion, in the inverse of the face's color
+    following = batch.following
+    colors = batch.colors
+    inverted = colors.copy()
+    inverted[:, :3] = Color.CHANNEL_MAX - colors[:, :3]
+    sides = numpy.stack(
+        [corners, corners[following], ends[following], ends], axis=1)
+
+    # new face on end of extrusion
+    batch.replace(
+        sides,
+        batch.per_corner(inverted),
+        batch.per_corner(batch.categories),
+        centers=ends,
+        center_colors=colors,
+        center_categories=new_category,
+    )
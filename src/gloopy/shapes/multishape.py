@@ -1,6 +1,10 @@
 
-from .shape import Face
+import numpy
+
+from .shape import Face, Shape
+from ..color import Color
 from ..geom.matrix import Matrix
+from ..geom.orientation import Orientation
 
 
 class MultiShape(object):
@@ -12,17 +16,29 @@ class MultiShape(object):
     This Multishape provides attributes that make it accessible like a normal
     shape:
 
-    `vertices`: a sequence of all the vertices in all the child shapes, each
+    `vertices`: a VectorArray of all the vertices in all the child shapes, each
     one offset and oriented by that child shape's position and orientation.
 
     `faces`: a collection of all the Face instances of all the child shapes.
 
+    `face_indices`, `face_offsets`, `face_colors`, `face_categories`,
+    `face_normals`: arrays of all the faces of all the child shapes, as
+    described for :class:`~gloopy.shapes.shape.Shape`.
+
+    `children`, `vertices`, `faces` and the face arrays are calculated once,
+    when first used, and reused until another child is added to this
+    MultiShape or to any MultiShape nested within it, as counted by
+    `version`. Child shapes should not otherwise be modified after they are
+    added.
+
     .. function:: __init__()
     '''
     def __init__(self):
         self._children = []
-        self._vertices = None
-        self._faces = None
+        self._nested = []
+        self._version = 0
+        self._cache = {}
+        self._cache_version = None
 
 
     def add(self, shape, position=None, orientation=None):
@@ -31,40 +47,204 @@ class MultiShape(object):
         The shape will be offset by `position` from the center of the
         MultiShape, and oriented by `orientation`.
         '''
+        if orientation is None:
+            orientation = Orientation.Identity
         matrix = Matrix(position, orientation)
         self._children.append((shape, matrix))
+        if isinstance(shape, MultiShape):
+            self._nested.append(shape)
+        self._version += 1
+
+
+    @property
+    def version(self):
+        '''
+        A count which increases whenever a child is added to this MultiShape
+        or to any MultiShape nested within it.
+        '''
+        return self._version + sum(shape.version for shape in self._nested)
+
+
+    def _cached(self, name, calculate):
+        '''
+        Return the value of `calculate()`, which is calculated once and then
+        reused until the version changes.
+        '''
+        version = self.version
+        if self._cache_version != version:
+            self._cache = {}
+            self._cache_version = version
+        if name not in self._cache:
+            self._cache[name] = calculate()
+        return self._cache[name]
 
 
     @property
     def children(self):
+        '''
+        A list of (shape, matrix) for every shape in this MultiShape, with
+        nested MultiShapes replaced by their children, whose matrices are
+        composed with that of the MultiShape containing them.
+        '''
+        return self._cached('children', self._get_children)
+
+    def _get_children(self):
+        children = []
         for shape, transform in self._children:
             if isinstance(shape, MultiShape):
-                for subshape, subtransform in shape.children:
-                    yield subshape, transform * subtransform
+                subchildren = shape.children
+                products = transform.multiply_all(
+                    subtransform for _, subtransform in subchildren)
+                children.extend(
+                    (subshape, product)
+                    for (subshape, _), product in zip(subchildren, products)
+                )
             else:
-                yield shape, transform 
+                children.append((shape, transform))
+        return children
+
+
+    def repeated_child(self):
+        '''
+        If all the shapes in this MultiShape, including those in nested
+        MultiShapes, are the same shape object, return a tuple of that shape
+        and a list of the Matrix transforms of each copy of it. Otherwise
+        return None.
+        '''
+        children = self.children
+        if not children:
+            return None
+        shape = children[0][0]
+        if any(child is not shape for child, _ in children):
+            return None
+        return shape, [transform for _, transform in children]
 
 
     @property
     def vertices(self):
-        if self._vertices is None:
-            self._vertices = [
-                transform * vertex
-                for child, transform in self.children
-                for vertex in child.vertices
-            ]
-        return self._vertices
+        return self._cached('compiled', self.compile).vertices
 
 
     @property
     def faces(self):
-        child_offset = 0
-        for child, _ in self.children:
-            for face in child.faces:
-                new_indices = [
-                    index + child_offset
-                    for index in face.indices
-                ]
-                yield Face( new_indices, face.color, self )
-            child_offset += len(child.vertices)
+        '''
+        A list of Faces, copies of the faces of all child shapes, with
+        indices into self.vertices.
+        '''
+        return self._cached('faces', self._get_faces)
+
+    def _get_faces(self):
+        indices, offsets, colors, categories, _ = self._get_arrays()
+        # plain lists are much quicker to slice than arrays
+        indices = indices.tolist()
+        offsets = offsets.tolist()
+        return [
+            Face(indices[start:stop], Color._make(color), self, category)
+            for start, stop, color, category in zip(
+                offsets[:-1], offsets[1:], colors.tolist(),
+                categories.tolist(),
+            )
+        ]
+
+
+    def _get_arrays(self):
+        compiled = self._cached('compiled', self.compile)
+        return (
+            compiled.face_indices,
+            compiled.face_offsets,
+            compiled.face_colors,
+            compiled.face_categories,
+            compiled.face_normals,
+        )
+
+
+    def compile(self):
+        '''
+        Return a new :class:`~gloopy.shapes.shape.Shape` holding the faces of
+        every child shape, with their vertices already moved by their
+        composed transforms, all in single contiguous arrays. The normals of
+        child faces are rotated, rather than recalculated from the
+        transformed vertices, and face categories are kept. All the copies
+        of a child shape which is added many times, as by
+        :class:`~gloopy.shapes.ring.Ring`, are transformed together in one
+        operation. The returned
+        shape is independent of this MultiShape, so does not change if more
+        children are added.
+        '''
+        children = self.children
+        vertex_counts = [len(child.vertices) for child, _ in children]
+        index_counts = [len(child.face_indices) for child, _ in children]
+        face_counts = [len(child.face_colors) for child, _ in children]
+        vertex_starts = numpy.cumsum([0] + vertex_counts)
+        index_starts = numpy.cumsum([0] + index_counts)
+        face_starts = numpy.cumsum([0] + face_counts)
+        vertices = numpy.empty((vertex_starts[-1], 3), dtype=numpy.float32)
+        indices = numpy.empty(index_starts[-1], dtype=numpy.int32)
+        offsets = numpy.empty(face_starts[-1] + 1, dtype=numpy.int32)
+        colors = numpy.empty((face_starts[-1], 4), dtype=numpy.float32)
+        categories = numpy.empty(face_starts[-1], dtype=numpy.int32)
+        normals = numpy.empty((face_starts[-1], 3), dtype=numpy.float32)
+
+        # Ring and friends repeat the same child shapes many times, so
+        # transform every copy of each distinct shape in one operation.
+        groups = {}
+        for number, (child, _) in enumerate(children):
+            groups.setdefault(id(child), []).append(number)
+        for numbers in groups.values():
+            child = children[numbers[0]][0]
+            matrices = numpy.array(
+                [children[number][1].elements for number in numbers]
+            ).reshape(-1, 4, 4)
+            rotations = matrices[:, :3, :3].transpose(0, 2, 1)
+            copy_vertices = child.vertices.array @ rotations
+            copy_vertices += matrices[:, None, :3, 3]
+            vertex_rows = (
+                vertex_starts[numbers][:, None] +
+                numpy.arange(vertex_counts[numbers[0]]))
+            index_rows = (
+                index_starts[numbers][:, None] +
+                numpy.arange(index_counts[numbers[0]]))
+            face_rows = (
+                face_starts[numbers][:, None] +
+                numpy.arange(face_counts[numbers[0]]))
+            vertices[vertex_rows] = copy_vertices
+            indices[index_rows] = (
+                child.face_indices + vertex_starts[numbers][:, None])
+            offsets[face_rows] = (
+                child.face_offsets[:-1] + index_starts[numbers][:, None])
+            colors[face_rows] = child.face_colors
+            categories[face_rows] = child.face_categories
+            normals[face_rows] = child.face_normals @ rotations
+        offsets[-1] = index_starts[-1]
+
+        return Shape.from_arrays(
+            vertices, indices, offsets, colors, categories, normals)
+
+    @property
+    def face_indices(self):
+        return self._get_arrays()[0]
+
+    @property
+    def face_offsets(self):
+        return self._get_arrays()[1]
 
+    @property
+    def face_colors(self):
+        return self._get_arrays()[2]
+
+    @property
+    def face_categories(self):
+        return self._get_arrays()[3]
+
+    @property
+    def face_normals(self):
+        return self._get_arrays()[4]
+
+
+    def next_category(self):
+        '''
+        Return the lowest positive integer not used as the category of any
+        child face, as :meth:`~gloopy.shapes.shape.Shape.next_category`
+        does.
+        '''
+        return self._cached('compiled', self.compile).next_category()
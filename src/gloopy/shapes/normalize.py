@@ -1,23 +1,33 @@
 from __future__ import division
 
+import numpy
 
-def normalize(shape, length=1):
+from .batch import FaceBatch, edits
+from ..geom.vector import VectorArray
+
+
+@edits
+def normalize(shape, length=1, faces=None):
     """
     Modifies the given shape in-place, by normalizing the position of every
     vertex to lie at `length` distance from the center. This squishes the shape
     to make it roughly spherical.
 
+    If `faces` is given, as an iterable of integer face indices, only the
+    vertices of those faces are moved.
+
     If the shape contains edges which have one face on one side, but more than
     one face on the other side, then normalizing will result in ugly split
     seams, through which the interior of the object will be visible.
 
     Doesn't work on Multishapes. This should get fixed in a future release.
     """
-    shape.vertices = [
-        v.normalized(length) for v in shape.vertices
-    ]
-    # after moving vertices, we need to recalc the face normals
-    for face in shape.faces:
-        face.normal = face.get_normal()
+    vertices = VectorArray(shape.vertices.array, numpy.float64)
+    if faces is None:
+        vertices = vertices.normalized(length)
+    else:
+        moved = numpy.unique(FaceBatch(shape, faces).corners)
+        vertices.array[moved] = vertices[moved].normalized(length).array
+    # assigning new vertices makes the shape recalculate its face normals
+    shape.vertices = vertices
     return shape
-
@@ -1,8 +1,13 @@
 
-from itertools import repeat
+from contextlib import contextmanager
+from itertools import chain
 
-from ..geom.vector import Vector
+import numpy
+
+from ..geom.vector import Vector, VectorArray
 from ..color import Color
+from ..util.arrays import reserve
+from ..util.event import Event
 
 
 
@@ -10,7 +15,7 @@ def add_vertex(vertices, new_vert):
     '''
     Modifies `vertices` in-place by appending the given `new_vert`.
     Returns the index number of the new vertex.
-    
+
     Loads of Shape-modifying algorithms seem to need this function. Can't make
     it a method because they often haven't constructed the shape instance yet.
     '''
@@ -18,6 +23,30 @@ def add_vertex(vertices, new_vert):
     return len(vertices) - 1
 
 
+class _Column(object):
+    '''
+    A numpy array of per-face (or per-index) values, which can be appended
+    to in amortized constant time. The rows in use are the `array` attribute.
+    '''
+    __slots__ = ['array', '_buffer']
+
+    def __init__(self, array):
+        self.array = self._buffer = array
+
+    def append(self, row):
+        used = len(self.array)
+        if used == len(self._buffer):
+            self._buffer = reserve(self._buffer, used, 1)
+        self.array = self._buffer[:used + 1]
+        self.array[used] = row
+
+    def extend(self, rows):
+        used = len(self.array)
+        self._buffer = reserve(self._buffer, used, len(rows))
+        self.array = self._buffer[:used + len(rows)]
+        self.array[used:] = rows
+
+
 class Face(object):
     '''
     A single flat face that forms part of a Shape. Attributes are the params
@@ -25,7 +54,12 @@ class Face(object):
 
         `normal`: A Vector, perpendicular to the face
 
-    .. function:: __init__(indices, color, shape)
+    Faces retrieved from a shape's `faces` are lightweight views onto that
+    shape's arrays, so assigning to their attributes modifies the shape.
+    Newly constructed faces hold their own attributes, until they are
+    stored in a shape's `faces`.
+
+    .. function:: __init__(indices, color, shape, category=0)
 
         `indices`: a list of int indices into the parent shape's vertex list
 
@@ -33,6 +67,8 @@ class Face(object):
 
         `shape`: a reference to the parent Shape
 
+        `category`: integer, used when selecting which faces to operate on
+
     .. function:: __getitem__(n)
 
         Return the nth index, as an integer.
@@ -45,21 +81,117 @@ class Face(object):
 
         Return the length of `indices`
     '''
+    __slots__ = [
+        'shape', 'index', '_indices', '_color', '_category', '_normal',
+    ]
+
     def __init__(self, indices, color, shape, category=0):
-        self.indices = indices
-        self.color = color
         self.shape = shape
-        self.category = category # used when selecting which faces to operate on
-        self.normal = self.get_normal()
+        self.index = None # position in shape.faces, if we are a view onto it
+        self._indices = list(indices)
+        self._color = color
+        self._category = category
+        self._normal = None
+
+    @staticmethod
+    def view(shape, index):
+        '''
+        Return a Face which reads and writes the attributes of the face at
+        position `index` in the arrays of `shape`.
+        '''
+        face = Face.__new__(Face)
+        face.shape = shape
+        face.index = index
+        return face
+
+    def _span(self):
+        shape = self.shape
+        return (
+            int(shape._starts.array[self.index]),
+            int(shape._sizes.array[self.index]),
+        )
 
     def __getitem__(self, index):
-        return self.indices[index % len(self.indices)]
+        if self.index is None:
+            return self._indices[index % len(self._indices)]
+        start, size = self._span()
+        return int(self.shape._indices.array[start + index % size])
 
     def __iter__(self):
         return self.indices.__iter__()
 
     def __len__(self):
-        return len(self.indices)
+        if self.index is None:
+            return len(self._indices)
+        return int(self.shape._sizes.array[self.index])
+
+
+    def _get_indices(self):
+        if self.index is None:
+            return self._indices
+        start, size = self._span()
+        return self.shape._indices.array[start:start + size].tolist()
+
+    def _set_indices(self, indices):
+        if self.index is None:
+            self._indices = list(indices)
+            self._normal = None
+        else:
+            self.shape._set_face(
+                self.index, indices, self.color, self.category)
+
+    indices = property(_get_indices, _set_indices, None,
+            'list of integer indices into the parent shape\'s vertices')
+
+
+    def _get_color(self):
+        if self.index is None:
+            return self._color
+        return Color._make(self.shape._colors.array[self.index].tolist())
+
+    def _set_color(self, color):
+        if self.index is None:
+            self._color = color
+        else:
+            self.shape._colors.array[self.index] = color
+
+    color = property(_get_color, _set_color, None, 'the Color of this face')
+
+
+    def _get_category(self):
+        if self.index is None:
+            return self._category
+        return int(self.shape._categories.array[self.index])
+
+    def _set_category(self, category):
+        if self.index is None:
+            self._category = category
+        else:
+            self.shape._categories.array[self.index] = category
+            self.shape._mark_categories(category)
+
+    category = property(_get_category, _set_category, None,
+            'integer used when selecting which faces to operate on')
+
+
+    def _get_normal(self):
+        if self.index is None:
+            if self._normal is None:
+                self._normal = self.get_normal()
+            return self._normal
+        self.shape._refresh(self.index)
+        return Vector._make(self.shape._normals.array[self.index].tolist())
+
+    def _set_normal(self, normal):
+        if self.index is None:
+            self._normal = normal
+        else:
+            self.shape._refresh(self.index)
+            self.shape._normals.array[self.index] = normal
+
+    normal = property(_get_normal, _set_normal, None,
+            'unit Vector perpendicular to this face')
+
 
     def get_normal(self):
         '''
@@ -68,9 +200,9 @@ class Face(object):
         Note that the direction of the normal will be reversed if the
         face's winding is reversed.
         '''
-        v0 = self.shape.vertices[self.indices[0]]
-        v1 = self.shape.vertices[self.indices[1]]
-        v2 = self.shape.vertices[self.indices[2]]
+        v0 = self.shape.vertices[self[0]]
+        v1 = self.shape.vertices[self[1]]
+        v2 = self.shape.vertices[self[2]]
         a = v0 - v1
         b = v2 - v1
         return b.cross(a).normalized()
@@ -80,9 +212,48 @@ class Face(object):
         '''
         Warning: Not an accurate centroid, just the mean vertex position
         '''
-        return sum(
-            [self.shape.vertices[i] for i in self], Vector.origin
-        ) / len(self.indices)
+        if self.index is None:
+            return sum(
+                [self.shape.vertices[i] for i in self], Vector.origin
+            ) / len(self)
+        self.shape._refresh(self.index)
+        return Vector._make(self.shape._centroids.array[self.index].tolist())
+
+
+class FaceList(object):
+    '''
+    The faces of a Shape. Supports `len`, iteration, indexing and assignment
+    by index, and `append`, like a list of Face instances. The faces returned
+    are views onto the shape's arrays.
+    '''
+    __slots__ = ['shape']
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    def __len__(self):
+        return len(self.shape._sizes.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('face index out of range')
+        return Face.view(self.shape, index)
+
+    def __setitem__(self, index, face):
+        if index < 0:
+            index += len(self)
+        self.shape._set_face(index, face.indices, face.color, face.category)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Face.view(self.shape, index)
+
+    def append(self, face):
+        self.shape._add_face(face.indices, face.color, face.category)
 
 
 class Shape(object):
@@ -98,54 +269,381 @@ class Shape(object):
         into the vertices list. The referenced vertices of a single
         face must form a coplanar ring defining the face's edges. Duplicate
         indices do not have to be given at the start and end of each face,
-        the closed loop is implied.
+        the closed loop is implied. For shapes whose faces all have the same
+        number of sides, `faces` may also be an N x sides array of indices.
 
         `colors`: a single Color which is applied to every face, or a sequence
-        of colors, one for each face.
+        of colors, one for each face. If `faces` is an array, this must be a
+        single Color or an N x 4 array.
 
         See the source for factory functions like
         :func:`~gloopy.shapes.cube.Cube` for examples of constructing Shapes.
-    '''    
-    def __init__(self, vertices, faces, colors):
 
-        # sanity checks
-        len_verts = len(vertices)
-        for face in faces:
-            assert len(face) >= 3
-            for index in face:
-                assert 0 <= index < len_verts
+    Rather than storing Python objects for every vertex and face, the shape
+    stores them in numpy arrays:
+
+    `vertices`: a :class:`~gloopy.geom.vector.VectorArray` of float32.
+
+    `face_indices`, `face_offsets`: the indices of every face, concatenated
+    into a single flat array. The indices of face `n` are
+    ``face_indices[face_offsets[n]:face_offsets[n + 1]]``.
+
+    `face_colors`, `face_categories`, `face_normals`, `face_centroids`: arrays
+    of per-face values. Normals and centroids are calculated for all faces
+    at once, when first requested, and then only recalculated for faces
+    which have changed since. After modifying vertices in-place, call
+    :meth:`vertices_changed` to have them all recalculated.
+
+    `faces` provides access to the same data as a list-like collection of
+    :class:`Face` instances, for use by shape modifiers.
 
-        # convert vertices from tuple to Vector if required
-        if len(vertices) > 0 and not isinstance(vertices[0], Vector):
-            vertices = [Vector(*v) for v in vertices]
+    `changed` is an :class:`~gloopy.util.event.Event`, fired with the shape
+    as its argument at the end of each :meth:`edit`. Shape modifiers make
+    their changes within an edit.
+    '''
+    def __init__(self, vertices, faces, colors):
 
-        # if color is a single color, then convert it to a sequence of
+        # if color is a single color, then convert it to an array of
         # identical colors, one for each face
         if isinstance(colors, Color):
-            colors = repeat(colors)
-
+            if not isinstance(faces, numpy.ndarray):
+                faces = list(faces)
+            color = colors
+            colors = numpy.empty((len(faces), 4), dtype=numpy.float32)
+            colors[:] = color
+        elif not isinstance(faces, numpy.ndarray):
+            pairs = list(zip(faces, colors))
+            faces = [face for face, _ in pairs]
+            colors = [color for _, color in pairs]
+
+        if isinstance(faces, numpy.ndarray):
+            # every face has the same number of sides
+            sizes = numpy.full(len(faces), faces.shape[1], dtype=numpy.int32)
+            indices = faces.astype(numpy.int32).ravel()
+        else:
+            sizes = numpy.fromiter(
+                (len(face) for face in faces),
+                dtype=numpy.int32, count=len(faces))
+            indices = numpy.fromiter(
+                chain.from_iterable(faces),
+                dtype=numpy.int32, count=sizes.sum())
+        starts = numpy.zeros(len(faces), dtype=numpy.int32)
+        numpy.cumsum(sizes[:-1], out=starts[1:])
+        self._init_arrays(vertices, indices, starts, sizes, colors)
+
+
+    @staticmethod
+    def from_arrays(
+        vertices, indices, offsets, colors, categories=None, normals=None
+    ):
+        '''
+        Return a new Shape built directly from arrays in the form of its
+        `vertices`, `face_indices`, `face_offsets` and `face_colors`, and
+        optionally `face_categories` and `face_normals`. If normals are
+        given, they are used rather than calculated.
+        '''
+        shape = Shape.__new__(Shape)
+        offsets = numpy.asarray(offsets, dtype=numpy.int32)
+        starts = offsets[:-1].copy()
+        sizes = numpy.diff(offsets).astype(numpy.int32)
+        shape._init_arrays(
+            vertices, numpy.asarray(indices, dtype=numpy.int32),
+            starts, sizes, colors)
+        if categories is not None:
+            shape._categories.array[:] = categories
+        if normals is not None:
+            shape._normals.array[:] = normals
+            shape._centroids.array[:] = get_centroids(
+                shape.vertices.array, shape._indices.array, starts, sizes)
+            shape._stale.array[:] = False
+            shape._vertices_changed = False
+        return shape
+
+
+    def _init_arrays(self, vertices, indices, starts, sizes, colors):
         self.vertices = vertices
-        self.faces = [
-            Face(face, color, self)
-            for face, color in zip(faces, colors)
-        ]
+        self._indices = _Column(indices)
+        self._starts = _Column(starts)
+        self._sizes = _Column(sizes)
+        self._colors = _Column(
+            numpy.array(colors, dtype=numpy.float32).reshape(-1, 4))
+        self._categories = _Column(numpy.zeros(len(sizes), dtype=numpy.int32))
+        # face normals and centroids, calculated lazily by self._refresh()
+        self._normals = _Column(numpy.empty((len(sizes), 3), numpy.float32))
+        self._centroids = _Column(numpy.empty((len(sizes), 3), numpy.float64))
+        # faces whose normals and centroids need recalculating
+        self._stale = _Column(numpy.ones(len(sizes), dtype=bool))
+        # number of entries in self._indices no longer used by any face
+        self._garbage = 0
+        self._validate()
+
+        self.faces = FaceList(self)
+        self.changed = Event()
+        # depth of nested edits, and during an edit, once next_category has
+        # been called, a mask of the categories in use
+        self._editing = 0
+        self._used_categories = None
 
     def __repr__(self):
         return '<Shape %d verts, %d faces>' % (
             len(self.vertices), len(self.faces),
         )
 
+
+    def _validate(self):
+        '''
+        Sanity checks. Every face must have at least three indices, all of
+        which refer to existing vertices.
+        '''
+        indices = self._indices.array
+        assert numpy.all(self._sizes.array >= 3)
+        assert numpy.all((0 <= indices) & (indices < len(self.vertices)))
+
+
+    @contextmanager
+    def edit(self):
+        '''
+        A context manager, within which any number of modifications can be
+        made to the shape, for example::
+
+            with shape.edit():
+                subdivide(shape)
+                stellate(shape, height=1)
+
+        Work which would otherwise follow every modification is done just
+        once, when the outermost edit ends: the face arrays are sanity
+        checked, the normals and centroids of all changed faces are
+        recalculated, and `changed` is fired. If the block raises an
+        exception, none of this is done.
+
+        During an edit, :meth:`next_category` doesn't reexamine every face.
+        It won't hand out categories which became unused during the edit,
+        and doesn't notice categories assigned directly to the
+        `face_categories` array.
+        '''
+        self._editing += 1
+        try:
+            yield self
+        finally:
+            self._editing -= 1
+            if not self._editing:
+                self._used_categories = None
+        if not self._editing:
+            self._validate()
+            self._refresh()
+            self.changed.fire(self)
+
+
+    def _get_vertices(self):
+        return self._vertices
+
+    def _set_vertices(self, vertices):
+        if isinstance(vertices, VectorArray):
+            vertices = vertices.array
+        self._vertices = VectorArray(
+            numpy.array(vertices, dtype=numpy.float32), numpy.float32)
+        self.vertices_changed()
+
+    vertices = property(_get_vertices, _set_vertices, None,
+            'VectorArray of all vertex positions')
+
+
+    @property
+    def face_indices(self):
+        self._compact()
+        return self._indices.array
+
+    @property
+    def face_offsets(self):
+        self._compact()
+        return numpy.append(self._starts.array, len(self._indices.array))
+
+    @property
+    def face_colors(self):
+        return self._colors.array
+
+    @property
+    def face_categories(self):
+        return self._categories.array
+
+    @property
+    def face_normals(self):
+        self._refresh()
+        return self._normals.array
+
+    @property
+    def face_centroids(self):
+        self._refresh()
+        return self._centroids.array
+
+
+    def vertices_changed(self):
+        '''
+        Mark every face's normal and centroid as needing recalculation.
+        Assigning to `vertices` does this automatically, but it must be
+        called after modifying vertex positions in-place. (Appending new
+        vertices doesn't affect any existing faces, so needs no call.)
+        '''
+        self._vertices_changed = True
+
+
+    def _refresh(self, index=None):
+        '''
+        Recalculate the normals and centroids of stale faces, in a single
+        batch. If `index` is given, just recalculate that face, or the faces
+        in that array of indices, unless the vertices have changed, in which
+        case every face is recalculated.
+        '''
+        stale = self._stale.array
+        if self._vertices_changed:
+            self._vertices_changed = False
+            faces = numpy.arange(len(stale))
+        elif isinstance(index, numpy.ndarray):
+            faces = index[stale[index]]
+        elif index is not None:
+            if stale[index]:
+                self._refresh_face(index)
+            return
+        else:
+            faces = numpy.flatnonzero(stale)
+        if len(faces) == 0:
+            return
+        vertices = self.vertices.array
+        indices = self._indices.array
+        starts = self._starts.array[faces]
+        sizes = self._sizes.array[faces]
+        self._normals.array[faces] = get_normals(vertices, indices, starts)
+        self._centroids.array[faces] = get_centroids(
+            vertices, indices, starts, sizes)
+        stale[faces] = False
+
+
+    def _refresh_face(self, index):
+        '''
+        Recalculate the normal and centroid of a single face. Cheaper than
+        the batch calculation in :meth:`_refresh`, when there's just one.
+        '''
+        vertices = self.vertices.array[Face.view(self, index).indices].tolist()
+        v0, v1, v2 = map(Vector._make, vertices[:3])
+        normal = (v2 - v1).cross(v0 - v1)
+        if normal.length:
+            normal = normal.normalized()
+        self._normals.array[index] = normal
+        self._centroids.array[index] = [
+            sum(components) / len(vertices) for components in zip(*vertices)
+        ]
+        self._stale.array[index] = False
+
+
+    def _add_face(self, indices, color, category):
+        self._starts.append(len(self._indices.array))
+        self._sizes.append(len(indices))
+        self._indices.extend(indices)
+        self._colors.append(color)
+        self._categories.append(category)
+        self._mark_categories(category)
+        self._normals.append(Vector.origin)
+        self._centroids.append(Vector.origin)
+        self._stale.append(True)
+
+
+    def _add_faces(self, indices, sizes, colors, categories):
+        '''
+        Append many faces at once. `indices` is the flat array of all their
+        indices, `sizes` the number of indices in each face, and `colors`
+        and `categories` are per-face arrays, or single values.
+        '''
+        count = len(sizes)
+        starts = numpy.zeros(count, dtype=numpy.int32)
+        numpy.cumsum(sizes[:-1], out=starts[1:])
+        self._starts.extend(starts + len(self._indices.array))
+        self._sizes.extend(sizes)
+        self._indices.extend(indices)
+        self._colors.extend(
+            numpy.broadcast_to(
+                numpy.asarray(colors, dtype=numpy.float32), (count, 4)))
+        self._categories.extend(numpy.broadcast_to(categories, (count,)))
+        self._mark_categories(categories)
+        self._normals.extend(numpy.zeros((count, 3)))
+        self._centroids.extend(numpy.zeros((count, 3)))
+        self._stale.extend(numpy.ones(count, dtype=bool))
+
+
+    def _set_face(self, index, indices, color, category):
+        size = len(indices)
+        if size == self._sizes.array[index]:
+            start = self._starts.array[index]
+            self._indices.array[start:start + size] = indices
+        else:
+            # put the new indices on the end, leaving a gap where the old
+            # ones were, which is removed by the next _compact()
+            self._garbage += int(self._sizes.array[index])
+            self._starts.array[index] = len(self._indices.array)
+            self._sizes.array[index] = size
+            self._indices.extend(indices)
+        self._colors.array[index] = color
+        self._categories.array[index] = category
+        self._mark_categories(category)
+        self._stale.array[index] = True
+        if self._garbage > len(self._indices.array) // 2:
+            self._compact()
+
+
+    def _set_faces(self, faces, indices, sizes, colors, categories):
+        '''
+        Replace many faces at once. `faces` is an array of distinct face
+        positions, and the other arguments are as for :meth:`_add_faces`.
+        '''
+        old_sizes = self._sizes.array[faces]
+        if numpy.array_equal(sizes, old_sizes):
+            positions = _gather(self._starts.array[faces], old_sizes)
+            self._indices.array[positions] = indices
+        else:
+            # as in _set_face, the new indices go on the end
+            self._garbage += int(old_sizes.sum())
+            starts = numpy.zeros(len(faces), dtype=numpy.int32)
+            numpy.cumsum(sizes[:-1], out=starts[1:])
+            self._starts.array[faces] = starts + len(self._indices.array)
+            self._sizes.array[faces] = sizes
+            self._indices.extend(indices)
+        self._colors.array[faces] = colors
+        self._categories.array[faces] = categories
+        self._mark_categories(categories)
+        self._stale.array[faces] = True
+        if self._garbage > len(self._indices.array) // 2:
+            self._compact()
+
+
+    def _compact(self):
+        '''
+        Remove any gaps from self._indices, so that every face's indices
+        follow directly after those of the face before it.
+        '''
+        if not self._garbage:
+            return
+        sizes = self._sizes.array
+        starts = numpy.zeros(len(sizes), dtype=numpy.int32)
+        numpy.cumsum(sizes[:-1], out=starts[1:])
+        gather = _gather(self._starts.array, sizes)
+        self._indices = _Column(self._indices.array[gather])
+        self._starts = _Column(starts)
+        self._garbage = 0
+
+
     def get_edges(self):
         '''
         Return a set of pairs, each pair represents indices that start and end
         an edge. Contents of each pair is sorted. e.g Tetrahedron:
         { (0, 1), (1, 2), (0, 2), (0, 3), (1, 3), (2, 3), }
         '''
-        edges = set()
-        for face in self.faces:
-            for i in range(len(face)):
-                edges.add( tuple(sorted((face[i], face[i+1]))) )
-        return edges
+        indices = self.face_indices
+        offsets = self.face_offsets
+        # position of the next index around each face
+        following = numpy.arange(1, len(indices) + 1)
+        following[offsets[1:] - 1] = offsets[:-1]
+        pairs = numpy.sort(
+            numpy.stack([indices, indices[following]], axis=1), axis=1)
+        return set(map(tuple, numpy.unique(pairs, axis=0).tolist()))
 
 
     def replace_face(self, index, new_faces):
@@ -165,9 +663,84 @@ class Shape(object):
         that isn't used by any faces, handy for assigning integers to
         new faces.
         '''
-        used_categories = {face.category for face in self.faces}
-        category = 0
-        while category in used_categories:
-            category += 1
-        return category
+        used = self._used_categories
+        if used is None:
+            categories = self._categories.array
+            # there are only len(categories) faces, so one of the integers up
+            # to and including that must be unused
+            used = numpy.zeros(len(categories) + 1, dtype=bool)
+            used[categories[
+                (categories >= 0) & (categories <= len(categories))]] = True
+            if self._editing:
+                self._used_categories = used
+        if used.all():
+            return len(used)
+        return int(numpy.argmin(used))
+
+
+    def _mark_categories(self, categories):
+        '''
+        During an edit, record that the given category, or array of
+        categories, is in use, for :meth:`next_category`.
+        '''
+        used = self._used_categories
+        if used is None:
+            return
+        categories = numpy.asarray(categories).ravel()
+        categories = categories[categories >= 0]
+        if not len(categories):
+            return
+        top = int(categories.max())
+        if top >= len(used):
+            used = numpy.append(used, numpy.zeros(top + 1 - len(used), bool))
+            self._used_categories = used
+        used[categories] = True
+
+
+def get_normals(vertices, indices, starts):
+    '''
+    Return an array of unit normals, one for each face, calculated from the
+    first three vertices of each face, as in :meth:`Face.get_normal`. Faces
+    with no area are given a zero normal.
 
+    `vertices` is an N x 3 array, `indices` a flat array of face indices,
+    and `starts` the position in `indices` at which each face starts.
+    '''
+    v0, v1, v2 = (
+        vertices[indices[starts + i]].astype(numpy.float64).T
+        for i in range(3)
+    )
+    ax, ay, az = v2 - v1
+    bx, by, bz = v0 - v1
+    normals = numpy.array([
+        ay * bz - az * by,
+        az * bx - ax * bz,
+        ax * by - ay * bx,
+    ])
+    lengths = numpy.sqrt((normals * normals).sum(axis=0))
+    # degenerate faces, with no area, are given a zero normal
+    numpy.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals.T.astype(numpy.float32)
+
+
+def get_centroids(vertices, indices, starts, sizes):
+    '''
+    Return an array of the mean vertex position of each face, as in
+    :attr:`Face.centroid`. Arguments are as for :func:`get_normals`, plus
+    `sizes`, the number of indices in each face.
+    '''
+    positions = vertices[indices[_gather(starts, sizes)]]
+    firsts = numpy.zeros(len(sizes), dtype=numpy.intp)
+    numpy.cumsum(sizes[:-1], out=firsts[1:])
+    totals = numpy.add.reduceat(positions, firsts, dtype=numpy.float64)
+    return totals / sizes[:, numpy.newaxis]
+
+
+def _gather(starts, sizes):
+    '''
+    Return the positions in a flat index array of every index of the faces
+    which start at `starts` and have lengths `sizes`, face after face.
+    '''
+    firsts = numpy.zeros(len(sizes), dtype=numpy.intp)
+    numpy.cumsum(sizes[:-1], out=firsts[1:])
+    return numpy.repeat(starts - firsts, sizes) + numpy.arange(sizes.sum())
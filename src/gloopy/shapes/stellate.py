@@ -1,5 +1,8 @@
 from __future__ import division
 
+import numpy
+
+from .batch import FaceBatch, edits
 from .shape import Face, add_vertex
 
 
@@ -24,6 +27,7 @@ def stellate_face(shape, face_index, height):
     shape.replace_face(face_index, new_faces)
 
 
+@edits
 def stellate(shape, faces=None, height=0):
     '''
     Modify the given shape in-place. By 'stellate' I mean add a new vertex in
@@ -37,9 +41,33 @@ def stellate(shape, faces=None, height=0):
 
     By default, all faces are opertated on, but this can be overidden by
     specifying 'faces' as an iterable of integer face indices.
+
+    All the faces are stellated at once, with array operations, giving the
+    same result as calling :func:`stellate_face` on each face in turn.
     '''
-    if faces is None:
-        faces = range(len(shape.faces))
-    for face in faces:
-        stellate_face(shape, face, height)
+    batch = FaceBatch(shape, faces)
+    if batch.repeated:
+        for face in batch.faces.tolist():
+            stellate_face(shape, face, height)
+        return
+    if not len(batch):
+        return
+
+    # new vertex at each face centroid offset out of the plane of the face
+    corners = batch.corners
+    centroids = batch.centroids
+    firsts = shape.vertices.array[corners[batch.firsts]]
+    radii = numpy.sqrt(((centroids - firsts) ** 2).sum(axis=1))
+    apexes = batch.add_vertices(
+        centroids + batch.normals * (radii * height)[:, numpy.newaxis])
+
+    # a new triangle for each edge of each face
+    batch.replace(
+        numpy.stack(
+            [corners, corners[batch.following], batch.per_corner(apexes)],
+            axis=1,
+        ),
+        batch.per_corner(batch.colors),
+        batch.per_corner(batch.categories),
+    )
 
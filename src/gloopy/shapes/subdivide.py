@@ -1,5 +1,8 @@
 from __future__ import division
 
+import numpy
+
+from .batch import FaceBatch, edits
 from .shape import Face, add_vertex
 from ..color import Color
 
@@ -53,6 +56,7 @@ def subdivide_face(shape, face_index, edges, color2, new_category):
     shape.replace_face(face_index, new_faces)
 
 
+@edits
 def subdivide(shape, faces=None, color=None):
     r'''
     Modify the given `shape` in-place. Subdivides each of its faces into
@@ -68,14 +72,46 @@ def subdivide(shape, faces=None, color=None):
 
     By default, all faces are operated on, but this can be overidden by
     specifying 'faces' as an iterable of integer face indices.
+
+    All the faces are subdivided at once, with array operations, giving the
+    same vertices and faces, in the same order, as calling
+    :func:`subdivide_face` on each face in turn would. Only if `faces` names
+    a face more than once are they subdivided one at a time.
     '''
-    if faces is None:
-        faces = range(len(shape.faces))
     if color is None:
         color = Color.Random()
-
-    edges = {}
+    batch = FaceBatch(shape, faces)
     new_category = shape.next_category()
-    for face in faces:
-        subdivide_face(shape, face, edges, color, new_category)
+    if batch.repeated:
+        edges = {}
+        for face in batch.faces.tolist():
+            subdivide_face(shape, face, edges, color, new_category)
+        return
+    if not len(batch):
+        return
 
+    # one midpoint per distinct edge, numbered in order of first use
+    corners = batch.corners
+    vertices = shape.vertices
+    low = numpy.minimum(corners, corners[batch.following]).astype(numpy.int64)
+    high = numpy.maximum(corners, corners[batch.following]).astype(numpy.int64)
+    _, first_use, edge_of_corner = numpy.unique(
+        low * len(vertices) + high, return_index=True, return_inverse=True)
+    order = numpy.argsort(first_use)
+    rank = numpy.empty_like(order)
+    rank[order] = numpy.arange(len(order))
+    ends = vertices.array.astype(numpy.float64)
+    added = batch.add_vertices(
+        (ends[low[first_use[order]]] + ends[high[first_use[order]]]) / 2)
+    midpoints = added[rank[edge_of_corner.ravel()]]
+
+    # new faces at each corner, and a center face made of the midpoints
+    batch.replace(
+        numpy.stack(
+            [corners, midpoints, midpoints[batch.preceding]], axis=1),
+        batch.per_corner(batch.colors),
+        new_category,
+        centers=midpoints,
+        center_colors=color,
+        center_categories=batch.categories,
+    )
@@ -0,0 +1,70 @@
+'''
+Assertions shared by the tests of operations which modify many faces of
+a shape at once, comparing them against applying the same operation to
+one face at a time.
+'''
+import numpy
+
+from ...color import Color
+from ..cube import Cube, TruncatedCube
+from ..dodecahedron import Dodecahedron
+from ..tetrahedron import Tetrahedron
+
+
+def every(count):
+    return range(count)
+
+
+def some(count):
+    return [face for face in reversed(range(count)) if face % 3 != 1]
+
+
+FACTORIES = [
+    lambda: Tetrahedron(1, Color.Red),
+    lambda: Cube(1, Color.Red),
+    lambda: Dodecahedron(1, Color.Red),
+    lambda: TruncatedCube(1, 0.5, Color.Red, Color.Blue),
+]
+
+SELECTIONS = [every, some]
+
+
+class ShapeAssertions(object):
+    '''
+    Mixin for TestCase. Vertex positions and face normals are compared
+    within `atol`, which defaults to an exact match.
+    '''
+    atol = 0
+
+    def assertSameShape(self, actual, expected):
+        self.assertTrue(numpy.allclose(
+            actual.vertices.array, expected.vertices.array,
+            rtol=0, atol=self.atol))
+        self.assertEqual(
+            actual.face_offsets.tolist(), expected.face_offsets.tolist())
+        self.assertEqual(
+            actual.face_indices.tolist(), expected.face_indices.tolist())
+        self.assertEqual(
+            actual.face_colors.tolist(), expected.face_colors.tolist())
+        self.assertEqual(
+            actual.face_categories.tolist(),
+            expected.face_categories.tolist())
+        self.assertTrue(numpy.allclose(
+            actual.face_normals, expected.face_normals,
+            rtol=0, atol=self.atol))
+
+    def assertSameAsEachFace(self, batched, each_face, arguments):
+        '''
+        For every shape in FACTORIES and every face selection in SELECTIONS,
+        apply `batched` and `each_face` once per item of `arguments`, and
+        check both produce the same shape.
+        '''
+        for factory in FACTORIES:
+            for select in SELECTIONS:
+                shape = factory()
+                expected = factory()
+                for argument in arguments:
+                    faces = select(len(shape.faces))
+                    batched(shape, faces, argument)
+                    each_face(expected, faces, argument)
+                self.assertSameShape(shape, expected)
@@ -0,0 +1,85 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ..batch import FaceBatch
+from ..cube import Cube
+from ..extrude import extrude, extrude_face
+from ..normalize import normalize
+from ..stellate import stellate, stellate_face
+from .shape_assertions import ShapeAssertions
+
+
+def extrude_each_face(shape, faces, offset):
+    new_category = shape.next_category()
+    for face in faces:
+        extrude_face(shape, face, offset, new_category)
+
+
+def stellate_each_face(shape, faces, height):
+    for face in faces:
+        stellate_face(shape, face, height)
+
+
+class TestFaceBatch(ShapeAssertions, TestCase):
+
+    atol = 1e-5
+
+    def testCorners(self):
+        shape = Cube(1, Color.Red)
+        batch = FaceBatch(shape, [2, 0])
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(
+            batch.corners.tolist(),
+            shape.faces[2].indices + shape.faces[0].indices)
+        self.assertEqual(batch.following.tolist(), [1, 2, 3, 0, 5, 6, 7, 4])
+        self.assertEqual(batch.preceding.tolist(), [3, 0, 1, 2, 7, 4, 5, 6])
+        self.assertFalse(batch.repeated)
+        self.assertTrue(FaceBatch(shape, [1, 3, 1]).repeated)
+
+    def testExtrude(self):
+        self.assertSameAsEachFace(extrude, extrude_each_face, [0.5, 0.5])
+
+    def testStellate(self):
+        self.assertSameAsEachFace(stellate, stellate_each_face, [1, 1])
+
+    def testStellateInwards(self):
+        self.assertSameAsEachFace(
+            stellate, stellate_each_face, [-0.33, -0.33])
+
+    def testRepeatedFaces(self):
+        shape = Cube(1, Color.Red)
+        expected = Cube(1, Color.Red)
+
+        stellate(shape, [0, 2, 0], 1)
+        stellate_each_face(expected, [0, 2, 0], 1)
+
+        self.assertSameShape(shape, expected)
+
+    def testNormalize(self):
+        shape = Cube(1, Color.Red)
+
+        normalize(shape, 2)
+
+        lengths = numpy.sqrt((shape.vertices.array ** 2).sum(axis=1))
+        self.assertTrue(numpy.allclose(lengths, 2))
+
+    def testNormalizeFaces(self):
+        shape = Cube(1, Color.Red)
+        original = shape.vertices.array.copy()
+        moved = sorted(set(shape.faces[0].indices))
+
+        normalize(shape, 2, faces=[0])
+
+        lengths = numpy.sqrt((shape.vertices.array ** 2).sum(axis=1))
+        self.assertTrue(numpy.allclose(lengths[moved], 2))
+        unmoved = [index for index in range(8) if index not in moved]
+        self.assertEqual(
+            shape.vertices.array[unmoved].tolist(),
+            original[unmoved].tolist())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import random
+from collections import Counter
+from itertools import product
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from .. import cube_groups
+from ..cube import Cube
+from ..cube_groups import CubeCluster, RgbCubeCluster
+
+
+def face_key(shape, index):
+    '''
+    Identify a face by its corners, its color and the direction it faces.
+    '''
+    indices = shape.face_indices[
+        shape.face_offsets[index]:shape.face_offsets[index + 1]]
+    corners = frozenset(
+        tuple(round(c, 4) for c in shape.vertices.array[i])
+        for i in indices
+    )
+    return (
+        corners,
+        tuple(shape.face_colors[index].round(4)),
+        tuple(shape.face_normals[index].round(4)),
+    )
+
+
+def visible_faces(locations, edge):
+    '''
+    Return the faces of a cluster of separate cubes, except for those which
+    coincide with a face of an abutting cube.
+    '''
+    faces = []
+    for location, color in locations.items():
+        cube = Cube(edge=edge, colors=color)
+        cube.vertices = cube.vertices + location
+        for index in range(len(cube.faces)):
+            corners, color, normal = face_key(cube, index)
+            faces.append((corners, color, normal))
+    touching = Counter(corners for corners, _, _ in faces)
+    return set(face for face in faces if touching[face[0]] == 1)
+
+
+class TestCubeCluster(TestCase):
+
+    def assertSurfaceUnchanged(self, locations, edge):
+        shape = CubeCluster(locations, edge=edge)
+        faces = [face_key(shape, i) for i in range(len(shape.faces))]
+        self.assertEqual(len(faces), len(set(faces)))
+        self.assertEqual(set(faces), visible_faces(locations, edge))
+        return shape
+
+    def testSingleCube(self):
+        shape = self.assertSurfaceUnchanged({(1, 2, 3): Color.Red}, 2)
+        self.assertEqual(len(shape.faces), 6)
+
+    def testAbuttingCubes(self):
+        shape = self.assertSurfaceUnchanged(
+            {(0, 0, 0): Color.Red, (2, 0, 0): Color.Blue}, 2)
+        self.assertEqual(len(shape.faces), 10)
+
+    def testSeparateCubes(self):
+        shape = self.assertSurfaceUnchanged(
+            {(0, 0, 0): Color.Red, (3, 0, 0): Color.Blue}, 2)
+        self.assertEqual(len(shape.faces), 12)
+
+    def testSolidBlock(self):
+        locations = dict(
+            (location, Color.Red) for location in product(range(3), repeat=3)
+        )
+        shape = self.assertSurfaceUnchanged(locations, 1)
+        self.assertEqual(len(shape.faces), 6 * 9)
+
+    def testBitmapLikeLayer(self):
+        # a plane of cubes at half-integer positions, like BitmapAsDict
+        locations = dict(
+            ((x * 10 + 5, y * 10, 0), Color(x / 4, y / 4, 0))
+            for x, y in product(range(-2, 3), range(-2, 3))
+            if (x, y) != (0, 0)
+        )
+        shape = self.assertSurfaceUnchanged(locations, 10)
+        self.assertEqual(len(shape.faces), 24 * 2 + 20 + 4)
+
+    def testEmpty(self):
+        self.assertEqual(len(CubeCluster({}).faces), 0)
+
+
+class TestChunkedGeneration(TestCase):
+
+    def setUp(self):
+        self.min_chunk = cube_groups.MIN_CHUNK
+        cube_groups.MIN_CHUNK = 4
+
+    def tearDown(self):
+        cube_groups.MIN_CHUNK = self.min_chunk
+
+    def testCubeCluster(self):
+        locations = dict(
+            (location, Color(*location))
+            for location in product(range(3), repeat=3)
+        )
+        expected = CubeCluster(locations)
+
+        shape = CubeCluster(locations, workers=3)
+
+        self.assertEqual(
+            shape.vertices.array.tolist(), expected.vertices.array.tolist())
+        self.assertEqual(
+            shape.face_indices.tolist(), expected.face_indices.tolist())
+        self.assertEqual(
+            shape.face_colors.tolist(), expected.face_colors.tolist())
+
+    def testRgbCubeClusterIsRepeatable(self):
+        random.seed(0)
+        first = RgbCubeCluster(1, 20, workers=2)
+        random.seed(0)
+        second = RgbCubeCluster(1, 20, workers=2)
+
+        self.assertEqual(
+            first.vertices.array.tolist(), second.vertices.array.tolist())
+        self.assertEqual(len(first.faces), 20 * 6)
+
+    def testSingleChunkDoesNotReseed(self):
+        cube_groups.MIN_CHUNK = 100
+        random.seed(0)
+        expected = RgbCubeCluster(1, 20)
+        expected_next = random.random()
+        random.seed(0)
+
+        shape = RgbCubeCluster(1, 20, workers=2)
+
+        self.assertEqual(
+            shape.vertices.array.tolist(), expected.vertices.array.tolist())
+        self.assertEqual(random.random(), expected_next)
+
+
+def unit_squares(shape, edge):
+    '''
+    Split each rectangular face of the given shape into squares of side
+    `edge`, returning a list of their keys, as for face_key.
+    '''
+    squares = []
+    for index in range(len(shape.faces)):
+        corners, color, normal = face_key(shape, index)
+        corners = numpy.array(sorted(corners))
+        low, high = corners.min(axis=0), corners.max(axis=0)
+        steps = [
+            numpy.arange(l, h, edge) if h > l else [l]
+            for l, h in zip(low, high)
+        ]
+        flat = numpy.flatnonzero(high == low)[0]
+        for start in product(*steps):
+            start = numpy.array(start)
+            square = [
+                start + offset
+                for offset in product(
+                    *[[0] if axis == flat else [0, edge] for axis in range(3)]
+                )
+            ]
+            squares.append((
+                frozenset(tuple(round(c, 4) for c in v) for v in square),
+                color,
+                normal,
+            ))
+    return squares
+
+
+class TestGreedyCubeCluster(TestCase):
+
+    def assertSurfaceUnchanged(self, locations, edge):
+        expected = CubeCluster(locations, edge=edge)
+        shape = CubeCluster(locations, edge=edge, greedy=True)
+        squares = unit_squares(shape, edge)
+        self.assertEqual(len(squares), len(expected.faces))
+        self.assertEqual(
+            set(squares),
+            set(face_key(expected, i) for i in range(len(expected.faces)))
+        )
+        return shape
+
+    def testSolidBlock(self):
+        locations = dict(
+            (location, Color.Red) for location in product(range(3), repeat=3)
+        )
+        shape = self.assertSurfaceUnchanged(locations, 1)
+        self.assertEqual(len(shape.faces), 6)
+
+    def testColorsAreNotMerged(self):
+        locations = {
+            (0, 0, 0): Color.Red,
+            (2, 0, 0): Color.Red,
+            (4, 0, 0): Color.Blue,
+        }
+        shape = self.assertSurfaceUnchanged(locations, 2)
+        self.assertEqual(len(shape.faces), 10)
+
+    def testBitmapLikeLayer(self):
+        locations = dict(
+            ((x * 10 + 5, y * 10, 0), Color((x + y) % 2, 0, 0))
+            for x, y in product(range(-3, 4), range(-2, 3))
+            if abs(x) + abs(y) < 4
+        )
+        self.assertSurfaceUnchanged(locations, 10)
+
+    def testRandomVolume(self):
+        random = numpy.random.RandomState(0)
+        locations = dict(
+            (tuple(location * 2.0), Color(*random.randint(2, size=3)))
+            for location in random.randint(5, size=(60, 3))
+        )
+        self.assertSurfaceUnchanged(locations, 2)
+
+    def testOffGrid(self):
+        locations = {(0, 0, 0): Color.Red, (1, 0, 0): Color.Red}
+        self.assertRaises(
+            ValueError, CubeCluster, locations, edge=2, greedy=True)
+
+    def testEmpty(self):
+        self.assertEqual(len(CubeCluster({}, greedy=True).faces), 0)
+
+
+if __name__ == '__main__':
+    main()
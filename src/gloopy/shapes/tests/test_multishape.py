@@ -0,0 +1,143 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ...geom.orientation import Orientation
+from ...geom.vector import Vector
+from ..cube import Cube
+from ..multishape import MultiShape
+from ..shape import Shape
+
+
+class TestMultiShape(TestCase):
+
+    def testFacesAreOffsetCopiesOfChildFaces(self):
+        multi = MultiShape()
+        first = Cube(1, Color.Red)
+        second = Cube(1, Color.Blue)
+        multi.add(first)
+        multi.add(second, position=Vector(2, 0, 0))
+
+        faces = multi.faces
+
+        self.assertEqual(len(faces), 12)
+        self.assertEqual(faces[0].indices, first.faces[0].indices)
+        self.assertEqual(
+            faces[6].indices,
+            [index + 8 for index in second.faces[0].indices]
+        )
+        self.assertEqual(faces[6].color, second.faces[0].color)
+        self.assertIs(faces[6].shape, multi)
+
+    def testCategoriesMatchCompiledShape(self):
+        multi = MultiShape()
+        cube = Cube(1, Color.Red)
+        cube.face_categories[:] = [0, 1, 1, 2, 0, 0]
+        multi.add(cube)
+        multi.add(Cube(1, Color.Blue), position=Vector(2, 0, 0))
+
+        expected = [0, 1, 1, 2, 0, 0] + [0] * 6
+        self.assertEqual(multi.face_categories.tolist(), expected)
+        self.assertEqual(
+            multi.face_categories.tolist(),
+            multi.compile().face_categories.tolist())
+        self.assertEqual(
+            [face.category for face in multi.faces], expected)
+        self.assertEqual(multi.next_category(), 3)
+
+    def testFlattenedDataIsReused(self):
+        multi = MultiShape()
+        multi.add(Cube(1, Color.Red))
+
+        self.assertIs(multi.faces, multi.faces)
+        self.assertIs(multi.children, multi.children)
+        self.assertIs(multi.vertices, multi.vertices)
+        self.assertIs(multi.face_normals, multi.face_normals)
+
+    def testAddInvalidates(self):
+        multi = MultiShape()
+        multi.add(Cube(1, Color.Red))
+        faces = multi.faces
+        version = multi.version
+
+        multi.add(Cube(1, Color.Red), position=Vector(2, 0, 0))
+
+        self.assertGreater(multi.version, version)
+        self.assertIsNot(multi.faces, faces)
+        self.assertEqual(len(multi.faces), 12)
+        self.assertEqual(len(multi.vertices), 16)
+
+    def testAddToNestedMultiShapeInvalidates(self):
+        inner = MultiShape()
+        inner.add(Cube(1, Color.Red))
+        outer = MultiShape()
+        outer.add(inner, position=Vector(0, 5, 0))
+        self.assertEqual(len(outer.children), 1)
+
+        inner.add(Cube(1, Color.Red), position=Vector(2, 0, 0))
+
+        children = outer.children
+        self.assertEqual(len(children), 2)
+        self.assertEqual(children[1][1] * Vector(0, 0, 0), Vector(2, 5, 0))
+        self.assertEqual(len(outer.face_colors), 12)
+
+    def testCompile(self):
+        inner = MultiShape()
+        cube = Cube(1, Color.Red)
+        cube.face_categories[:] = range(6)
+        inner.add(cube, position=Vector(1, 0, 0))
+        outer = MultiShape()
+        outer.add(inner, orientation=Orientation(Vector.x_axis))
+        outer.add(Cube(2, Color.Blue), position=Vector(0, 3, 0))
+
+        compiled = outer.compile()
+
+        self.assertEqual(
+            compiled.vertices.array.tolist(), outer.vertices.array.tolist())
+        self.assertEqual(
+            compiled.face_indices.tolist(), outer.face_indices.tolist())
+        self.assertEqual(
+            compiled.face_offsets.tolist(), outer.face_offsets.tolist())
+        self.assertEqual(compiled.face_categories.tolist()[:6], list(range(6)))
+        # rotated normals match those calculated from the moved vertices
+        recalculated = Shape.from_arrays(
+            compiled.vertices, compiled.face_indices, compiled.face_offsets,
+            compiled.face_colors)
+        self.assertTrue(numpy.allclose(
+            compiled.face_normals, recalculated.face_normals, atol=1e-6))
+
+    def testCompileRepeatedShape(self):
+        cube = Cube(1, Color.Red)
+        multi = MultiShape()
+        multi.add(cube, position=Vector(1, 2, 3))
+        multi.add(Cube(2, Color.Blue))
+        multi.add(cube, orientation=Orientation(Vector.y_axis))
+
+        compiled = multi.compile()
+
+        expected = [
+            list(transform * vertex)
+            for child, transform in multi.children
+            for vertex in child.vertices
+        ]
+        self.assertTrue(numpy.allclose(
+            compiled.vertices.array, expected, atol=1e-6))
+        self.assertEqual(
+            compiled.face_indices[-4:].tolist(),
+            [index + 16 for index in cube.face_indices[-4:].tolist()])
+        self.assertEqual(compiled.face_offsets[-1], 72)
+
+    def testCompiledShapeIsFrozen(self):
+        multi = MultiShape()
+        multi.add(Cube(1, Color.Red))
+        compiled = multi.compile()
+
+        multi.add(Cube(1, Color.Red), position=Vector(2, 0, 0))
+
+        self.assertEqual(len(compiled.faces), 6)
+        self.assertEqual(len(compiled.vertices), 8)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ...geom.vector import Vector, VectorArray
+from ..shape import Face, Shape
+from ..stellate import stellate
+from ..subdivide import subdivide
+from ..tetrahedron import Tetrahedron
+
+
+def _square():
+    return Shape(
+        vertices=[(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1)],
+        faces=[[0, 1, 2, 3], [0, 1, 4]],
+        colors=[Color.Red, Color.Blue],
+    )
+
+
+class TestShape(TestCase):
+
+    def testConstructor(self):
+        shape = _square()
+        self.assertTrue(isinstance(shape.vertices, VectorArray))
+        self.assertEqual(shape.vertices.array.dtype, numpy.float32)
+        self.assertEqual(shape.vertices[2], Vector(1, 1, 0))
+        self.assertEqual(shape.face_indices.tolist(), [0, 1, 2, 3, 0, 1, 4])
+        self.assertEqual(shape.face_offsets.tolist(), [0, 4, 7])
+        self.assertEqual(shape.face_categories.tolist(), [0, 0])
+        self.assertEqual(len(shape.faces), 2)
+
+    def testConstructorSingleColor(self):
+        shape = Tetrahedron(1, Color.Red)
+        self.assertEqual(
+            shape.face_colors.tolist(),
+            numpy.array([Color.Red] * 4, dtype=numpy.float32).tolist()
+        )
+
+    def testFromArrays(self):
+        original = _square()
+
+        shape = Shape.from_arrays(
+            original.vertices,
+            original.face_indices,
+            original.face_offsets,
+            original.face_colors,
+            categories=[3, 4],
+        )
+
+        self.assertEqual(shape.face_indices.tolist(), [0, 1, 2, 3, 0, 1, 4])
+        self.assertEqual(shape.face_offsets.tolist(), [0, 4, 7])
+        self.assertEqual(
+            shape.face_colors.tolist(), original.face_colors.tolist())
+        self.assertEqual(shape.face_categories.tolist(), [3, 4])
+        self.assertEqual(
+            shape.face_normals.tolist(), [[0, 0, 1], [0, -1, 0]])
+        self.assertEqual(shape.faces[1].indices, [0, 1, 4])
+
+    def testFromArraysUsesGivenNormals(self):
+        original = _square()
+        normals = [[1, 0, 0], [0, 1, 0]]
+
+        shape = Shape.from_arrays(
+            original.vertices,
+            original.face_indices,
+            original.face_offsets,
+            original.face_colors,
+            normals=normals,
+        )
+
+        self.assertEqual(shape.face_normals.tolist(), normals)
+        self.assertEqual(
+            shape.face_centroids.tolist(),
+            [[0.5, 0.5, 0], [1 / 3, 0, 1 / 3]]
+        )
+
+    def testFaceViews(self):
+        shape = _square()
+        face = shape.faces[0]
+        self.assertEqual(face.indices, [0, 1, 2, 3])
+        self.assertEqual(len(face), 4)
+        self.assertEqual(face[4], 0)
+        self.assertEqual(list(face), [0, 1, 2, 3])
+        self.assertEqual(face.normal, Vector(0, 0, 1))
+        self.assertEqual(face.centroid, Vector(0.5, 0.5, 0))
+        self.assertEqual(shape.faces[-1].indices, [0, 1, 4])
+        self.assertRaises(IndexError, lambda: shape.faces[2])
+
+    def testFaceViewsWriteToShape(self):
+        shape = _square()
+        shape.faces[1].color = Color.White
+        shape.faces[1].category = 3
+        self.assertEqual(shape.face_colors[1].tolist(), list(Color.White))
+        self.assertEqual(shape.face_categories.tolist(), [0, 3])
+
+    def testReplaceFace(self):
+        shape = _square()
+        shape.replace_face(0, [
+            Face([0, 1, 2], Color.Red, shape, 1),
+            Face([0, 2, 3], Color.Blue, shape, 2),
+        ])
+        self.assertEqual(
+            [face.indices for face in shape.faces],
+            [[0, 2, 3], [0, 1, 4], [0, 1, 2]]
+        )
+        self.assertEqual(shape.face_categories.tolist(), [2, 0, 1])
+        self.assertEqual(shape.faces[0].normal, Vector(0, 0, 1))
+        self.assertEqual(shape.face_offsets.tolist(), [0, 3, 6, 9])
+        self.assertEqual(
+            shape.face_indices.tolist(), [0, 2, 3, 0, 1, 4, 0, 1, 2])
+
+    def testNormalsAndCentroids(self):
+        shape = _square()
+        self.assertEqual(
+            shape.face_normals.tolist(), [[0, 0, 1], [0, -1, 0]])
+        self.assertEqual(
+            shape.face_centroids.tolist(),
+            [[0.5, 0.5, 0], [1 / 3, 0, 1 / 3]]
+        )
+
+    def testNormalsRecalculatedAfterVerticesChange(self):
+        shape = _square()
+        self.assertEqual(shape.faces[0].normal, Vector(0, 0, 1))
+        shape.vertices.array[:, 0] *= -1
+        shape.vertices.array[:, 2] += 1
+        shape.vertices_changed()
+        self.assertEqual(shape.faces[0].normal, Vector(0, 0, -1))
+        self.assertEqual(shape.faces[0].centroid, Vector(-0.5, 0.5, 1))
+        self.assertEqual(shape.face_normals[1].tolist(), [0, 1, 0])
+
+    def testNormalsRecalculatedAfterFaceChange(self):
+        shape = _square()
+        shape.face_normals
+        shape.faces[0].indices = [3, 2, 1, 0]
+        shape.faces.append(Face([4, 1, 0], Color.Red, shape))
+        self.assertEqual(
+            shape.face_normals.tolist(), [[0, 0, -1], [0, -1, 0], [0, 1, 0]])
+
+    def testGetEdges(self):
+        self.assertEqual(
+            Tetrahedron(1, Color.Red).get_edges(),
+            {(0, 1), (1, 2), (0, 2), (0, 3), (1, 3), (2, 3)}
+        )
+
+    def testNextCategory(self):
+        shape = _square()
+        self.assertEqual(shape.next_category(), 1)
+        shape.faces[0].category = 1
+        self.assertEqual(shape.next_category(), 2)
+        shape.faces[1].category = 2
+        self.assertEqual(shape.next_category(), 0)
+
+    def testEditFiresChangedOnce(self):
+        shape = Tetrahedron(1, Color.Red)
+        fired = []
+        shape.changed += fired.append
+
+        with shape.edit():
+            subdivide(shape, color=Color.Blue)
+            with shape.edit():
+                stellate(shape, height=1)
+            self.assertEqual(fired, [])
+
+        self.assertEqual(fired, [shape])
+
+    def testEditDefersNormals(self):
+        shape = Tetrahedron(1, Color.Red)
+        shape.face_normals
+
+        with shape.edit():
+            subdivide(shape, color=Color.Blue)
+            self.assertTrue(shape._stale.array.all())
+            # stellate recalculates only the normals of the faces it uses,
+            # which it then replaces
+            stellate(shape, faces=[0, 1], height=1)
+            self.assertTrue(shape._stale.array.all())
+
+        self.assertFalse(shape._stale.array.any())
+
+    def testEditMatchesSeparateModifiers(self):
+        expected = Tetrahedron(1, Color.Red)
+        shape = Tetrahedron(1, Color.Red)
+
+        for _ in range(3):
+            faces = numpy.flatnonzero(expected.face_categories == 0)
+            subdivide(expected, color=Color.Blue)
+            stellate(expected, faces=faces, height=1)
+        with shape.edit():
+            for _ in range(3):
+                faces = numpy.flatnonzero(shape.face_categories == 0)
+                subdivide(shape, color=Color.Blue)
+                stellate(shape, faces=faces, height=1)
+
+        self.assertEqual(
+            shape.face_indices.tolist(), expected.face_indices.tolist())
+        self.assertEqual(
+            shape.face_categories.tolist(),
+            expected.face_categories.tolist())
+        self.assertEqual(shape.next_category(), expected.next_category())
+        self.assertTrue(numpy.allclose(
+            shape.face_normals, expected.face_normals, atol=1e-6))
+
+    def testEditValidates(self):
+        shape = _square()
+        with self.assertRaises(AssertionError):
+            with shape.edit():
+                shape.faces[0].indices = [0, 1, 5]
+
+    def testEditWhichRaisesDoesNotFireChanged(self):
+        shape = _square()
+        fired = []
+        shape.changed += fired.append
+
+        with self.assertRaises(ValueError):
+            with shape.edit():
+                raise ValueError()
+
+        self.assertEqual(fired, [])
+        with shape.edit():
+            pass
+        self.assertEqual(fired, [shape])
+
+
+if __name__ == '__main__':
+    main()
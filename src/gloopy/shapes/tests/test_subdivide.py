@@ -0,0 +1,43 @@
+from unittest import TestCase, main
+
+from ...color import Color
+from ..cube import Cube
+from ..subdivide import subdivide, subdivide_face
+from .shape_assertions import ShapeAssertions
+
+
+def subdivide_each_face(shape, faces, color):
+    '''
+    Subdivide the given faces one at a time, as subdivide originally did.
+    '''
+    edges = {}
+    new_category = shape.next_category()
+    for face in faces:
+        subdivide_face(shape, face, edges, color, new_category)
+
+
+class TestSubdivide(ShapeAssertions, TestCase):
+
+    def testSameAsEachFace(self):
+        self.assertSameAsEachFace(
+            subdivide, subdivide_each_face,
+            [Color.Red, Color.Green, Color.Blue])
+
+    def testRepeatedFaces(self):
+        shape = Cube(1, Color.Red)
+        expected = Cube(1, Color.Red)
+
+        subdivide(shape, [0, 2, 0], Color.Blue)
+        subdivide_each_face(expected, [0, 2, 0], Color.Blue)
+
+        self.assertSameShape(shape, expected)
+
+    def testNoFaces(self):
+        shape = Cube(1, Color.Red)
+        subdivide(shape, [], Color.Blue)
+        self.assertEqual(len(shape.faces), 6)
+        self.assertEqual(len(shape.vertices), 8)
+
+
+if __name__ == '__main__':
+    main()
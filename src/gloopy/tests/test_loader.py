@@ -0,0 +1,184 @@
+import random
+from concurrent.futures import wait
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from unittest import TestCase, main
+
+import numpy
+
+from ..color import Color
+from ..geom.vector import Vector
+from ..loader import Loader
+from ..shapes.cube import Cube
+from ..shapes.cube_groups import CubeGlob
+from ..view.disk_cache import CachedShape, DiskCache
+from ..world import World
+
+
+def finish(loader):
+    '''
+    Wait for all the loader's builds to finish.
+    '''
+    wait([pending.future for pending in loader.pending])
+
+
+def fail():
+    raise ValueError('build failed')
+
+
+class TestLoader(TestCase):
+
+    def setUp(self):
+        self.world = World()
+        self.loader = Loader(self.world)
+
+    def tearDown(self):
+        self.loader.shutdown()
+
+    def testItemsAddedInRequestOrder(self):
+        shapes = [Cube(edge, Color.Red) for edge in (1, 2, 3)]
+        for index, shape in enumerate(shapes):
+            self.loader.add(lambda shape=shape: shape, position=(index, 0, 0))
+        finish(self.loader)
+
+        self.loader.update()
+
+        items = [item for item in self.world if item.shape in shapes]
+        self.assertEqual([item.shape for item in items], shapes)
+        self.assertEqual(
+            [item.position for item in items],
+            [Vector(0, 0, 0), Vector(1, 0, 0), Vector(2, 0, 0)])
+
+    def testWaitsForEarlierBuilds(self):
+        started = Event()
+        release = Event()
+
+        def slow():
+            started.set()
+            release.wait()
+            return Cube(1, Color.Red)
+
+        self.loader.add(slow)
+        self.loader.add(lambda: Cube(2, Color.Red))
+        started.wait()
+        self.loader.update()
+        self.assertEqual(self.loader.loading, 2)
+
+        release.set()
+        finish(self.loader)
+        self.loader.update()
+        self.assertEqual(self.loader.loading, 0)
+
+    def testPlaceholderIsReplaced(self):
+        placeholder = self.loader.add(lambda: Cube(1, Color.Red))
+        self.assertTrue(placeholder.placeholder)
+        self.assertEqual(list(self.world), [placeholder])
+        finish(self.loader)
+
+        self.loader.update()
+
+        self.assertNotIn(placeholder.id, self.world.items)
+        self.assertEqual(len(self.world.items), 1)
+
+    def testPlaceholderAlreadyRemoved(self):
+        placeholder = self.loader.add(lambda: Cube(1, Color.Red))
+        self.world.remove(placeholder)
+        finish(self.loader)
+
+        self.loader.update()
+
+        self.assertEqual(len(self.world.items), 1)
+
+    def testNoPlaceholder(self):
+        loader = Loader(self.world, placeholder=False)
+        self.assertIsNone(loader.add(lambda: Cube(1, Color.Red)))
+        self.assertEqual(len(self.world.items), 0)
+        finish(loader)
+        loader.update()
+        self.assertEqual(len(self.world.items), 1)
+        loader.shutdown()
+
+    def testFailedBuildIsLoggedAndSkipped(self):
+        self.loader.add(fail)
+        shape = Cube(1, Color.Red)
+        self.loader.add(lambda: shape)
+        finish(self.loader)
+
+        with self.assertLogs('gloopy.loader', 'ERROR'):
+            self.loader.update()
+
+        self.assertEqual([item.shape for item in self.world], [shape])
+        self.assertEqual(self.loader.loading, 0)
+
+    def testCallbackAndPrepare(self):
+        prepared = []
+        added = []
+        self.loader.prepare = prepared.append
+        shape = Cube(1, Color.Red)
+        self.loader.add(lambda: shape, callback=added.append)
+        self.assertEqual(self.loader.loading, 1)
+        finish(self.loader)
+
+        self.loader.update()
+
+        self.assertEqual(prepared, [shape])
+        self.assertEqual([item.shape for item in added], [shape])
+        self.assertEqual(self.loader.loading, 0)
+
+    def testRunCallsBackInOrder(self):
+        results = []
+        self.loader.add(lambda: Cube(1, Color.Red), callback=results.append)
+        self.loader.run(lambda: 'done', results.append)
+        self.assertEqual(self.loader.loading, 2)
+        finish(self.loader)
+
+        self.loader.update()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1], 'done')
+        self.assertEqual(len(self.world.items), 1)
+        self.assertEqual(self.loader.loading, 0)
+
+    def testShutdownCancelsBuildsNotStarted(self):
+        release = Event()
+        self.loader.add(release.wait)
+        self.loader.add(lambda: Cube(1, Color.Red))
+
+        self.loader.shutdown()
+        release.set()
+
+        self.assertTrue(self.loader.pending[1].future.cancelled())
+
+    def testCachedBuildIsUnaffectedByMainThread(self):
+        directories = [mkdtemp(), mkdtemp()]
+        for directory in directories:
+            self.addCleanup(rmtree, directory)
+        params = dict(size=1, radius=5, number=500, colors=Color.Red)
+        expected = DiskCache(directories[0]).arrays(CubeGlob, params, seed=3)
+        cache = DiskCache(directories[1])
+        self.loader.prepare = lambda shape: shape.glyph_arrays()
+
+        # draw random numbers on this thread while the shape is generated
+        self.loader.add(lambda: CachedShape(cache, CubeGlob, params, seed=3))
+        random.seed(1)
+        draws = 0
+        while True:
+            random.random()
+            draws += 1
+            if self.loader.pending[0].future.done():
+                break
+        after = random.random()
+
+        arrays = cache.arrays(CubeGlob, params, seed=3)
+        self.assertEqual(len(arrays), len(expected))
+        for array, expected_array in zip(arrays, expected):
+            self.assertTrue(numpy.array_equal(array, expected_array))
+        # this thread's numbers were neither drawn from nor rewound
+        random.seed(1)
+        for _ in range(draws):
+            random.random()
+        self.assertEqual(after, random.random())
+
+if __name__ == '__main__':
+    main()
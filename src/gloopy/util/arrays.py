@@ -0,0 +1,22 @@
+'''
+Helpers for numpy arrays which are grown in-place, one row at a time.
+'''
+import numpy
+
+
+def reserve(buffer, used, extra):
+    '''
+    Return `buffer` if it has room for `extra` more rows after its first `used`
+    rows. Otherwise return a new, larger buffer with those rows copied into it.
+    Capacity at least doubles whenever a new buffer is allocated, so that
+    appending one row at a time takes amortized constant time.
+    '''
+    needed = used + extra
+    if needed <= len(buffer):
+        return buffer
+    grown = numpy.empty(
+        (max(needed, 2 * len(buffer), 16),) + buffer.shape[1:],
+        dtype=buffer.dtype
+    )
+    grown[:used] = buffer[:used]
+    return grown
@@ -19,6 +19,8 @@ class Event(object):
 
     The .fire call will invoke `handler`, passing 1 and 2, and will also
     invoke all other subscribers to this event.
+
+    Unsubscribe by in-place-subtract (-= or __isub__) of the same callable.
     '''
     def __init__(self):
         self.listeners = []
@@ -27,10 +29,15 @@ class Event(object):
         self.listeners.append(listener)
         return self
 
+    def __isub__(self, listener):
+        self.listeners.remove(listener)
+        return self
+
     def fire(self, *args, **kwargs):
         '''
         call all subscribers to the event
         '''
-        for listener in self.listeners:
+        # a copy, since listeners may subscribe or unsubscribe
+        for listener in list(self.listeners):
             listener(*args, **kwargs)
 
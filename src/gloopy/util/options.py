@@ -19,15 +19,55 @@ class Options(object):
 
     `screen`: Integer to select from detected screens, as printed
     to stderr at start-up.
+
+    `vertex_format`: Name of the layout of glyph vertices in memory, one of
+    'compact' (the default), 'float', 'packed' or 'short'. 'compact'
+    chooses the smallest layout which can store each shape exactly: 'short'
+    (16 bytes per vertex) if its vertices lie on an integer grid, otherwise
+    'packed' (20 bytes). 'float' takes 40 bytes.
+
+    `batch`: Boolean, draw all items which have a single shape in one draw
+    call, reading their transforms from a buffer texture.
+
+    `cache`: Boolean, store the glyphs of expensive generated shapes on disk,
+    so subsequent runs start faster. Cached shapes are generated from a fixed
+    random seed, so are the same every time.
+
+    `stream`: Boolean, default True. Upload the glyphs of large shapes a
+    chunk at a time over successive frames, drawing what has been uploaded
+    so far, rather than all at once when they are added.
+
+    `convert_ms`: Float, default 4. Milliseconds per frame spent converting
+    the shapes of newly added items into glyphs. At least one shape is
+    converted each frame.
+
+    `workers`: Integer or None. If given, large generated shapes, and the
+    conversion of large shapes into glyphs, are split into chunks which are
+    run in a pool of this many processes.
     '''
     def __init__(self, argv):
         self.vsync = '--nosync' not in argv
         self.fullscreen = '--window' not in argv and '-w' not in argv
         self.fps = '--fps' in argv
+        self.cache = '--cache' in argv
+        self.batch = '--batch' in argv
+        self.stream = '--nostream' not in argv
+        if "--vertex-format" in argv:
+            self.vertex_format = argv[argv.index("--vertex-format") + 1]
+        else:
+            self.vertex_format = 'compact'
         if "--screen" in argv:
             self.screen = int(argv[argv.index("--screen") + 1])
         else:
             self.screen = 0
+        if "--convert-ms" in argv:
+            self.convert_ms = float(argv[argv.index("--convert-ms") + 1])
+        else:
+            self.convert_ms = 4.0
+        if "--workers" in argv:
+            self.workers = int(argv[argv.index("--workers") + 1])
+        else:
+            self.workers = None
 
     def __str__(self):
         return 'Options:\n' + '\n'.join(
@@ -0,0 +1,88 @@
+'''
+Helpers to split the generation of large shapes and glyphs into chunks, which
+are run in a pool of worker processes.
+
+Functions run in the pool, and their arguments and results, must be
+picklable, so are typically module-level functions taking and returning
+numpy arrays.
+
+How well this scales with the number of cores is unmeasured: so far
+benchmarks/bench_parallel.py has only been run on a single core, where it
+shows the pool's overhead and no speedup.
+'''
+from __future__ import division
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+
+# pools are slow to start, so one is kept for each number of workers used
+_pools = {}
+
+
+def get_pool(workers):
+    '''
+    Return a ProcessPoolExecutor of `workers` processes, created on first use
+    and shared with subsequent callers.
+
+    Workers are not forked from this process, which by then may be running
+    other threads, such as pyglet's, but started afresh.
+    '''
+    if workers not in _pools:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        else:
+            context = multiprocessing.get_context('spawn')
+        _pools[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context)
+    return _pools[workers]
+
+
+def chunk_slices(count, workers, minimum=1):
+    '''
+    Return a list of slices which divide `count` items into one chunk per
+    worker, or fewer chunks if that would make chunks smaller than `minimum`
+    items. Returns a single slice if `workers` is None.
+    '''
+    chunks = max(1, min(workers or 1, count // max(minimum, 1)))
+    bounds = numpy.linspace(0, count, chunks + 1).round().astype(int)
+    return [
+        slice(int(start), int(stop))
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def map_chunks(function, argument_lists, workers=None):
+    '''
+    Return a list of ``function(*arguments)`` for each tuple of arguments in
+    `argument_lists`, in order. If there is more than one tuple and
+    `workers` is greater than one, the calls are made in a pool of that many
+    worker processes. Otherwise they are made in this process.
+    '''
+    argument_lists = list(argument_lists)
+    if not workers or workers < 2 or len(argument_lists) < 2:
+        return [function(*arguments) for arguments in argument_lists]
+    return list(get_pool(workers).map(function, *zip(*argument_lists)))
+
+
+def merge_indexed(parts):
+    '''
+    Given a sequence of tuples (vertices, indices, ...), in which each
+    `indices` is an integer array of indices into that tuple's own
+    `vertices`, return a single tuple of the same form, with each element
+    concatenated, and each part's indices offset to refer to the right rows
+    of the merged vertices.
+    '''
+    parts = list(parts)
+    vertex_counts = [len(part[0]) for part in parts]
+    offsets = numpy.cumsum([0] + vertex_counts[:-1])
+    vertices = numpy.concatenate([part[0] for part in parts])
+    indices = numpy.concatenate([
+        part[1] + offset for part, offset in zip(parts, offsets)
+    ])
+    others = [
+        numpy.concatenate(column) for column in list(zip(*parts))[2:]
+    ]
+    return (vertices, indices.astype(parts[0][1].dtype)) + tuple(others)
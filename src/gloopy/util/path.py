@@ -14,11 +14,12 @@ http://us.pycon.org/2010/conference/schedule/event/38/
 | `DATA`: application data directory
 | `SOURCE`: root of application source code
 | `SHADERS`: location of application shader source code
+| `CACHE`: per-user directory for cached generated data
 '''
 
 import sys
 from sys import argv, exit, platform
-from os.path import abspath, dirname, join
+from os.path import abspath, dirname, expanduser, join
 
 # TODO: Maybe Context should be a mini class, with named fields. Or named tuple
 
@@ -58,4 +59,5 @@ else:
 SOURCE = join(ROOT, 'gloopy')
 DATA = join(SOURCE, 'data')
 SHADERS = join(DATA, 'shaders')
+CACHE = join(expanduser('~'), '.cache', 'gloopy')
 
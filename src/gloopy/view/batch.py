@@ -0,0 +1,201 @@
+'''
+Draws many game items in a single call to glDrawElements.
+
+The geometry of all the items is merged into one VBO, with each vertex
+tagged by the index of the item it belongs to. Every frame, the transform
+of every item is packed into one buffer, which the vertex shader reads via
+a buffer texture, so the modelview matrix does not change between items.
+'''
+from ctypes import c_void_p
+
+import numpy
+from OpenGL import GL
+
+from .glyph import Glyph, _upload
+from .shaders.lighting import batched_lighting
+from .shape_to_glyph import shape_to_arrays
+from .vertex_format import FLOAT
+
+
+def item_transforms(items):
+    '''
+    Return the model matrix of each of the given items, the `array` of its
+    :class:`~gloopy.geom.transform.Transform`, stacked into one N x 16
+    float32 array.
+    '''
+    return numpy.array(
+        [item.transform.array for item in items], dtype=numpy.float32
+    ).reshape(-1, 16)
+
+
+def merge_shapes(shapes, format=FLOAT):
+    '''
+    Return (vertices, indices, item_indices), the geometry of all the given
+    shapes merged into single arrays, in the form returned by
+    :func:`~gloopy.view.shape_to_glyph.shape_to_arrays`. `item_indices`
+    is a float32 array giving the position in `shapes` of the shape each
+    vertex came from. Shapes which occur more than once are only converted
+    once. Shapes which provide their own arrays, such as
+    :class:`~gloopy.view.disk_cache.CachedShape`, do so by a
+    `glyph_arrays(format, instanced=False)` method.
+    '''
+    converted = {}
+    vertices = []
+    indices = []
+    item_indices = []
+    vertex_count = 0
+    for item_index, shape in enumerate(shapes):
+        if id(shape) not in converted:
+            if hasattr(shape, 'glyph_arrays'):
+                converted[id(shape)] = shape.glyph_arrays(
+                    format, instanced=False)
+            else:
+                converted[id(shape)] = shape_to_arrays(shape, format)
+        shape_vertices, shape_indices = converted[id(shape)]
+        count = format.count(shape_vertices)
+        vertices.append(shape_vertices)
+        indices.append(shape_indices.astype(numpy.uint32) + vertex_count)
+        item_indices.append(numpy.full(count, item_index, numpy.float32))
+        vertex_count += count
+    if not vertices:
+        return (
+            format.asarray([]),
+            numpy.empty(0, numpy.uint32),
+            numpy.empty(0, numpy.float32),
+        )
+    return (
+        numpy.concatenate(vertices),
+        numpy.concatenate(indices),
+        numpy.concatenate(item_indices),
+    )
+
+
+class Batch(object):
+    '''
+    A collection of game items, each with a single shape, which are drawn
+    together in a single draw call.
+
+    .. function:: __init__(shader=batched_lighting, format=FLOAT)
+
+        `shader`: must read each item's transform from the buffer texture
+        bound to texture unit 0, using the per-vertex 'item' attribute, as
+        :data:`~gloopy.view.shaders.lighting.batched_lighting` does.
+
+        `format`: the :class:`~gloopy.view.vertex_format.VertexFormat` of
+        the merged vertices.
+
+    The merged geometry is rebuilt when items are added, removed or changed.
+    Item transforms are uploaded every frame.
+    '''
+    def __init__(self, shader=batched_lighting, format=FLOAT):
+        self.shader = shader
+        self.format = format
+        self.items = {}
+        self.glyph = None
+        self.item_vbo = None
+        self.transform_buffer = None
+        self.transform_texture = None
+        self._dirty = False
+
+
+    def __len__(self):
+        return len(self.items)
+
+
+    def add(self, item):
+        self.items[item.id] = item
+        self._dirty = True
+
+
+    def remove(self, item):
+        del self.items[item.id]
+        self._dirty = True
+
+
+    def changed(self, item):
+        self._dirty = True
+
+
+    def _delete_geometry(self):
+        if self.glyph is not None:
+            self.glyph.delete()
+            GL.glDeleteBuffers(1, [self.item_vbo])
+            self.glyph = self.item_vbo = None
+
+
+    def _build(self):
+        '''
+        Merge the geometry of all items into a new Glyph, and add the
+        per-vertex item index attribute to its VAO.
+        '''
+        self._delete_geometry()
+        self._dirty = False
+        if not self.items:
+            return
+        vertices, indices, item_indices = merge_shapes(
+            [item.shape for item in self.items.values()], self.format)
+        self.glyph = Glyph(vertices, indices, self.shader, self.format)
+        GL.glBindVertexArray(self.glyph.vao)
+        try:
+            self.item_vbo = _upload(GL.GL_ARRAY_BUFFER, item_indices)
+            location = self.shader.attrib['item']
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribPointer(
+                location, 1, GL.GL_FLOAT, False, 0, c_void_p(0))
+        finally:
+            GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+
+    def _upload_transforms(self):
+        if self.transform_buffer is None:
+            self.transform_buffer = GL.glGenBuffers(1)
+            self.transform_texture = GL.glGenTextures(1)
+            GL.glBindTexture(GL.GL_TEXTURE_BUFFER, self.transform_texture)
+            GL.glTexBuffer(
+                GL.GL_TEXTURE_BUFFER, GL.GL_RGBA32F, self.transform_buffer)
+        transforms = item_transforms(self.items.values())
+        GL.glBindBuffer(GL.GL_TEXTURE_BUFFER, self.transform_buffer)
+        # orphan the previous frame's data rather than waiting for it
+        GL.glBufferData(
+            GL.GL_TEXTURE_BUFFER, transforms.nbytes, transforms,
+            GL.GL_STREAM_DRAW
+        )
+        GL.glBindBuffer(GL.GL_TEXTURE_BUFFER, 0)
+
+
+    def draw(self, projection, view):
+        '''
+        Draw all items, using the given projection and view matrices.
+        '''
+        if self._dirty:
+            self._build()
+        if self.glyph is None:
+            return
+        self._upload_transforms()
+        self.shader.use()
+        self.shader.set_matrix('projection', projection)
+        self.shader.set_matrix('view', view)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, self.transform_texture)
+        GL.glBindVertexArray(self.glyph.vao)
+        GL.glDrawElements(
+            GL.GL_TRIANGLES,
+            self.glyph.index_count,
+            self.glyph.index_type,
+            None
+        )
+        GL.glBindVertexArray(0)
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, 0)
+
+
+    def delete(self):
+        '''
+        Release all OpenGL resources used by this Batch.
+        '''
+        self._delete_geometry()
+        if self.transform_buffer is not None:
+            GL.glDeleteTextures(1, [self.transform_texture])
+            GL.glDeleteBuffers(1, [self.transform_buffer])
+            self.transform_buffer = self.transform_texture = None
+
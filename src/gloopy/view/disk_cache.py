@@ -0,0 +1,258 @@
+'''
+An optional on-disk cache of the vertex and index buffers produced by
+:func:`~gloopy.view.shape_to_glyph.shape_to_arrays`, or the vertex, index
+and instance buffers produced by
+:func:`~gloopy.view.shape_to_glyph.shape_to_instanced_arrays`, so that
+expensive procedural shapes need not be regenerated on every run.
+
+Each entry is a pair of .npy files, plus a third for instances, which are
+memory-mapped when read, so that a cached glyph goes straight from disk to a
+VBO upload.
+'''
+import os
+from hashlib import sha1
+from random import Random
+from os.path import getsize, isdir, join
+
+import numpy
+
+from .shape_to_glyph import shape_to_arrays, shape_to_instanced_arrays
+from .vertex_format import FLOAT
+from ..util.event import Event
+
+
+# change this to invalidate existing entries when the buffer layout changes
+FORMAT = 2
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def generate(generator, params, seed):
+    '''
+    Return the shape created by calling `generator(rng=rng, **params)`,
+    where `rng` is a new random.Random seeded by `seed`, from which the
+    generator must draw all its random numbers.
+
+    The global random number generator is not used, so shapes may be
+    generated on a background thread, while other threads use it, and still
+    come out the same for the same seed.
+    '''
+    return generator(rng=Random(seed), **params)
+
+
+class DiskCache(object):
+    '''
+    A size-bounded directory of glyph vertex, index and instance buffers,
+    keyed by the name of the shape generator, its parameters, and the random
+    seed used.
+    Generators are called as described for :func:`generate`.
+
+    .. function:: __init__(directory, max_bytes=DEFAULT_MAX_BYTES)
+
+        `directory`: created if it does not exist.
+
+        `max_bytes`: when the cache grows larger than this, the least
+        recently used entries are deleted.
+    '''
+    VERTICES = '.vertices.npy'
+    INDICES = '.indices.npy'
+    INSTANCES = '.instances.npy'
+    SUFFIXES = (VERTICES, INDICES, INSTANCES)
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        if not isdir(directory):
+            os.makedirs(directory)
+
+
+    @staticmethod
+    def key(name, params, seed):
+        '''
+        Return a filename-safe key for the given generator name, parameters
+        (a dict) and seed. Parameters are identified by their repr.
+        '''
+        text = repr((FORMAT, name, sorted(params.items()), seed))
+        return sha1(text.encode('utf-8')).hexdigest()
+
+
+    def _paths(self, key):
+        return tuple(
+            join(self.directory, key + suffix) for suffix in self.SUFFIXES)
+
+
+    def load(self, key):
+        '''
+        Return the (vertices, indices), or (vertices, indices, instances),
+        stored under `key`, as read-only memory-mapped arrays, or None if
+        there is no such entry.
+        '''
+        paths = self._paths(key)
+        if not os.path.exists(paths[2]):
+            paths = paths[:2]
+        try:
+            arrays = tuple(numpy.load(path, mmap_mode='r') for path in paths)
+        except (IOError, ValueError):
+            return None
+        # mark the entry as recently used
+        for path in paths:
+            os.utime(path, None)
+        return arrays
+
+
+    def save(self, key, vertices, indices, instances=None):
+        '''
+        Store the given vertex and index arrays, and instance array if
+        given, under `key`, then evict the least recently used entries if
+        the cache has grown too large.
+        '''
+        paths = self._paths(key)
+        arrays = [(paths[0], vertices), (paths[1], indices)]
+        if instances is not None:
+            # written first, so that readers never see the entry without it
+            arrays.insert(0, (paths[2], instances))
+        for path, array in arrays:
+            # write to a temporary file first, so that readers never see a
+            # partially written entry
+            temp = '%s.%d.tmp' % (path, os.getpid())
+            with open(temp, 'wb') as stream:
+                numpy.save(stream, array)
+            os.replace(temp, path)
+        self.evict()
+
+
+    def evict(self):
+        '''
+        Delete least recently used entries until the total size of the cache
+        is no more than self.max_bytes.
+        '''
+        entries = {}
+        for filename in os.listdir(self.directory):
+            for suffix in self.SUFFIXES:
+                if filename.endswith(suffix):
+                    key = filename[:-len(suffix)]
+                    break
+            else:
+                continue
+            path = join(self.directory, filename)
+            size, used = entries.get(key, (0, 0))
+            stat = os.stat(path)
+            entries[key] = (size + stat.st_size, max(used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        by_age = sorted(entries.items(), key=lambda item: item[1][1])
+        for key, (size, _) in by_age:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+
+
+    def size(self):
+        '''
+        Return the total size in bytes of all entries in the cache.
+        '''
+        return sum(
+            getsize(join(self.directory, filename))
+            for filename in os.listdir(self.directory)
+            if filename.endswith(self.SUFFIXES)
+        )
+
+
+    def arrays(
+        self, generator, params=None, seed=0, format=FLOAT, instanced=True
+    ):
+        '''
+        Return the (vertices, indices) of the shape generated by
+        :func:`generate` from `generator`, `params` and `seed`, in the given
+        vertex format, loading them from the cache if present, otherwise
+        generating the shape and storing its arrays.
+
+        If `instanced` is True, and the shape is a MultiShape of one
+        repeated shape, (vertices, indices, instances) are returned instead,
+        as by :func:`~gloopy.view.shape_to_glyph.shape_to_instanced_arrays`.
+        '''
+        params = params or {}
+        name = '%s:%s:%s' % (
+            _name(generator),
+            format.name if format else 'auto',
+            'instanced' if instanced else 'flat',
+        )
+        key = self.key(name, params, seed)
+        arrays = self.load(key)
+        if arrays is None:
+            shape = generate(generator, params, seed)
+            arrays = _glyph_arrays(shape, format, instanced)
+            self.save(key, *arrays)
+        return arrays
+
+
+def _name(generator):
+    return '%s.%s' % (generator.__module__, generator.__name__)
+
+
+def _glyph_arrays(shape, format, instanced):
+    if instanced:
+        arrays = shape_to_instanced_arrays(shape, format)
+        if arrays is not None:
+            return arrays
+    return shape_to_arrays(shape, format)
+
+
+class CachedShape(object):
+    '''
+    Stands in for the shape generated by :func:`generate` from `generator`,
+    `params` and `seed`, whose glyph buffers are read from `cache` where
+    possible.
+
+    `shape` is the real shape, which is None until :meth:`build` is called.
+    Generating it is the expensive work the cache exists to avoid, so it is
+    never done implicitly: code which needs the real shape, for instance to
+    modify it, must call :meth:`build`, typically on a background thread
+    such as a :class:`~gloopy.loader.Loader`'s, and wait until it returns.
+    From then on, the glyph is converted from the real shape, since it might
+    have been modified.
+
+    `changed` is fired whenever the real shape's `changed` event is.
+    '''
+    def __init__(self, cache, generator, params=None, seed=0):
+        self.cache = cache
+        self.generator = generator
+        self.params = params or {}
+        self.seed = seed
+        self.shape = None
+        self.changed = Event()
+
+
+    def build(self):
+        '''
+        Generate the real shape, if that has not been done yet, and return
+        it.
+        '''
+        if self.shape is None:
+            shape = generate(self.generator, self.params, self.seed)
+            # MultiShapes have no changed event
+            changed = getattr(shape, 'changed', None)
+            if changed is not None:
+                changed += lambda shape: self.changed.fire(self)
+            # only now visible to other threads, complete
+            self.shape = shape
+        return self.shape
+
+
+    def glyph_arrays(self, format=FLOAT, instanced=True):
+        '''
+        Return the (vertices, indices) of this shape's glyph, as produced by
+        :func:`~gloopy.view.shape_to_glyph.shape_to_arrays`, or if
+        `instanced` is True and the shape is a MultiShape of one repeated
+        shape, the (vertices, indices, instances) of its instanced glyph, as
+        produced by
+        :func:`~gloopy.view.shape_to_glyph.shape_to_instanced_arrays`.
+        '''
+        if self.shape is None:
+            return self.cache.arrays(
+                self.generator, self.params, self.seed, format, instanced)
+        return _glyph_arrays(self.shape, format, instanced)
+
@@ -1,18 +1,24 @@
 from ctypes import c_void_p, sizeof
 
+import numpy
 from OpenGL import GL
-from OpenGL.arrays import vbo
 
-from ..color import Color
-from ..geom.vector import Vector
+from .vertex_format import format_of
 
 
+# in the FLOAT vertex format
+FLOATS_PER_VERTEX = 10 # (x, y, z,  r, g, b, a,  nx, ny, nz)
+
 type_to_enum = {
     GL.GLubyte: GL.GL_UNSIGNED_BYTE,
     GL.GLushort: GL.GL_UNSIGNED_SHORT,
     GL.GLuint: GL.GL_UNSIGNED_INT,
 }
 
+GL_INDEX_TYPES = dict(
+    (numpy.dtype(gltype), enum) for gltype, enum in type_to_enum.items()
+)
+
 
 def get_index_type(num_verts):
     '''
@@ -29,29 +35,70 @@ def get_index_type(num_verts):
 
 def glarray(gltype, seq):
     '''
-    Puts the given sequence into a ctypes array of gltypes.
-    [ 1, 2, 3, 4, 5, 6 ] -> (GLfloat*6)(1, 2, 3, 4, 5, 6)
+    Puts the given sequence into a contiguous numpy array of gltypes.
+    Numpy arrays, memoryviews, array.arrays or any other object supporting the
+    buffer protocol are wrapped without copying, provided they are already
+    contiguous and of the right type.
+    [ 1, 2, 3, 4, 5, 6 ] -> array([1, 2, 3, 4, 5, 6], dtype=float32)
     '''
-    # construct and populate [:] is faster than construct with *seq
-    carray = (gltype * len(seq))()
-    carray[:] = seq
-    return carray
+    return numpy.ascontiguousarray(seq, dtype=numpy.dtype(gltype))
+
+
+def glindexarray(num_verts, seq):
+    '''
+    Puts the given sequence of indices into a contiguous numpy array of the
+    smallest unsigned type that can index `num_verts` vertices. If `seq` is
+    already an array of one of the unsigned GL index types, it is used as it
+    is, without copying.
+    '''
+    array = numpy.asarray(seq)
+    for gltype in type_to_enum:
+        if array.dtype == numpy.dtype(gltype):
+            return glarray(gltype, array)
+    return glarray(get_index_type(num_verts), array)
+
+
+def _upload(target, array):
+    '''
+    Create a new OpenGL buffer object, bound to `target`, and copy the given
+    array into it. Returns the buffer's name.
+    '''
+    buffer = GL.glGenBuffers(1)
+    GL.glBindBuffer(target, buffer)
+    GL.glBufferData(target, array.nbytes, array, GL.GL_STATIC_DRAW)
+    return buffer
+
+
+def _allocate(target, nbytes):
+    '''
+    Create a new OpenGL buffer object, bound to `target`, with room for
+    `nbytes` bytes, whose contents are undefined. Returns the buffer's name.
+    '''
+    buffer = GL.glGenBuffers(1)
+    GL.glBindBuffer(target, buffer)
+    GL.glBufferData(target, nbytes, None, GL.GL_STATIC_DRAW)
+    return buffer
 
 
 class Glyph(object):
     '''
-    Converts lists of vertices and indices into OpenGL vertex arrays stored
-    in a VBO. Creates a VAO that can be used to bind them for rendering.
+    Converts arrays of vertices and indices into OpenGL buffer objects.
+    Creates a VAO that binds them both, ready for rendering.
 
-    .. function:: __init__(vertices, indices)
+    .. function:: __init__(vertices, indices, shader, format=None, \
+        instances=None)
 
-        :param vertices: each tuple contains attributes of one vertex
-        :type vertices: list of tuples of numbers
+        :param vertices: attributes of every vertex
+        :type vertices: sequence, array or buffer
         :param indices: order in which vertices should be drawn
-        :type indices: list of integers
+        :type indices: sequence or buffer of unsigned integers
+        :param format: layout of `vertices`
+        :type format: :class:`~gloopy.view.vertex_format.VertexFormat`
 
-        The `vertex` list should be structured as follows (only the first
-        vertex is shown)::
+        If `format` is not given, it is deduced from the dtype of
+        `vertices`, as returned by VertexFormat.pack(), or else defaults to
+        FLOAT. In that format, the `vertex` list should be structured as
+        follows (only the first vertex is shown)::
 
             vertices=[
                 pos.x, pos.y, pos.z,
@@ -59,41 +106,176 @@ class Glyph(object):
                 normal.x, normal.y, normal.z,
                 ...
             ]
+
+        Arrays which are already contiguous and of the right type are passed
+        to OpenGL without being copied. Once uploaded, neither array is
+        retained by the Glyph.
+
+        :param instances: if given, the glyph is drawn once per instance,
+            transformed by that instance's matrix.
+        :type instances: N x 16 array of float32, each row a 4x4 matrix in
+            OpenGL's column-major order
+
+        The shader of an instanced glyph must have an 'instance' mat4
+        attribute, such as
+        :data:`~gloopy.view.shaders.lighting.instanced_lighting`.
+
+    Draw a glyph by binding its `vao`, then calling glDrawElements with
+    `index_count` and `index_type`, and an offset of zero into the bound
+    index buffer. If `instance_count` is not None, use
+    glDrawElementsInstanced to draw that many instances.
     '''
-    def __init__(self, vertices, indices, shader):
-        FLOATS_PER_VERTEX = 10 # (x, y, z,  r, g, b, a,  nx, ny, nz)
-
-        self.vbo = vbo.VBO(
-            glarray(GL.GLfloat, vertices),
-            usage='GL_STATIC_DRAW'
-        )
-        index_type = get_index_type(len(vertices) / FLOATS_PER_VERTEX)
-        self.glindices = glarray(index_type, indices)
-        self.index_type = type_to_enum[index_type]
+    instance_count = None
+    instance_vbo = None
+
+    def __init__(
+        self, vertices, indices, shader, format=None, instances=None
+    ):
+        if format is None:
+            format = format_of(vertices)
+        vertices = format.asarray(vertices)
+        indices = glindexarray(format.count(vertices), indices)
+        self.format = format
+        self.index_count = len(indices)
+        self.index_type = GL_INDEX_TYPES[indices.dtype]
         self.shader = shader
 
         self.vao = GL.glGenVertexArrays(1)
         GL.glBindVertexArray(self.vao)
         try:
-            self.vbo.bind()
+            self.vbo = _upload(GL.GL_ARRAY_BUFFER, vertices)
+            # binding the index buffer while the VAO is bound records it in
+            # the VAO, so it is bound along with it when drawing.
+            self.ibo = _upload(GL.GL_ELEMENT_ARRAY_BUFFER, indices)
+            format.set_pointers(self.shader)
+            if instances is not None:
+                self._set_instances(instances)
+        finally:
+            GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
 
-            GL.glEnableVertexAttribArray(self.shader.attrib['position'])
-            GL.glEnableVertexAttribArray(self.shader.attrib['color'])
-            GL.glEnableVertexAttribArray(self.shader.attrib['normal'])
 
-            STRIDE = FLOATS_PER_VERTEX * sizeof(GL.GLfloat)
-            GL.glVertexAttribPointer( 
-                self.shader.attrib['position'], len(Vector._fields), GL.GL_FLOAT,
-                False, STRIDE, c_void_p(0)
-            )
-            GL.glVertexAttribPointer( 
-                self.shader.attrib['color'], len(Color._fields), GL.GL_FLOAT,
-                False, STRIDE, c_void_p(12)
-            )
-            GL.glVertexAttribPointer( 
-                self.shader.attrib['normal'], len(Vector._fields), GL.GL_FLOAT,
-                False, STRIDE, c_void_p(28)
+    def _set_instances(self, instances):
+        '''
+        Upload the per-instance matrices, and point the four columns of the
+        shader's 'instance' attribute at them, advancing once per instance.
+        '''
+        instances = glarray(GL.GLfloat, instances).reshape(-1, 16)
+        self.instance_count = len(instances)
+        self.instance_vbo = _upload(GL.GL_ARRAY_BUFFER, instances)
+        location = self.shader.attrib['instance']
+        column_bytes = 4 * sizeof(GL.GLfloat)
+        for column in range(4):
+            GL.glEnableVertexAttribArray(location + column)
+            GL.glVertexAttribPointer(
+                location + column, 4, GL.GL_FLOAT, False,
+                4 * column_bytes, c_void_p(column * column_bytes)
             )
+            GL.glVertexAttribDivisor(location + column, 1)
+
+
+    def delete(self):
+        '''
+        Release the OpenGL buffers and vertex array used by this Glyph.
+        It cannot be drawn afterwards.
+        '''
+        GL.glDeleteVertexArrays(1, [self.vao])
+        buffers = [self.vbo, self.ibo]
+        if self.instance_vbo is not None:
+            buffers.append(self.instance_vbo)
+        GL.glDeleteBuffers(len(buffers), buffers)
+        self.vao = self.vbo = self.ibo = self.instance_vbo = None
+
+
+
+class StreamingGlyph(Glyph):
+    '''
+    A Glyph whose buffers are allocated at their full size when it is
+    created, but are filled one chunk at a time, by calls to
+    :meth:`upload_next`, so that a large shape can be uploaded over many
+    frames. Until then, it draws only the indices uploaded so far, as
+    `index_count`.
+
+    .. function:: __init__(chunks, vertex_count, index_count, shader, format)
+
+        :param chunks: iterable of (vertices, indices) arrays, in `format`
+            and in the index type for `vertex_count` vertices. Indices refer
+            to the vertices of all chunks, and must only refer to vertices
+            in the same chunk or earlier ones.
+        :param vertex_count: total number of vertices in all chunks
+        :param index_count: total number of indices in all chunks
+
+    Chunks are only read from `chunks` as they are uploaded, so it may be a
+    generator which does the work of converting them.
+    '''
+    def __init__(self, chunks, vertex_count, index_count, shader, format):
+        self._index_gltype = get_index_type(vertex_count)
+        index_dtype = numpy.dtype(self._index_gltype)
+        self.format = format
+        self.index_count = 0
+        self.index_type = GL_INDEX_TYPES[index_dtype]
+        self.shader = shader
+        self.total_index_count = index_count
+        self._chunks = iter(chunks)
+        self._vertex_bytes = 0
+        self._index_bytes = 0
+
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+        try:
+            self.vbo = _allocate(
+                GL.GL_ARRAY_BUFFER, vertex_count * format.stride)
+            self.ibo = _allocate(
+                GL.GL_ELEMENT_ARRAY_BUFFER,
+                index_count * index_dtype.itemsize)
+            format.set_pointers(self.shader)
+        finally:
+            GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+
+    @property
+    def loaded(self):
+        '''
+        True once every chunk has been uploaded, or the glyph is deleted.
+        '''
+        return self._chunks is None
+
+
+    def upload_next(self):
+        '''
+        Read the next chunk and copy it into the end of the uploaded part of
+        each buffer, with glBufferSubData. Returns the number of bytes
+        uploaded, or zero if there are no more chunks.
+        '''
+        if self._chunks is None:
+            return 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._chunks = None
+            return 0
+        vertices = self.format.asarray(chunk[0])
+        indices = glarray(self._index_gltype, chunk[1])
+
+        GL.glBindVertexArray(self.vao)
+        try:
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+            GL.glBufferSubData(
+                GL.GL_ARRAY_BUFFER, self._vertex_bytes, vertices.nbytes,
+                vertices)
+            GL.glBufferSubData(
+                GL.GL_ELEMENT_ARRAY_BUFFER, self._index_bytes,
+                indices.nbytes, indices)
         finally:
             GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        self._vertex_bytes += vertices.nbytes
+        self._index_bytes += indices.nbytes
+        self.index_count += len(indices)
+        return vertices.nbytes + indices.nbytes
+
 
+    def delete(self):
+        self._chunks = None
+        Glyph.delete(self)
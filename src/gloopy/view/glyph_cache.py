@@ -0,0 +1,130 @@
+from hashlib import sha1
+
+from .shape_to_glyph import shape_to_glyph
+
+
+def fingerprint(shape):
+    '''
+    Return a digest of the geometry and colors of the given shape. Shapes
+    which would be converted into identical glyphs have the same fingerprint.
+    '''
+    digest = sha1()
+    for array in (
+        shape.vertices.array,
+        shape.face_indices,
+        shape.face_offsets,
+        shape.face_colors,
+    ):
+        digest.update(array.dtype.str.encode('ascii'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class _Entry(object):
+
+    __slots__ = ['key', 'shape', 'glyph', 'count']
+
+    def __init__(self, key, shape, glyph):
+        self.key = key
+        # holding a reference to the shape stops its id from being reused
+        self.shape = shape
+        self.glyph = glyph
+        self.count = 0
+
+
+class GlyphCache(object):
+    '''
+    A reference-counted collection of Glyphs, so that items which share a
+    shape also share a single Glyph, and hence a single VAO and VBO.
+
+    .. function:: __init__(factory=shape_to_glyph, fingerprint=None)
+
+        `factory`: callable which converts a shape into a new Glyph.
+
+        `fingerprint`: optional callable which returns a hashable digest of a
+        shape's content, such as :func:`fingerprint`. If given, distinct
+        shapes with the same content share a Glyph. By default, only the
+        same shape object shares a Glyph.
+
+    Each call to :meth:`acquire` must be matched by a call to :meth:`release`
+    once the glyph is no longer rendered. The glyph is deleted when the last
+    reference to it is released.
+    '''
+    def __init__(self, factory=shape_to_glyph, fingerprint=None):
+        self.factory = factory
+        self.fingerprint = fingerprint
+        self._by_key = {}
+        self._by_glyph = {}
+
+
+    def __len__(self):
+        return len(self._by_glyph)
+
+
+    def __contains__(self, shape):
+        '''
+        Return True if the cache holds a glyph for the given shape, so that
+        acquiring it needs no conversion.
+        '''
+        return shape is not None and self._key(shape) in self._by_key
+
+
+    def _key(self, shape):
+        if self.fingerprint is None:
+            return id(shape)
+        return self.fingerprint(shape)
+
+
+    def acquire(self, shape):
+        '''
+        Return the Glyph for the given shape, converting the shape if it has
+        no glyph yet, and increment the glyph's reference count.
+        Returns None if `shape` is None.
+        '''
+        if shape is None:
+            return None
+        key = self._key(shape)
+        entry = self._by_key.get(key)
+        if entry is None:
+            entry = _Entry(key, shape, self.factory(shape))
+            self._by_key[key] = entry
+            self._by_glyph[id(entry.glyph)] = entry
+        entry.count += 1
+        return entry.glyph
+
+
+    def release(self, glyph):
+        '''
+        Decrement the reference count of the given Glyph, previously returned
+        by :meth:`acquire`, deleting it when no references remain.
+        Does nothing if `glyph` is None.
+        '''
+        if glyph is None:
+            return
+        entry = self._by_glyph[id(glyph)]
+        entry.count -= 1
+        if entry.count == 0:
+            del self._by_glyph[id(glyph)]
+            if self._by_key.get(entry.key) is entry:
+                del self._by_key[entry.key]
+            glyph.delete()
+
+
+    def discard(self, shape):
+        '''
+        Forget the glyph converted from the given shape, so that the next
+        :meth:`acquire` converts it afresh. Call this after modifying a shape
+        in place. Glyphs already acquired stay valid until released.
+        '''
+        for key, entry in list(self._by_key.items()):
+            if entry.shape is shape:
+                del self._by_key[key]
+
+
+    def refcount(self, glyph):
+        '''
+        Return the number of references held to the given glyph.
+        '''
+        entry = self._by_glyph.get(id(glyph))
+        return 0 if entry is None else entry.count
+
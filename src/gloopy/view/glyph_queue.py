@@ -0,0 +1,152 @@
+from collections import deque
+from timeit import default_timer
+
+import numpy
+
+
+# the queue is only sorted again, other than after items are added, once
+# some element of the view matrix has changed by more than this since it was
+# last sorted: roughly 6 degrees of camera rotation, or 0.1 units of movement
+RESORT_CHANGE = 0.1
+
+
+def _shapes(item):
+    '''
+    Return the item's shapes as a list, one per frame.
+    '''
+    return item.shape if isinstance(item.shape, list) else [item.shape]
+
+
+def _unconverted(item):
+    '''
+    Return the frame numbers of the item's shapes which have no glyph yet.
+    '''
+    return [
+        frame
+        for frame, (glyph, shape) in enumerate(zip(item.glyph, _shapes(item)))
+        if glyph is None and shape is not None
+    ]
+
+
+class GlyphQueue(object):
+    '''
+    Defers converting the shapes of items added to the world into glyphs, so
+    that they are converted a few at a time, each frame, rather than all at
+    once when the items are added.
+
+    .. function:: __init__(glyphs)
+
+        `glyphs`: the :class:`~gloopy.view.glyph_cache.GlyphCache` which
+        glyphs are acquired from.
+
+    :meth:`add` gives each item a `glyph` list like that of its shapes, but
+    filled with None except where the cache already holds the shape's glyph.
+    :meth:`convert` then fills in the rest, most important first.
+
+    The order is kept from one call of :meth:`convert` to the next, and only
+    sorted again when items have been added, or the camera has moved by more
+    than RESORT_CHANGE.
+    '''
+    def __init__(self, glyphs):
+        self.glyphs = glyphs
+        self.items = {}
+        # (item, frame) still to be converted, in order, or None if items
+        # have been added since they were sorted, and the view they were
+        # sorted for
+        self._pending = None
+        self._view = None
+
+
+    def __len__(self):
+        return len(self.items)
+
+
+    def add(self, item):
+        '''
+        Set `item.glyph` to a list with an entry for each of the item's
+        shapes, as in `item.shape`, either a single shape or a list of them,
+        and queue the item if any of them have yet to be converted.
+        '''
+        item.glyph = [
+            self.glyphs.acquire(shape) if shape in self.glyphs else None
+            for shape in _shapes(item)
+        ]
+        if _unconverted(item):
+            self.items[item.id] = item
+            self._pending = None
+
+
+    def remove(self, item):
+        '''
+        Stop converting the given item's shapes, if it is queued. Its
+        entries in the sorted order are skipped when reached.
+        '''
+        self.items.pop(item.id, None)
+
+
+    def _order(self, view):
+        '''
+        Return (item, frame) for each shape still to be converted, in the
+        order they should be converted: first the frames each item currently
+        shows, then items in front of the camera, nearest first, then the
+        rest. `view` is the view matrix, as a 4x4 array in OpenGL's
+        column-major order.
+        '''
+        items = list(self.items.values())
+        positions = numpy.array(
+            [item.transform.array[12:15] for item in items]
+        ).reshape(-1, 3)
+        # z in eye space, which is negative in front of the camera
+        depths = (positions @ view[:3, 2] + view[3, 2]).tolist()
+        pending = []
+        for item, depth in zip(items, depths):
+            current = getattr(item, 'frame', 0)
+            for frame in _unconverted(item):
+                key = (frame != current, depth >= 0, abs(depth))
+                pending.append((key, item.id, frame, item))
+        pending.sort(key=lambda entry: entry[:3])
+        return [(item, frame) for _, _, frame, item in pending]
+
+
+    def _sorted(self, view):
+        '''
+        Return the deque of (item, frame) still to be converted, sorting it
+        again if items have been added or the view has changed materially.
+        '''
+        if (
+            self._pending is None or
+            numpy.abs(view - self._view).max() > RESORT_CHANGE
+        ):
+            self._pending = deque(self._order(view))
+            self._view = numpy.array(view, copy=True)
+        return self._pending
+
+
+    def convert(self, view, seconds):
+        '''
+        Convert queued shapes into glyphs, in the order described for
+        :meth:`_order`, until `seconds` have passed, including any time
+        spent sorting, converting at least one. Returns the number
+        converted.
+        '''
+        if not self.items:
+            return 0
+        deadline = default_timer() + seconds
+        pending = self._sorted(view)
+        converted = 0
+        while pending:
+            item, frame = pending.popleft()
+            # skip items removed, or converted elsewhere, since sorting
+            if self.items.get(item.id) is not item:
+                continue
+            if item.glyph[frame] is not None:
+                continue
+            item.glyph[frame] = self.glyphs.acquire(_shapes(item)[frame])
+            converted += 1
+            if not _unconverted(item):
+                del self.items[item.id]
+            if default_timer() >= deadline:
+                break
+        if not pending:
+            self._pending = None
+        return converted
@@ -1,16 +1,38 @@
 from __future__ import division
 
-from OpenGL import GL as gl, GLU as glu
+import numpy
+from OpenGL import GL as gl
 
 from ..gameitem import position_or_gameitem
 
 
+def look_at(eye, target, up):
+    '''
+    Return the view matrix for a camera at `eye` looking towards `target`,
+    as gluLookAt would calculate it, as a 4x4 float32 array in OpenGL's
+    column-major order (i.e. each row of the array is a column of the
+    matrix.)
+    '''
+    eye = numpy.asarray(eye, dtype=numpy.float64)
+    forward = numpy.asarray(target, dtype=numpy.float64) - eye
+    forward /= numpy.linalg.norm(forward)
+    right = numpy.cross(forward, up)
+    right /= numpy.linalg.norm(right)
+    up = numpy.cross(right, forward)
+    matrix = numpy.identity(4)
+    matrix[:3, 0] = right
+    matrix[:3, 1] = up
+    matrix[:3, 2] = -forward
+    matrix[3, :3] = -eye @ matrix[:3, :3]
+    return matrix.astype(numpy.float32)
+
+
 class ModelView(object):
     '''
     Manage modelview matrix.
-    
-    Presumably this class will go away in future
-    releases of Gloopy as we use a more OpenGL3 style.
+
+    The view matrix is calculated here, and uploaded by Render as a shader
+    uniform. The fixed-function modelview matrix is only used to draw the HUD.
 
     .. function:: __init__(camera)
 
@@ -19,6 +41,7 @@ class ModelView(object):
     '''
     def __init__(self, camera):
         self.camera = camera
+        self.matrix = numpy.identity(4, dtype=numpy.float32)
 
     def set_identity(self):
         gl.glMatrixMode(gl.GL_MODELVIEW)
@@ -26,15 +49,12 @@ class ModelView(object):
 
     def set_world(self):
         '''
-        Set the OpenGL modelview matrix to account for the camera's position
-        and orientation.
+        Set and return `self.matrix`, the view matrix which accounts for the
+        camera's position and orientation.
         '''
-        gl.glMatrixMode(gl.GL_MODELVIEW)
-        gl.glLoadIdentity()
-        position = self.camera.position
-        look_at = position_or_gameitem(self.camera.look_at)
-        glu.gluLookAt(
-            position.x, position.y, position.z,
-            look_at.x, look_at.y, look_at.z,
-            0, 1, 0)
-
+        self.matrix = look_at(
+            self.camera.position,
+            position_or_gameitem(self.camera.look_at),
+            (0, 1, 0),
+        )
+        return self.matrix
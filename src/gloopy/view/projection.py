@@ -1,20 +1,40 @@
 from __future__ import division
 
+from math import radians, tan
+
+import numpy
 from OpenGL import GL as gl, GLU as glu
 from pyglet.event import EVENT_HANDLED
 
 
+def perspective(fovy, aspect, near, far):
+    '''
+    Return the projection matrix that gluPerspective would calculate, as a
+    4x4 float32 array in OpenGL's column-major order.
+    '''
+    focal = 1 / tan(radians(fovy) / 2)
+    matrix = numpy.zeros((4, 4), dtype=numpy.float32)
+    matrix[0, 0] = focal / aspect
+    matrix[1, 1] = focal
+    matrix[2, 2] = (far + near) / (near - far)
+    matrix[2, 3] = -1
+    matrix[3, 2] = 2 * far * near / (near - far)
+    return matrix
+
+
 class Projection(object):
     '''
     Manage projection matrix.
     
-    Presumably this class will go away, or be severely modified, in some future
-    release of Gloopy which may use a more OpenGL3 style.
+    The perspective projection used to draw the world is calculated here,
+    and uploaded by Render as a shader uniform. The fixed-function projection
+    matrix is only used to draw the HUD.
     '''
     def __init__(self, window):
         window.on_resize = self.resize_window
         self.width = window.width
         self.height = window.height
+        self.matrix = numpy.identity(4, dtype=numpy.float32)
 
 
     def resize_window(self, width, height):
@@ -30,15 +50,14 @@ class Projection(object):
 
     def set_perspective(self, fovy):
         '''
-        Set OpenGL projection matrix to a 3D perspective projection, with the
+        Set and return `self.matrix`, a 3D perspective projection with the
         given field of view, in degrees.
         '''
         aspect = self.width / self.height
         zNear = 0.1
         zFar = 3000.0
-        gl.glMatrixMode(gl.GL_PROJECTION)
-        gl.glLoadIdentity()
-        glu.gluPerspective(fovy, aspect, zNear, zFar);
+        self.matrix = perspective(fovy, aspect, zNear, zFar)
+        return self.matrix
 
 
     def set_ortho(self, scale):
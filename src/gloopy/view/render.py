@@ -1,12 +1,27 @@
+from functools import partial
+from timeit import default_timer
+
 import pyglet
 from pyglet.event import EVENT_HANDLED
 from pyglet import gl
 
-from ..geom.orientation import Orientation
+from .batch import Batch
+from .glyph import StreamingGlyph
+from .glyph_cache import GlyphCache
+from .glyph_queue import GlyphQueue
 from .modelview import ModelView
 from .projection import Projection
 from .shader import Shader
-from .shape_to_glyph import shape_to_glyph
+from .shape_to_glyph import glyph_factory
+from .vertex_format import PACKED, get_format
+
+
+# when options.stream is set, shapes with more faces than this are uploaded
+# this many faces at a time
+STREAM_FACES = 16384
+
+# time per frame spent uploading streamed glyphs, after the first chunk
+UPLOAD_SECONDS = 0.004
 
 
 class Render(object):
@@ -22,6 +37,30 @@ class Render(object):
         `camera`: gloopy camera (might be a GameItem instance)
 
         `options`: instance of :class:`~gloopy.util.options.Options`.
+
+    Glyphs for the shapes of items in the world are held in `self.glyphs`, a
+    :class:`~gloopy.view.glyph_cache.GlyphCache`.
+
+    If `options.batch` is set, items with a single shape are drawn together
+    by `self.batch`, a :class:`~gloopy.view.batch.Batch`, in one draw call.
+    Items with a list of shapes, as frames of an animation, are still drawn
+    individually.
+
+    If `options.stream` is set, the glyphs of large shapes are
+    :class:`~gloopy.view.glyph.StreamingGlyph` instances, held in
+    `self.streaming` until they are loaded. Each frame uploads chunks of them
+    for up to UPLOAD_SECONDS, so adding a large shape does not stall
+    rendering.
+
+    Items' shapes are not converted into glyphs as soon as they are added,
+    but queued in `self.queue`, a
+    :class:`~gloopy.view.glyph_queue.GlyphQueue`, which each frame converts
+    for up to `options.convert_ms` milliseconds, currently shown frames and
+    the nearest visible items first. Until then, their unconverted frames
+    are not drawn.
+
+    Shapes may be converted ahead of time, on another thread, by
+    :meth:`prepare`, so that only their upload remains when they are added.
     '''
     def __init__(self, world, window, camera, options):
         self.world = world
@@ -29,22 +68,118 @@ class Render(object):
         self.projection = Projection(window)
         self.modelview = ModelView(camera)
         self.options = options
+        format = get_format(options.vertex_format)
+        self._glyph_factory = partial(
+            glyph_factory,
+            format=format,
+            workers=options.workers,
+            chunk_faces=STREAM_FACES if options.stream else None,
+        )
+        self.streaming = []
+        self._prepared = {}
+        self.glyphs = GlyphCache(self._create_glyph)
+        self.queue = GlyphQueue(self.glyphs)
+        if options.batch:
+            # a batch's vertices must all have the same format
+            self.batch = Batch(format=format or PACKED)
+        else:
+            self.batch = None
         self._bind_shape_to_glyph()
         self.fps = pyglet.window.FPSDisplay(self.window)
 
 
+    def prepare(self, shape):
+        '''
+        Convert the given shape, or list of shapes, into the arrays from
+        which its glyph will be created, keeping them until the shape is
+        added to the world. Does not call OpenGL, so may be called from a
+        background thread, such as by a :class:`~gloopy.loader.Loader`.
+        '''
+        if not isinstance(shape, list):
+            if self.batch is not None:
+                # drawn by the batch, which does not use glyphs, but reads
+                # cached shapes' arrays, which must not be generated later,
+                # on the main thread
+                if hasattr(shape, 'glyph_arrays'):
+                    shape.glyph_arrays(self.batch.format, instanced=False)
+                return
+            shape = [shape]
+        for shape in shape:
+            if shape is not None:
+                self._prepared[id(shape)] = (
+                    shape, self._glyph_factory(shape, preload=True))
+
+
+    def _create_glyph(self, shape):
+        prepared = self._prepared.pop(id(shape), None)
+        if prepared is not None and prepared[0] is shape:
+            create = prepared[1]
+        else:
+            create = self._glyph_factory(shape)
+        glyph = create()
+        if isinstance(glyph, StreamingGlyph):
+            self.streaming.append(glyph)
+        return glyph
+
+
+    def upload_streaming(self, seconds=UPLOAD_SECONDS):
+        '''
+        Upload chunks of the glyphs in `self.streaming`, oldest first, until
+        `seconds` have passed. At least one chunk is uploaded, if any remain.
+        Glyphs are removed from `self.streaming` once loaded.
+        '''
+        deadline = default_timer() + seconds
+        while self.streaming:
+            glyph = self.streaming[0]
+            if not glyph.upload_next():
+                self.streaming.pop(0)
+            elif default_timer() >= deadline:
+                break
+
+
     def _bind_shape_to_glyph(self):
-        # adding items to the world should convert their shapes to a glyph
-        def convert_item_shape_to_glyph(item):
-            if item.shape:
-                if isinstance(item.shape, list):
-                    shapes = item.shape
-                else:
-                    shapes = [item.shape]
-                item.glyph = [ shape_to_glyph(shape) for shape in shapes ]
+        # adding items to the world should convert their shapes to a glyph.
+        # Items which share a shape share its glyph.
+        def acquire_glyphs(item):
+            if self.batch is not None and item.shape and not isinstance(
+                item.shape, list
+            ):
+                self.batch.add(item)
+                item.glyph = None
+            elif item.shape:
                 if not hasattr(item, 'frame') or item.frame is None:
                     item.frame = 0
-        self.world.item_added += convert_item_shape_to_glyph
+                self.queue.add(item)
+            else:
+                item.glyph = None
+
+        def shapes_of(item):
+            if isinstance(item.shape, list):
+                return item.shape
+            return [item.shape]
+
+        def release_glyphs(item):
+            self.queue.remove(item)
+            if self.batch is not None and item.id in self.batch.items:
+                self.batch.remove(item)
+            if item.glyph:
+                for glyph in item.glyph:
+                    self.glyphs.release(glyph)
+            item.glyph = None
+            # arrays prepared for shapes which were never converted, or
+            # which have since been modified, would otherwise be kept
+            for shape in shapes_of(item):
+                self._prepared.pop(id(shape), None)
+
+        def reacquire_glyphs(item):
+            release_glyphs(item)
+            for shape in shapes_of(item):
+                self.glyphs.discard(shape)
+            acquire_glyphs(item)
+
+        self.world.item_added += acquire_glyphs
+        self.world.item_removed += release_glyphs
+        self.world.item_changed += reacquire_glyphs
 
 
     def init(self):
@@ -71,9 +206,13 @@ class Render(object):
         '''
         Redraw the whole window
         '''
+        self.upload_streaming()
         self.clear_window(self.world.background_color)
-        self.projection.set_perspective(45)
-        self.modelview.set_world()
+        projection = self.projection.set_perspective(45)
+        view = self.modelview.set_world()
+        self.queue.convert(view, self.options.convert_ms / 1000)
+        if self.batch is not None:
+            self.batch.draw(projection, view)
         self.draw_world_items(glyphs)
         if self.options.fps:
             self.draw_hud()
@@ -83,31 +222,39 @@ class Render(object):
 
     def draw_world_items(self, glyphs):
         '''
-        Draw all passed glyphs
+        Draw all passed (model, glyph) pairs, using the current projection
+        and view matrices. Each `model` is a model matrix of 16 float32 in
+        column-major order, such as the `array` of an item's
+        :class:`~gloopy.geom.transform.Transform`.
         '''
         shader = None
-        for position, orientation, glyph in glyphs:
-
-            gl.glPushMatrix()
-
-            gl.glTranslatef(*position)
-            if orientation and orientation != Orientation.Identity:
-                gl.glMultMatrixf(orientation.matrix)
+        for model, glyph in glyphs:
 
             if glyph.shader is not shader:
                 shader = glyph.shader
                 shader.use()
+                shader.set_matrix('projection', self.projection.matrix)
+                shader.set_matrix('view', self.modelview.matrix)
 
+            shader.set_matrix('model', model)
             gl.glBindVertexArray(glyph.vao)
 
-            gl.glDrawElements(
-                gl.GL_TRIANGLES,
-                len(glyph.glindices),
-                glyph.index_type,
-                glyph.glindices
-            )
-
-            gl.glPopMatrix()
+            # indices are read from the index buffer bound by the VAO
+            if glyph.instance_count is None:
+                gl.glDrawElements(
+                    gl.GL_TRIANGLES,
+                    glyph.index_count,
+                    glyph.index_type,
+                    None
+                )
+            else:
+                gl.glDrawElementsInstanced(
+                    gl.GL_TRIANGLES,
+                    glyph.index_count,
+                    glyph.index_type,
+                    None,
+                    glyph.instance_count
+                )
 
         gl.glBindVertexArray(0)
         Shader.unuse()
@@ -7,7 +7,7 @@ class Shader(object):
     '''
     Wraps PyOpenGL's shader compile and link functions
 
-    .. function:: __init__(vertex, fragment, attributes)
+    .. function:: __init__(vertex, fragment, attributes, uniforms=())
 
         `vertex`: filename of vertex shader source code
 
@@ -15,18 +15,66 @@ class Shader(object):
 
         `attribs`: a list of attribute names
 
-        Compiles and links the shader. For each attribute_name in
-        `attribs`, looks up the attribute location, and stores it
-        in self.attrib[attribute_name].
+        The shader is compiled and linked when its `program` or `attrib`
+        are first used, which must be after an OpenGL context exists. For
+        each attribute_name in `attribs`, looks up the attribute location,
+        and stores it in self.attrib[attribute_name].
+
+        `uniforms`: a list of uniform names, whose locations are likewise
+        stored in self.uniform.
     '''
-    def __init__(self, vert_src, frag_src, attribs):
-        self.program = compileProgram(
-            compileShader(vert_src, GL.GL_VERTEX_SHADER),
-            compileShader(frag_src, GL.GL_FRAGMENT_SHADER)
+    def __init__(self, vert_src, frag_src, attribs, uniforms=()):
+        self.vert_src = vert_src
+        self.frag_src = frag_src
+        self.attribs = attribs
+        self.uniforms = uniforms
+        self._program = None
+        self._attrib = None
+        self._uniform = None
+
+
+    def _compile(self):
+        self._program = compileProgram(
+            compileShader(self.vert_src, GL.GL_VERTEX_SHADER),
+            compileShader(self.frag_src, GL.GL_FRAGMENT_SHADER)
         )
-        self.attrib = {}
-        for attrib in attribs:
-            self.attrib[attrib] = GL.glGetAttribLocation(self.program, attrib)
+        self._attrib = {}
+        for attrib in self.attribs:
+            self._attrib[attrib] = GL.glGetAttribLocation(
+                self._program, attrib)
+        self._uniform = {}
+        for uniform in self.uniforms:
+            self._uniform[uniform] = GL.glGetUniformLocation(
+                self._program, uniform)
+
+
+    @property
+    def program(self):
+        if self._program is None:
+            self._compile()
+        return self._program
+
+
+    @property
+    def attrib(self):
+        if self._attrib is None:
+            self._compile()
+        return self._attrib
+
+
+    @property
+    def uniform(self):
+        if self._uniform is None:
+            self._compile()
+        return self._uniform
+
+
+    def set_matrix(self, name, matrix):
+        '''
+        Set the named mat4 uniform of this shader, which must be in use, to
+        `matrix`, 16 floats in OpenGL's column-major order.
+        '''
+        GL.glUniformMatrix4fv(self.uniform[name], 1, GL.GL_FALSE, matrix)
 
 
     def use(self):
@@ -38,4 +86,3 @@ class Shader(object):
     def unuse():
         """Stop use of this shader program"""
         GL.glUseProgram( 0 )
-
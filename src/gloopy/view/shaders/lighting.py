@@ -1,24 +1,30 @@
 from ..shader import Shader
 
+# GLSL 3.30 core, so these need an OpenGL 3.3 context. A compatibility
+# profile context will do, which pyglet's FPSDisplay needs for the HUD.
 _VERTEX = """
-#version 120
+#version 330 core
 
-attribute vec3 position;
-attribute vec4 color;
-attribute vec3 normal;
-
-varying vec4 baseColor;
+in vec3 position;
+in vec4 color;
+in vec3 normal;
+uniform mat4 projection;
+uniform mat4 view;
+%(declarations)s
+out vec4 baseColor;
 
 void main()
 {
     vec4 ambientLightColor = vec4(0.325, 0.150, 0.007, 1.0);
     vec3 dirLightDir = vec3(0.267, 0.267 * 3.0, 0.267 * 2.0);
     vec4 dirLightColor = vec4(1.0, 1.0, 1.0, 1.0);
+%(transform)s
+    gl_Position = projection * view * worldPosition;
+
+    // normals from packed vertex formats are only approximately unit length.
+    // Transforms are rotations and translations, so need no normal matrix.
+    float nDotL = dot(mat3(view) * normalize(worldNormal), dirLightDir);
 
-    gl_Position = gl_ModelViewProjectionMatrix * vec4(position, 1.0);
-    
-    float nDotL = dot(gl_NormalMatrix * normal, dirLightDir);
- 
     // fake lighting of backfaces too
     // perhaps remove this when we have more than one lightsource
     nDotL = 0.5 + nDotL * 0.5;
@@ -33,15 +39,69 @@ void main()
 }
 """
 _FRAGMENT = """
-#version 120
+#version 330 core
 
-varying vec4 baseColor;
+in vec4 baseColor;
+layout(location = 0) out vec4 fragColor;
 
 void main()
 {
-    gl_FragColor = baseColor;
+    fragColor = baseColor;
 }
 """
 
-lighting = Shader(_VERTEX, _FRAGMENT, ['position', 'color', 'normal'])
+lighting = Shader(
+    _VERTEX % dict(
+        declarations='uniform mat4 model;\n',
+        transform="""
+    vec4 worldPosition = model * vec4(position, 1.0);
+    vec3 worldNormal = mat3(model) * normal;
+""",
+    ),
+    _FRAGMENT,
+    ['position', 'color', 'normal'],
+    ['projection', 'view', 'model'],
+)
 
+# As lighting, but each vertex is first transformed by the 'instance' matrix,
+# which is given per instance when drawing an instanced Glyph.
+instanced_lighting = Shader(
+    _VERTEX % dict(
+        declarations="""in mat4 instance;
+uniform mat4 model;
+""",
+        transform="""
+    mat4 transform = model * instance;
+    vec4 worldPosition = transform * vec4(position, 1.0);
+    vec3 worldNormal = mat3(transform) * normal;
+""",
+    ),
+    _FRAGMENT,
+    ['position', 'color', 'normal', 'instance'],
+    ['projection', 'view', 'model'],
+)
+
+# As lighting, but each vertex belongs to the item given by its 'item'
+# attribute, whose model matrix is read from the buffer texture bound to
+# texture unit 0, four texels per item.
+batched_lighting = Shader(
+    _VERTEX % dict(
+        declarations="""in float item;
+uniform samplerBuffer transforms;
+""",
+        transform="""
+    int base = int(item + 0.5) * 4;
+    mat4 instance = mat4(
+        texelFetch(transforms, base),
+        texelFetch(transforms, base + 1),
+        texelFetch(transforms, base + 2),
+        texelFetch(transforms, base + 3)
+    );
+    vec4 worldPosition = instance * vec4(position, 1.0);
+    vec3 worldNormal = mat3(instance) * normal;
+""",
+    ),
+    _FRAGMENT,
+    ['position', 'color', 'normal', 'item'],
+    ['projection', 'view'],
+)
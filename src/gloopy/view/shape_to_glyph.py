@@ -1,44 +1,228 @@
-from itertools import chain
+from functools import partial
 
-from .glyph import Glyph
-from .shaders.lighting import lighting
+import numpy
 
+from ..util.parallel import chunk_slices, map_chunks
+from .glyph import Glyph, StreamingGlyph, get_index_type
+from .shaders.lighting import instanced_lighting, lighting
+from .vertex_format import FLOAT, compact_format
 
-def shape_to_glyph(shape):
+
+# shape_to_arrays only splits work into chunks of at least this many faces
+MIN_CHUNK = 16384
+
+
+def shape_to_glyph(shape, format=FLOAT, workers=None, chunk_faces=None):
     '''
     Return a new :class:`~gloopy.view.glyph.Glyph`, which contains the geometry
     of the given shape converted into an indexed vertex array stored in a VBO,
     ready for rendering in OpenGL as a single draw call.
+
+    `format` is the :class:`~gloopy.view.vertex_format.VertexFormat` of the
+    glyph's vertices. If None, the most compact format that can store the
+    shape's vertex positions exactly is used.
+
+    MultiShapes which consist of many copies of a single shape are converted
+    into an instanced glyph, which contains the geometry of that shape just
+    once, plus a transform matrix for each copy.
+
+    Shapes which can provide their own glyph arrays, such as
+    :class:`~gloopy.view.disk_cache.CachedShape`, do so by a
+    `glyph_arrays(format)` method, which returns either (vertices, indices)
+    or, for an instanced glyph, (vertices, indices, instances).
+
+    `workers` is passed to :func:`shape_to_arrays`.
+
+    If `chunk_faces` is given, shapes with more faces than that are instead
+    returned as an empty :class:`~gloopy.view.glyph.StreamingGlyph`, which
+    converts and uploads that many faces each time its `upload_next` is
+    called.
+    '''
+    return glyph_factory(shape, format, workers, chunk_faces)()
+
+
+def glyph_factory(
+    shape, format=FLOAT, workers=None, chunk_faces=None, preload=False
+):
+    '''
+    Do the part of :func:`shape_to_glyph` which does not call OpenGL, and
+    return a callable which takes no arguments and does the rest, returning
+    the new Glyph (or None, if `shape` is None.)
+
+    This function may be called on a background thread, but the returned
+    callable must be called on the thread which owns the OpenGL context.
+
+    If `preload` is True, the chunks of a
+    :class:`~gloopy.view.glyph.StreamingGlyph` are all converted now, so
+    that only uploading them remains.
     '''
     if shape is None:
+        return lambda: None
+    if hasattr(shape, 'glyph_arrays'):
+        arrays = shape.glyph_arrays(format)
+        if len(arrays) == 2:
+            return partial(Glyph, arrays[0], arrays[1], lighting)
+        instanced = arrays
+    else:
+        instanced = shape_to_instanced_arrays(shape, format)
+    if instanced is not None:
+        vertices, indices, instances = instanced
+        return partial(
+            Glyph, vertices, indices, instanced_lighting, instances=instances)
+    if chunk_faces and len(shape.face_offsets) - 1 > chunk_faces:
+        chunks, vertex_count, index_count, format = stream_arrays(
+            shape, format, chunk_faces)
+        if preload:
+            chunks = list(chunks)
+        return partial(
+            StreamingGlyph, chunks, vertex_count, index_count, lighting,
+            format)
+    vertices, indices = shape_to_arrays(shape, format, workers)
+    return partial(Glyph, vertices, indices, lighting)
+
+
+def shape_to_arrays(shape, format=FLOAT, workers=None):
+    '''
+    Return the geometry of the given shape as a pair of numpy arrays,
+    (vertices, indices), in the form that :class:`~gloopy.view.glyph.Glyph`
+    consumes. `vertices` is an array of vertex position, color and normal in
+    the given :class:`~gloopy.view.vertex_format.VertexFormat`, by default
+    a flat float32 array of FLOATS_PER_VERTEX values per vertex. If `format`
+    is None, the most compact format that can store the vertex positions
+    exactly is used. `indices` are unsigned ints, three per triangle.
+
+    Every corner of every face gets its own vertex, since each vertex takes
+    the color and normal of its face. The whole conversion is done with array
+    operations, without looping over faces in Python.
+
+    If `workers` is greater than one, the faces of large shapes are split
+    into chunks, which are converted in that many worker processes, then
+    merged.
+    '''
+    indices = shape.face_indices
+    offsets = shape.face_offsets
+    positions = shape.vertices.array[indices]
+    if format is None:
+        format = compact_format(positions)
+    colors = shape.face_colors
+    normals = shape.face_normals
+
+    chunks = map_chunks(
+        _faces_to_arrays,
+        [
+            (
+                format,
+                positions[offsets[chunk.start]:offsets[chunk.stop]],
+                colors[chunk],
+                normals[chunk],
+                offsets[chunk.start:chunk.stop + 1],
+            )
+            for chunk in chunk_slices(len(offsets) - 1, workers, MIN_CHUNK)
+        ],
+        workers
+    )
+    vertices = numpy.concatenate([vertices for vertices, _ in chunks])
+    index_type = numpy.dtype(get_index_type(len(positions)))
+    return vertices, numpy.concatenate(
+        [triangles for _, triangles in chunks]).astype(index_type)
+
+
+def stream_arrays(shape, format=FLOAT, chunk_faces=MIN_CHUNK):
+    '''
+    Return (chunks, vertex_count, index_count, format), where `chunks` is a
+    generator of the (vertices, indices) that :func:`shape_to_arrays` would
+    return, split into runs of `chunk_faces` faces, which are only converted
+    as the generator is advanced. Indices are into the vertices of all
+    chunks. `format` is the vertex format used, which is chosen as for
+    shape_to_arrays if the given one is None.
+
+    The shape's face arrays are copied immediately, so later changes to the
+    shape do not affect the chunks.
+    '''
+    offsets = shape.face_offsets.copy()
+    positions = shape.vertices.array[shape.face_indices]
+    if format is None:
+        format = compact_format(positions)
+    colors = shape.face_colors.copy()
+    normals = shape.face_normals.copy()
+    index_type = numpy.dtype(get_index_type(len(positions)))
+    face_count = len(offsets) - 1
+
+    def chunks():
+        for start in range(0, face_count, chunk_faces):
+            stop = min(start + chunk_faces, face_count)
+            vertices, indices = _faces_to_arrays(
+                format,
+                positions[offsets[start]:offsets[stop]],
+                colors[start:stop],
+                normals[start:stop],
+                offsets[start:stop + 1],
+            )
+            yield vertices, indices.astype(index_type)
+
+    index_count = 3 * int(numpy.sum(numpy.diff(offsets) - 2))
+    return chunks(), len(positions), index_count, format
+
+
+def _faces_to_arrays(format, positions, colors, normals, offsets):
+    '''
+    Return (vertices, indices) as described for :func:`shape_to_arrays`, for
+    a run of consecutive faces, given the position of each of their corners,
+    their colors and normals, and the offsets of their first corners within
+    the whole shape. The indices are those within the whole shape.
+    '''
+    sizes = numpy.diff(offsets)
+    face_of_corner = numpy.repeat(numpy.arange(len(sizes)), sizes)
+    vertices = format.pack(
+        positions, colors[face_of_corner], normals[face_of_corner])
+    return vertices, _tessellate(offsets)
+
+
+def shape_to_instanced_arrays(shape, format=FLOAT):
+    '''
+    If the given shape is a MultiShape consisting of several copies of one
+    shape, return (vertices, indices, instances), where vertices and indices
+    are the arrays of that one shape, as returned by :func:`shape_to_arrays`,
+    and instances is an N x 16 float32 array of the transform of each copy,
+    as described for :class:`~gloopy.view.glyph.Glyph`. Otherwise, return
+    None.
+    '''
+    repeated_child = getattr(shape, 'repeated_child', None)
+    if repeated_child is None:
+        return None
+    repeated = repeated_child()
+    if repeated is None or len(repeated[1]) < 2:
         return None
-    vertices = []
-    indices = []
-    next_index = 0
-    for face in shape.faces:
-        new_indices = {}
-        for old_index in _tessellate(face):
-            if old_index not in new_indices:
-                vertices.extend( chain(
-                    shape.vertices[old_index], face.color, face.normal
-                ) )
-                new_indices[old_index] = next_index
-                next_index += 1
-            indices.append(new_indices[old_index])
-
-    return Glyph(vertices, indices, lighting)
-
-
-def _tessellate(indices):
-    '''
-    Return the indices of the given face tesselated into triangles The
-    triangles will be wound in the same direction as the original poly. Does
-    not work for concave faces.
-
-    e.g. [0, 1, 2, 3, 4] -> [0, 1, 2,  0, 2, 3,  0, 3, 4]
-    '''
-    for index in range(1, len(indices) - 1):
-        yield indices[0]
-        yield indices[index]
-        yield indices[index + 1]
-    
+    child, transforms = repeated
+    vertices, indices = shape_to_arrays(child, format)
+    return vertices, indices, instance_array(transforms)
+
+
+def instance_array(transforms):
+    '''
+    Return the given sequence of :class:`~gloopy.geom.matrix.Matrix` as an
+    N x 16 float32 array, each row a matrix in OpenGL's column-major order.
+    '''
+    matrices = numpy.array(
+        [transform.elements for transform in transforms], dtype=numpy.float32
+    ).reshape(-1, 4, 4)
+    return numpy.ascontiguousarray(matrices.transpose(0, 2, 1)).reshape(-1, 16)
+
+
+def _tessellate(offsets):
+    '''
+    Return indices which tessellate the faces delimited by the given offsets
+    into triangles, each face a fan around its first vertex. The triangles
+    will be wound in the same direction as the original poly. Does not work
+    for concave faces.
+
+    e.g. [0, 5] -> [0, 1, 2,  0, 2, 3,  0, 3, 4]
+    '''
+    fans = numpy.diff(offsets) - 2
+    first = numpy.repeat(offsets[:-1], fans)
+    # position of each triangle's second vertex within its face
+    step = (
+        numpy.arange(1, fans.sum() + 1) -
+        numpy.repeat(numpy.cumsum(fans) - fans, fans)
+    )
+    return numpy.stack([first, first + step, first + step + 1], axis=1).ravel()
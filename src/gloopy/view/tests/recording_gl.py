@@ -0,0 +1,43 @@
+'''
+A stand-in for OpenGL.GL or pyglet.gl, which records the GL calls made,
+so that code which issues them can be tested without an OpenGL context.
+'''
+from OpenGL import GL
+
+
+class RecordingGL(object):
+    '''
+    Functions whose names start with 'gl' are replaced by a recorder, which
+    appends (name, args) to self.calls. glGen* functions return new
+    sequential names. All other attributes, such as constants and types, are
+    those of the real OpenGL.GL module.
+    '''
+    def __init__(self):
+        self.calls = []
+        self._next_name = 1
+
+
+    def __getattr__(self, name):
+        if not name.startswith('gl'):
+            return getattr(GL, name)
+        def record(*args):
+            self.calls.append((name, args))
+            if name.startswith('glGen'):
+                self._next_name += 1
+                return self._next_name - 1
+        return record
+
+
+    def names(self):
+        '''
+        Return the names of the functions called, in order.
+        '''
+        return [name for name, _ in self.calls]
+
+
+    def args(self, name):
+        '''
+        Return a list of the arguments to each call of the named function.
+        '''
+        return [args for called, args in self.calls if called == name]
+
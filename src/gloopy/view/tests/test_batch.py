@@ -0,0 +1,159 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ... import gameitem
+from ...geom.orientation import Orientation
+from ...geom.vector import Vector
+from ...shapes.cube import Cube
+from ...shapes.shape import Shape
+from ...color import Color
+from .. import batch, glyph, vertex_format
+from ..batch import Batch, item_transforms, merge_shapes
+from ..shape_to_glyph import shape_to_arrays
+from .recording_gl import RecordingGL
+
+
+class FakeShader(object):
+
+    attrib = dict(position=0, color=1, normal=2, item=3)
+
+    def use(self):
+        pass
+
+    def set_matrix(self, name, matrix):
+        pass
+
+
+IDENTITY = numpy.identity(4, dtype=numpy.float32)
+
+
+def triangle():
+    return Shape([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [[0, 1, 2]], Color.Red)
+
+
+class TestItemTransforms(TestCase):
+
+    def testEmpty(self):
+        self.assertEqual(item_transforms([]).shape, (0, 16))
+
+    def testMatchesItemMatrix(self):
+        orientation = Orientation(Vector(1, 2, 3))
+        item = gameitem.GameItem(
+            position=Vector(4, 5, 6), orientation=orientation)
+
+        transforms = item_transforms([item])
+
+        # translate by position, then rotate by orientation.matrix, which
+        # is given to OpenGL, so is read column-major
+        translate = numpy.identity(4)
+        translate[:3, 3] = item.position
+        rotate = numpy.array(list(orientation.matrix)).reshape(4, 4).T
+        expected = (translate @ rotate).T.reshape(16)
+        self.assertTrue(numpy.allclose(transforms[0], expected, atol=1e-6))
+
+    def testNoOrientationIsIdentity(self):
+        item = gameitem.GameItem(position=Vector(1, 2, 3))
+
+        transforms = item_transforms([item]).reshape(4, 4)
+
+        self.assertTrue(numpy.allclose(
+            transforms,
+            [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [1, 2, 3, 1]]
+        ))
+
+
+class TestMergeShapes(TestCase):
+
+    def testOffsetsIndicesAndTagsItems(self):
+        first = triangle()
+        second = Cube(1, Color.Blue)
+
+        vertices, indices, item_indices = merge_shapes([first, second])
+
+        first_vertices, first_indices = shape_to_arrays(first)
+        second_vertices, second_indices = shape_to_arrays(second)
+        self.assertEqual(
+            vertices.tolist(),
+            numpy.concatenate([first_vertices, second_vertices]).tolist()
+        )
+        self.assertEqual(indices.dtype, numpy.uint32)
+        self.assertEqual(
+            indices.tolist(),
+            list(first_indices) + [index + 3 for index in second_indices]
+        )
+        self.assertEqual(item_indices.tolist(), [0] * 3 + [1] * 24)
+
+    def testRepeatedShapeIsConvertedOnce(self):
+        shape = triangle()
+        converted = []
+        real_shape_to_arrays = batch.shape_to_arrays
+        def counting(shape, format):
+            converted.append(shape)
+            return real_shape_to_arrays(shape, format)
+        batch.shape_to_arrays = counting
+        try:
+            _, indices, item_indices = merge_shapes([shape, shape])
+        finally:
+            batch.shape_to_arrays = real_shape_to_arrays
+
+        self.assertEqual(converted, [shape])
+        self.assertEqual(indices.tolist(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(item_indices.tolist(), [0, 0, 0, 1, 1, 1])
+
+    def testShapeWithOwnArrays(self):
+        arrays = shape_to_arrays(triangle())
+
+        class Provided(object):
+            def glyph_arrays(self, format, instanced):
+                return arrays
+
+        vertices, indices, _ = merge_shapes([Provided()])
+
+        self.assertEqual(vertices.tolist(), arrays[0].tolist())
+        self.assertEqual(indices.tolist(), arrays[1].tolist())
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        self.gl = RecordingGL()
+        self.real_gl = glyph.GL
+        glyph.GL = vertex_format.GL = batch.GL = self.gl
+
+    def tearDown(self):
+        glyph.GL = vertex_format.GL = batch.GL = self.real_gl
+
+    def testDrawsAllItemsInOneCall(self):
+        b = Batch(FakeShader())
+        for x in range(3):
+            b.add(gameitem.GameItem(
+                shape=triangle(), position=Vector(x, 0, 0)))
+
+        b.draw(IDENTITY, IDENTITY)
+
+        self.assertEqual(
+            self.gl.args('glDrawElements'),
+            [(glyph.GL.GL_TRIANGLES, 9, glyph.GL.GL_UNSIGNED_INT, None)]
+        )
+        transforms = self.gl.args('glBufferData')[-1][2]
+        self.assertEqual(transforms.shape, (3, 16))
+
+    def testRebuildsOnlyWhenItemsChange(self):
+        b = Batch(FakeShader())
+        item = gameitem.GameItem(shape=triangle(), position=Vector(0, 0, 0))
+        b.add(item)
+        b.draw(IDENTITY, IDENTITY)
+        vao = b.glyph.vao
+
+        b.draw(IDENTITY, IDENTITY)
+        self.assertEqual(b.glyph.vao, vao)
+
+        b.remove(item)
+        b.draw(IDENTITY, IDENTITY)
+        self.assertIsNone(b.glyph)
+        self.assertEqual(self.gl.args('glDrawElements')[2:], [])
+
+
+if __name__ == '__main__':
+    main()
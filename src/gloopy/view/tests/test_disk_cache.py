@@ -0,0 +1,168 @@
+import os
+import random
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ...shapes.cube import Cube
+from ...shapes.cube_groups import CubeGlob
+from ..disk_cache import CachedShape, DiskCache, generate
+from ..shape_to_glyph import (
+    glyph_factory, shape_to_arrays, shape_to_instanced_arrays,
+)
+
+
+calls = []
+
+def counted_cube(edge, rng):
+    calls.append(edge)
+    return Cube(edge, Color.Random(rng))
+
+
+class DiskCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        del calls[:]
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+
+class TestDiskCache(DiskCacheTestCase):
+
+    def testKey(self):
+        key = DiskCache.key('cube', dict(a=1, b=2), 0)
+        self.assertEqual(key, DiskCache.key('cube', dict(b=2, a=1), 0))
+        self.assertNotEqual(key, DiskCache.key('cube', dict(a=1, b=3), 0))
+        self.assertNotEqual(key, DiskCache.key('cube', dict(a=1, b=2), 1))
+        self.assertNotEqual(key, DiskCache.key('glob', dict(a=1, b=2), 0))
+
+    def testSaveAndLoad(self):
+        cache = DiskCache(self.directory)
+        vertices = numpy.arange(20, dtype=numpy.float32)
+        indices = numpy.array([0, 1, 2], dtype=numpy.uint8)
+        self.assertIsNone(cache.load('abc'))
+
+        cache.save('abc', vertices, indices)
+        loaded_vertices, loaded_indices = cache.load('abc')
+
+        self.assertIsInstance(loaded_vertices, numpy.memmap)
+        self.assertEqual(loaded_vertices.tolist(), vertices.tolist())
+        self.assertEqual(loaded_indices.dtype, numpy.uint8)
+        self.assertEqual(loaded_indices.tolist(), [0, 1, 2])
+
+    def testEvictsLeastRecentlyUsed(self):
+        array = numpy.zeros(1000, dtype=numpy.float32)
+        indices = numpy.zeros(0, dtype=numpy.uint8)
+        cache = DiskCache(self.directory, max_bytes=10000)
+        for age, key in enumerate(['old', 'used', 'new']):
+            cache.save(key, array, indices)
+            for path in cache._paths(key)[:2]:
+                os.utime(path, (age, age))
+        cache.load('used')
+
+        cache.save('newest', array, indices)
+
+        self.assertLessEqual(cache.size(), 10000)
+        self.assertIsNone(cache.load('old'))
+        self.assertIsNone(cache.load('new'))
+        self.assertIsNotNone(cache.load('used'))
+        self.assertIsNotNone(cache.load('newest'))
+
+    def testGenerateIsRepeatable(self):
+        params = dict(size=1, radius=5, number=3, colors=Color.Red)
+        state = random.getstate()
+        glob1 = generate(CubeGlob, params, 7)
+        glob2 = generate(CubeGlob, params, 7)
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(
+            glob1.vertices.array.tolist(), glob2.vertices.array.tolist())
+
+    def testArraysGeneratesOnlyOnce(self):
+        cache = DiskCache(self.directory)
+        vertices, indices = cache.arrays(counted_cube, dict(edge=2), seed=3)
+        expected = shape_to_arrays(generate(counted_cube, dict(edge=2), 3))
+        self.assertEqual(len(calls), 2)
+
+        vertices, indices = DiskCache(self.directory).arrays(
+            counted_cube, dict(edge=2), seed=3)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(vertices.tolist(), expected[0].tolist())
+        self.assertEqual(indices.tolist(), expected[1].tolist())
+
+
+class TestCachedShape(DiskCacheTestCase):
+
+    def testGlyphArraysDoNotGenerateWhenCached(self):
+        cache = DiskCache(self.directory)
+        cache.arrays(counted_cube, dict(edge=2))
+        shape = CachedShape(cache, counted_cube, dict(edge=2))
+
+        shape.glyph_arrays()
+
+        self.assertEqual(len(calls), 1)
+
+    def testOnlyBuildGeneratesRealShape(self):
+        shape = CachedShape(
+            DiskCache(self.directory), counted_cube, dict(edge=2))
+        with self.assertRaises(AttributeError):
+            shape.faces
+        self.assertIsNone(shape.shape)
+        self.assertEqual(calls, [])
+
+        real = shape.build()
+
+        self.assertIs(shape.shape, real)
+        self.assertEqual(len(real.faces), 6)
+        self.assertIs(shape.build(), real)
+        self.assertEqual(calls, [2])
+
+    def testRepeatedChildIsCachedInstanced(self):
+        params = dict(size=1, radius=5, number=3, colors=Color.Red)
+        expected = shape_to_instanced_arrays(generate(CubeGlob, params, 0))
+        shape = CachedShape(DiskCache(self.directory), CubeGlob, params)
+        shape.glyph_arrays()
+
+        arrays = CachedShape(
+            DiskCache(self.directory), CubeGlob, params).glyph_arrays()
+
+        self.assertEqual(len(arrays), 3)
+        self.assertIsInstance(arrays[2], numpy.memmap)
+        for array, expected_array in zip(arrays, expected):
+            self.assertEqual(array.tolist(), expected_array.tolist())
+        self.assertIn('instances', glyph_factory(shape).keywords)
+        flat = shape.glyph_arrays(instanced=False)
+        self.assertEqual(len(flat), 2)
+        self.assertEqual(len(flat[1]), len(expected[1]) * 3)
+
+    def testModifiedShapeIsReconverted(self):
+        cache = DiskCache(self.directory)
+        shape = CachedShape(cache, counted_cube, dict(edge=2))
+        before, _ = shape.glyph_arrays()
+        real = shape.build()
+
+        real.vertices = real.vertices * 2
+
+        after, _ = shape.glyph_arrays()
+        self.assertEqual(after[:3].tolist(), (before[:3] * 2).tolist())
+
+    def testChangedIsForwarded(self):
+        shape = CachedShape(
+            DiskCache(self.directory), counted_cube, dict(edge=2))
+        fired = []
+        shape.changed += fired.append
+        self.assertEqual(calls, [])
+        real = shape.build()
+
+        with real.edit():
+            real.faces[0].color = Color.Red
+
+        self.assertEqual(fired, [shape])
+
+if __name__ == '__main__':
+    main()
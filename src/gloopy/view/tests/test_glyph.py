@@ -0,0 +1,293 @@
+from array import array
+from unittest import TestCase, main
+
+import numpy
+
+from ...geom.transform import Transform
+from .. import glyph, render, vertex_format
+from ..glyph import Glyph, StreamingGlyph, glarray, glindexarray
+from ..vertex_format import FLOAT, PACKED
+from .recording_gl import RecordingGL
+
+
+class FakeShader(object):
+
+    attrib = dict(position=0, color=1, normal=2, instance=3)
+
+
+class GlyphTestCase(TestCase):
+
+    def setUp(self):
+        self.gl = RecordingGL()
+        self.real_gl = glyph.GL
+        glyph.GL = self.gl
+        vertex_format.GL = self.gl
+
+    def tearDown(self):
+        glyph.GL = self.real_gl
+        vertex_format.GL = self.real_gl
+
+
+class TestGlarray(TestCase):
+
+    def testNumpyArrayIsNotCopied(self):
+        vertices = numpy.arange(20, dtype=numpy.float32)
+        self.assertTrue(numpy.shares_memory(
+            glarray(glyph.GL.GLfloat, vertices), vertices))
+
+    def testBuffersAreNotCopied(self):
+        vertices = array('f', range(20))
+        result = glarray(glyph.GL.GLfloat, memoryview(vertices))
+        vertices[3] = 99
+        self.assertEqual(result[3], 99)
+
+        result = glarray(glyph.GL.GLfloat, vertices)
+        vertices[4] = 99
+        self.assertEqual(result[4], 99)
+
+    def testSequencesAreConverted(self):
+        result = glarray(glyph.GL.GLfloat, [1, 2, 3])
+        self.assertEqual(result.dtype, numpy.float32)
+        self.assertEqual(result.tolist(), [1, 2, 3])
+
+    def testIndexArrayTypeFromVertexCount(self):
+        self.assertEqual(glindexarray(255, [0, 1, 2]).dtype, numpy.uint8)
+        self.assertEqual(glindexarray(256, [0, 1, 2]).dtype, numpy.uint16)
+        self.assertEqual(glindexarray(65536, [0, 1, 2]).dtype, numpy.uint32)
+
+    def testIndexArrayKeepsUnsignedTypes(self):
+        indices = numpy.array([0, 1, 2], dtype=numpy.uint32)
+        self.assertIs(glindexarray(3, indices), indices)
+        indices = array('H', [0, 1, 2])
+        result = glindexarray(3, indices)
+        self.assertEqual(result.dtype, numpy.uint16)
+        indices[0] = 9
+        self.assertEqual(result[0], 9)
+
+
+class TestGlyph(GlyphTestCase):
+
+    def testUploadsBothBuffersWithoutCopying(self):
+        vertices = numpy.zeros(40, dtype=numpy.float32)
+        indices = numpy.array([0, 1, 2, 0, 2, 3], dtype=numpy.uint8)
+
+        Glyph(vertices, indices, FakeShader())
+
+        data = self.gl.args('glBufferData')
+        self.assertEqual(len(data), 2)
+        (vtarget, vsize, varray, _), (itarget, isize, iarray, _) = data
+        self.assertEqual(vtarget, glyph.GL.GL_ARRAY_BUFFER)
+        self.assertEqual(vsize, 160)
+        self.assertTrue(numpy.shares_memory(varray, vertices))
+        self.assertEqual(itarget, glyph.GL.GL_ELEMENT_ARRAY_BUFFER)
+        self.assertEqual(isize, 6)
+        self.assertTrue(numpy.shares_memory(iarray, indices))
+
+    def testIndexBufferIsBoundInsideVao(self):
+        g = Glyph(
+            numpy.zeros(40, dtype=numpy.float32), [0, 1, 2], FakeShader())
+
+        calls = self.gl.calls
+        vao_bound = calls.index(('glBindVertexArray', (g.vao,)))
+        vao_unbound = calls.index(('glBindVertexArray', (0,)))
+        element_bound = calls.index(
+            ('glBindBuffer', (glyph.GL.GL_ELEMENT_ARRAY_BUFFER, g.ibo)))
+        self.assertTrue(vao_bound < element_bound < vao_unbound)
+        # the element array buffer is not unbound while the VAO is bound
+        self.assertNotIn(
+            ('glBindBuffer', (glyph.GL.GL_ELEMENT_ARRAY_BUFFER, 0)),
+            calls[vao_bound:vao_unbound]
+        )
+
+    def testIndexCountAndType(self):
+        g = Glyph(numpy.zeros(300 * 10), range(12), FakeShader())
+        self.assertEqual(g.index_count, 12)
+        self.assertEqual(g.index_type, glyph.GL.GL_UNSIGNED_SHORT)
+
+    def testPackedFormat(self):
+        vertices = PACKED.pack(
+            numpy.zeros((3, 3)), numpy.zeros((3, 4)), numpy.zeros((3, 3)))
+
+        g = Glyph(vertices, [0, 1, 2], FakeShader())
+
+        self.assertIs(g.format, PACKED)
+        self.assertEqual(self.gl.args('glBufferData')[0][1], 60)
+        self.assertEqual(
+            [args[:5] for args in self.gl.args('glVertexAttribPointer')],
+            [
+                (0, 3, glyph.GL.GL_FLOAT, False, 20),
+                (1, 4, glyph.GL.GL_UNSIGNED_BYTE, True, 20),
+                (2, 3, glyph.GL.GL_BYTE, True, 20),
+            ]
+        )
+
+    def testDelete(self):
+        g = Glyph(numpy.zeros(30), [0, 1, 2], FakeShader())
+        vao, vbo, ibo = g.vao, g.vbo, g.ibo
+        g.delete()
+        self.assertEqual(self.gl.args('glDeleteVertexArrays'), [(1, [vao])])
+        self.assertEqual(self.gl.args('glDeleteBuffers'), [(2, [vbo, ibo])])
+
+
+    def testInstances(self):
+        instances = numpy.tile(
+            numpy.eye(4, dtype=numpy.float32).ravel(), (5, 1))
+
+        g = Glyph(
+            numpy.zeros(30), [0, 1, 2], FakeShader(), instances=instances)
+
+        self.assertEqual(g.instance_count, 5)
+        self.assertEqual(
+            self.gl.args('glBufferData')[2][:2],
+            (glyph.GL.GL_ARRAY_BUFFER, 5 * 64)
+        )
+        self.assertEqual(
+            [args[:5] for args in self.gl.args('glVertexAttribPointer')[3:]],
+            [(location, 4, glyph.GL.GL_FLOAT, False, 64)
+                for location in range(3, 7)]
+        )
+        self.assertEqual(
+            self.gl.args('glVertexAttribDivisor'),
+            [(location, 1) for location in range(3, 7)]
+        )
+
+        buffers = [g.vbo, g.ibo, g.instance_vbo]
+        g.delete()
+        self.assertEqual(self.gl.args('glDeleteBuffers'), [(3, buffers)])
+
+
+class TestStreamingGlyph(GlyphTestCase):
+
+    def chunks(self):
+        for first in (0, 3):
+            yield (
+                numpy.zeros(30, dtype=numpy.float32),
+                numpy.arange(first, first + 3, dtype=numpy.uint8),
+            )
+
+    def testAllocatesFullSizeBuffers(self):
+        g = StreamingGlyph(self.chunks(), 6, 6, FakeShader(), FLOAT)
+
+        self.assertEqual(
+            [args[:3] for args in self.gl.args('glBufferData')],
+            [
+                (glyph.GL.GL_ARRAY_BUFFER, 240, None),
+                (glyph.GL.GL_ELEMENT_ARRAY_BUFFER, 6, None),
+            ]
+        )
+        self.assertEqual(g.index_count, 0)
+        self.assertEqual(g.index_type, glyph.GL.GL_UNSIGNED_BYTE)
+        self.assertFalse(g.loaded)
+
+    def testUploadsOneChunkAtATime(self):
+        g = StreamingGlyph(self.chunks(), 6, 6, FakeShader(), FLOAT)
+
+        self.assertEqual(g.upload_next(), 123)
+        self.assertEqual(g.index_count, 3)
+        self.assertEqual(g.upload_next(), 123)
+        self.assertEqual(g.index_count, 6)
+        self.assertEqual(g.upload_next(), 0)
+        self.assertTrue(g.loaded)
+
+        self.assertEqual(
+            [args[:3] for args in self.gl.args('glBufferSubData')],
+            [
+                (glyph.GL.GL_ARRAY_BUFFER, 0, 120),
+                (glyph.GL.GL_ELEMENT_ARRAY_BUFFER, 0, 3),
+                (glyph.GL.GL_ARRAY_BUFFER, 120, 120),
+                (glyph.GL.GL_ELEMENT_ARRAY_BUFFER, 3, 3),
+            ]
+        )
+
+    def testDeleteStopsUpload(self):
+        g = StreamingGlyph(self.chunks(), 6, 6, FakeShader(), FLOAT)
+        g.upload_next()
+
+        g.delete()
+
+        self.assertEqual(g.upload_next(), 0)
+        self.assertEqual(len(self.gl.args('glBufferSubData')), 2)
+
+
+IDENTITY = numpy.identity(4, dtype=numpy.float32).reshape(16)
+
+
+class FakeRender(object):
+
+    class projection(object):
+        matrix = 'projection matrix'
+
+    class modelview(object):
+        matrix = 'view matrix'
+
+
+class MatrixRecordingShader(FakeShader):
+
+    def __init__(self):
+        self.matrices = []
+
+    def use(self):
+        pass
+
+    def set_matrix(self, name, matrix):
+        self.matrices.append((name, matrix))
+
+
+class TestDrawWorldItems(GlyphTestCase):
+
+    def setUp(self):
+        GlyphTestCase.setUp(self)
+        self.real_render_gl = render.gl
+        render.gl = self.gl
+
+    def tearDown(self):
+        render.gl = self.real_render_gl
+        GlyphTestCase.tearDown(self)
+
+    def testDrawsFromIndexBuffer(self):
+        shader = MatrixRecordingShader()
+        g = Glyph(numpy.zeros(30), [0, 1, 2], shader)
+        self.gl.calls = []
+
+        render.Render.draw_world_items(FakeRender, [(IDENTITY, g)])
+
+        self.assertEqual(
+            self.gl.args('glDrawElements'),
+            [(glyph.GL.GL_TRIANGLES, 3, glyph.GL.GL_UNSIGNED_BYTE, None)]
+        )
+
+    def testSetsMatrixUniforms(self):
+        shader = MatrixRecordingShader()
+        g = Glyph(numpy.zeros(30), [0, 1, 2], shader)
+
+        render.Render.draw_world_items(FakeRender, [
+            (Transform((1, 2, 3)).array, g),
+            (Transform((4, 5, 6)).array, g),
+        ])
+
+        names = [name for name, _ in shader.matrices]
+        self.assertEqual(
+            names, ['projection', 'view', 'model', 'model'])
+        self.assertEqual(shader.matrices[0][1], 'projection matrix')
+        self.assertEqual(shader.matrices[1][1], 'view matrix')
+        self.assertEqual(shader.matrices[2][1][12:].tolist(), [1, 2, 3, 1])
+        self.assertEqual(shader.matrices[3][1][12:].tolist(), [4, 5, 6, 1])
+        self.assertNotIn('glPushMatrix', self.gl.names())
+
+    def testDrawsInstances(self):
+        shader = MatrixRecordingShader()
+        instances = numpy.zeros((7, 16), dtype=numpy.float32)
+        g = Glyph(numpy.zeros(30), [0, 1, 2], shader, instances=instances)
+        self.gl.calls = []
+
+        render.Render.draw_world_items(FakeRender, [(IDENTITY, g)])
+
+        self.assertEqual(self.gl.args('glDrawElements'), [])
+        self.assertEqual(
+            self.gl.args('glDrawElementsInstanced'),
+            [(glyph.GL.GL_TRIANGLES, 3, glyph.GL.GL_UNSIGNED_BYTE, None, 7)]
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+from unittest import TestCase, main
+
+from ...color import Color
+from ...shapes.cube import Cube
+from ..glyph_cache import GlyphCache, fingerprint
+
+
+class FakeGlyph(object):
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class TestGlyphCache(TestCase):
+
+    def testSharedShapeSharesGlyph(self):
+        cache = GlyphCache(FakeGlyph)
+        shape = Cube(1, Color.Red)
+        glyph1 = cache.acquire(shape)
+        glyph2 = cache.acquire(shape)
+        self.assertIs(glyph1, glyph2)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.refcount(glyph1), 2)
+
+    def testDistinctShapesGetDistinctGlyphs(self):
+        cache = GlyphCache(FakeGlyph)
+        glyph1 = cache.acquire(Cube(1, Color.Red))
+        glyph2 = cache.acquire(Cube(1, Color.Red))
+        self.assertIsNot(glyph1, glyph2)
+        self.assertEqual(len(cache), 2)
+
+    def testNone(self):
+        cache = GlyphCache(FakeGlyph)
+        self.assertIsNone(cache.acquire(None))
+        cache.release(None)
+        self.assertEqual(len(cache), 0)
+
+    def testReleaseDeletesWhenUnreferenced(self):
+        cache = GlyphCache(FakeGlyph)
+        shape = Cube(1, Color.Red)
+        glyph = cache.acquire(shape)
+        cache.acquire(shape)
+
+        cache.release(glyph)
+        self.assertFalse(glyph.deleted)
+        cache.release(glyph)
+        self.assertTrue(glyph.deleted)
+        self.assertEqual(len(cache), 0)
+
+        self.assertIsNot(cache.acquire(shape), glyph)
+
+    def testDiscard(self):
+        cache = GlyphCache(FakeGlyph)
+        shape = Cube(1, Color.Red)
+        old = cache.acquire(shape)
+        cache.discard(shape)
+        new = cache.acquire(shape)
+        self.assertIsNot(old, new)
+        self.assertFalse(old.deleted)
+
+        cache.release(old)
+        self.assertTrue(old.deleted)
+        self.assertEqual(cache.refcount(new), 1)
+
+    def testFingerprint(self):
+        self.assertEqual(
+            fingerprint(Cube(1, Color.Red)),
+            fingerprint(Cube(1, Color.Red))
+        )
+        self.assertNotEqual(
+            fingerprint(Cube(1, Color.Red)),
+            fingerprint(Cube(1, Color.Blue))
+        )
+        self.assertNotEqual(
+            fingerprint(Cube(1, Color.Red)),
+            fingerprint(Cube(2, Color.Red))
+        )
+
+    def testIdenticalContentSharesGlyph(self):
+        cache = GlyphCache(FakeGlyph, fingerprint=fingerprint)
+        glyph1 = cache.acquire(Cube(1, Color.Red))
+        glyph2 = cache.acquire(Cube(1, Color.Red))
+        glyph3 = cache.acquire(Cube(1, Color.Blue))
+        self.assertIs(glyph1, glyph2)
+        self.assertIsNot(glyph1, glyph3)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    main()
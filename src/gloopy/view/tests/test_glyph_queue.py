@@ -0,0 +1,120 @@
+from unittest import TestCase, main
+
+from ...color import Color
+from ...gameitem import GameItem
+from ...geom.vector import Vector
+from ...shapes.cube import Cube
+from ..glyph_cache import GlyphCache
+from ..glyph_queue import GlyphQueue
+from ..modelview import look_at
+from .test_glyph_cache import FakeGlyph
+
+
+# a camera at the origin, looking along -z
+VIEW = look_at((0, 0, 0), (0, 0, -1), (0, 1, 0))
+
+
+class TestGlyphQueue(TestCase):
+
+    def setUp(self):
+        self.cache = GlyphCache(FakeGlyph)
+        self.queue = GlyphQueue(self.cache)
+
+    def testAddDefersConversion(self):
+        item = GameItem(shape=Cube(1, Color.Red))
+
+        self.queue.add(item)
+
+        self.assertEqual(item.glyph, [None])
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(len(self.queue), 1)
+
+        self.queue.convert(VIEW, 1)
+
+        self.assertIs(item.glyph[0].shape, item.shape)
+        self.assertEqual(len(self.queue), 0)
+
+    def testCachedShapesAreNotQueued(self):
+        shape = Cube(1, Color.Red)
+        glyph = self.cache.acquire(shape)
+        item = GameItem(shape=[shape, None])
+
+        self.queue.add(item)
+
+        self.assertEqual(item.glyph, [glyph, None])
+        self.assertEqual(len(self.queue), 0)
+        self.assertEqual(self.cache.refcount(glyph), 2)
+
+    def testConvertsAtLeastOnePerCall(self):
+        items = [GameItem(shape=Cube(1, Color.Red)) for _ in range(3)]
+        for item in items:
+            self.queue.add(item)
+
+        self.assertEqual(self.queue.convert(VIEW, 0), 1)
+        self.assertEqual(len(self.queue), 2)
+
+    def testPriority(self):
+        behind = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, 1))
+        far = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -9))
+        near = GameItem(
+            shape=[Cube(1, Color.Red), Cube(1, Color.Red)],
+            position=Vector(0, 0, -3),
+            frame=1,
+        )
+        for item in [behind, far, near]:
+            self.queue.add(item)
+
+        order = []
+        while len(self.queue):
+            self.queue.convert(VIEW, 0)
+            for item in [behind, far, near]:
+                for frame, glyph in enumerate(item.glyph):
+                    if glyph is not None and (item, frame) not in order:
+                        order.append((item, frame))
+
+        self.assertEqual(
+            order, [(near, 1), (far, 0), (behind, 0), (near, 0)])
+
+    def testOrderKeptUntilCameraMoves(self):
+        first = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -5))
+        second = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -6))
+        third = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -7))
+        for item in [first, second, third]:
+            self.queue.add(item)
+        self.queue.convert(VIEW, 0)
+        self.assertIsNotNone(first.glyph[0])
+
+        # not sorted again for a small camera movement
+        third.position = Vector(0, 0, -1)
+        self.queue.convert(look_at((0, 0, -0.05), (0, 0, -1), (0, 1, 0)), 0)
+        self.assertIsNotNone(second.glyph[0])
+        self.assertIsNone(third.glyph[0])
+
+    def testSortedAgainWhenCameraMoves(self):
+        near = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -5))
+        far = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, -9))
+        self.queue.add(near)
+        self.queue.add(far)
+        self.queue.convert(VIEW, 0)
+        self.assertIsNotNone(near.glyph[0])
+        later = GameItem(shape=Cube(1, Color.Red), position=Vector(0, 0, 5))
+        self.queue.add(later)
+
+        # turn around, so that the item added last is in front
+        self.queue.convert(look_at((0, 0, 0), (0, 0, 1), (0, 1, 0)), 0)
+
+        self.assertIsNotNone(later.glyph[0])
+        self.assertIsNone(far.glyph[0])
+
+    def testRemove(self):
+        item = GameItem(shape=Cube(1, Color.Red))
+        self.queue.add(item)
+
+        self.queue.remove(item)
+
+        self.assertEqual(self.queue.convert(VIEW, 1), 0)
+        self.assertEqual(item.glyph, [None])
+
+
+if __name__ == '__main__':
+    main()
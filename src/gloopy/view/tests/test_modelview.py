@@ -0,0 +1,39 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ..modelview import look_at
+
+
+def transform(matrix, point):
+    # matrix is column-major, so transforms row vectors on the left
+    return (numpy.append(point, 1) @ matrix)[:3]
+
+
+class TestLookAt(TestCase):
+
+    def testEyeIsOrigin(self):
+        matrix = look_at((1, 2, 3), (4, 5, 6), (0, 1, 0))
+
+        self.assertTrue(numpy.allclose(
+            transform(matrix, (1, 2, 3)), (0, 0, 0), atol=1e-6))
+
+    def testTargetIsAlongNegativeZ(self):
+        matrix = look_at((1, 2, 3), (1, 2, -7), (0, 1, 0))
+
+        self.assertTrue(numpy.allclose(
+            transform(matrix, (1, 2, -7)), (0, 0, -10), atol=1e-5))
+        self.assertTrue(numpy.allclose(
+            transform(matrix, (1, 5, 3)), (0, 3, 0), atol=1e-5))
+        self.assertTrue(numpy.allclose(
+            transform(matrix, (2, 2, 3)), (1, 0, 0), atol=1e-5))
+
+    def testDtype(self):
+        matrix = look_at((0, 0, 1), (0, 0, 0), (0, 1, 0))
+
+        self.assertEqual(matrix.dtype, numpy.float32)
+        self.assertEqual(matrix.shape, (4, 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ..projection import perspective
+
+
+def project(matrix, point):
+    clip = numpy.append(point, 1) @ matrix
+    return clip[:3] / clip[3]
+
+
+class TestPerspective(TestCase):
+
+    def testNearAndFarPlanes(self):
+        matrix = perspective(90, 2, 1, 100)
+
+        self.assertTrue(numpy.allclose(
+            project(matrix, (0, 0, -1)), (0, 0, -1), atol=1e-6))
+        self.assertTrue(numpy.allclose(
+            project(matrix, (0, 0, -100)), (0, 0, 1), atol=1e-6))
+
+    def testFieldOfViewAndAspect(self):
+        matrix = perspective(90, 2, 1, 100)
+
+        # at 90 degrees, the top of the view is as high as it is distant
+        self.assertTrue(numpy.allclose(
+            project(matrix, (0, 10, -10))[:2], (0, 1), atol=1e-6))
+        self.assertTrue(numpy.allclose(
+            project(matrix, (20, 0, -10))[:2], (1, 0), atol=1e-6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import random
+from itertools import chain
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ...shapes.cube import Cube, TruncatedCube
+from ...shapes.cube_groups import CubeCross, CubeGlob
+from ...shapes.multishape import MultiShape
+from ...shapes.ring import TriRings
+from ...shapes.dodecahedron import Dodecahedron
+from ...shapes.subdivide import subdivide
+from ...shapes.tetrahedron import DualTetrahedron, Tetrahedron
+from .. import shape_to_glyph
+from ..shape_to_glyph import (
+    glyph_factory, shape_to_arrays, shape_to_instanced_arrays, stream_arrays,
+    _tessellate,
+)
+
+
+def face_by_face(shape):
+    '''
+    The original, face by face implementation of shape_to_glyph, which
+    shape_to_arrays must reproduce.
+    '''
+    vertices = []
+    indices = []
+    next_index = 0
+    for face in shape.faces:
+        new_indices = {}
+        for index in range(1, len(face) - 1):
+            for old_index in (face[0], face[index], face[index + 1]):
+                if old_index not in new_indices:
+                    vertices.extend( chain(
+                        shape.vertices[old_index], face.color, face.normal
+                    ) )
+                    new_indices[old_index] = next_index
+                    next_index += 1
+                indices.append(new_indices[old_index])
+    return vertices, indices
+
+
+class TestShapeToGlyph(TestCase):
+
+    def assertSameAsFaceByFace(self, shape):
+        vertices, indices = shape_to_arrays(shape)
+        expected_vertices, expected_indices = face_by_face(shape)
+        self.assertEqual(vertices.dtype, numpy.float32)
+        self.assertEqual(indices.tolist(), expected_indices)
+        numpy.testing.assert_allclose(
+            vertices, expected_vertices, rtol=0, atol=1e-6)
+
+    def testTessellate(self):
+        self.assertEqual(
+            _tessellate(numpy.array([0, 5, 8])).tolist(),
+            [0, 1, 2,  0, 2, 3,  0, 3, 4,  5, 6, 7]
+        )
+
+    def testShapes(self):
+        self.assertSameAsFaceByFace(Cube(1, Color.Red))
+        self.assertSameAsFaceByFace(TruncatedCube(1, 0.5, Color.Red))
+        self.assertSameAsFaceByFace(Dodecahedron(1, Color.Blue))
+
+    def testModifiedShape(self):
+        shape = Tetrahedron(1, Color.Red)
+        subdivide(shape, color=Color.Blue)
+        self.assertSameAsFaceByFace(shape)
+
+    def testMultiShapes(self):
+        self.assertSameAsFaceByFace(DualTetrahedron(1, Color.Red))
+        self.assertSameAsFaceByFace(CubeCross(1, Color.Red, Color.Blue))
+
+    def testChunked(self):
+        shape = Dodecahedron(1, Color.Blue)
+        subdivide(shape, color=Color.Red)
+        expected_vertices, expected_indices = shape_to_arrays(shape)
+        min_chunk = shape_to_glyph.MIN_CHUNK
+        shape_to_glyph.MIN_CHUNK = 10
+        try:
+            vertices, indices = shape_to_arrays(shape, workers=3)
+        finally:
+            shape_to_glyph.MIN_CHUNK = min_chunk
+        self.assertEqual(indices.dtype, expected_indices.dtype)
+        self.assertEqual(indices.tolist(), expected_indices.tolist())
+        self.assertEqual(vertices.tolist(), expected_vertices.tolist())
+
+    def testStreamArrays(self):
+        shape = Dodecahedron(1, Color.Blue)
+        subdivide(shape, color=Color.Red)
+        expected_vertices, expected_indices = shape_to_arrays(shape)
+
+        chunks, vertex_count, index_count, format = stream_arrays(
+            shape, None, 10)
+        chunks = list(chunks)
+
+        self.assertEqual(len(chunks), (len(shape.faces) + 9) // 10)
+        vertices = numpy.concatenate([vertices for vertices, _ in chunks])
+        indices = numpy.concatenate([indices for _, indices in chunks])
+        self.assertEqual(format.count(vertices), vertex_count)
+        self.assertEqual(len(indices), index_count)
+        self.assertEqual(indices.dtype, expected_indices.dtype)
+        self.assertEqual(indices.tolist(), expected_indices.tolist())
+        self.assertEqual(
+            vertices.tobytes(), shape_to_arrays(shape, format)[0].tobytes())
+
+    def testGlyphFactoryPreloadsChunks(self):
+        shape = Dodecahedron(1, Color.Blue)
+        subdivide(shape, color=Color.Red)
+
+        lazy = glyph_factory(shape, chunk_faces=10)
+        preloaded = glyph_factory(shape, chunk_faces=10, preload=True)
+
+        self.assertNotIsInstance(lazy.args[0], list)
+        chunks = preloaded.args[0]
+        self.assertIsInstance(chunks, list)
+        self.assertEqual(
+            numpy.concatenate([vertices for vertices, _ in chunks]).tolist(),
+            shape_to_arrays(shape)[0].tolist())
+
+    def testIndexType(self):
+        _, indices = shape_to_arrays(Cube(1, Color.Red))
+        self.assertEqual(indices.dtype, numpy.uint8)
+        _, indices = shape_to_arrays(Dodecahedron(1, Color.Red))
+        self.assertEqual(indices.dtype, numpy.uint8)
+
+
+class TestShapeToInstancedArrays(TestCase):
+
+    def testRepeatedChild(self):
+        random.seed(0)
+        for shape in [
+            CubeGlob(1, 10, 5, Color.Red),
+            TriRings(Cube(1, Color.Red), 5, 4),
+        ]:
+            vertices, indices, instances = shape_to_instanced_arrays(shape)
+            flat_vertices, flat_indices = shape_to_arrays(shape)
+            vertices = vertices.reshape(-1, 10)
+            flat_vertices = flat_vertices.reshape(len(instances), -1, 10)
+            self.assertEqual(instances.dtype, numpy.float32)
+            self.assertEqual(len(flat_indices), len(indices) * len(instances))
+
+            # transforming the one copy by each instance matrix gives the
+            # flattened vertices
+            for instance, expected in zip(instances, flat_vertices):
+                matrix = instance.reshape(4, 4).T
+                numpy.testing.assert_allclose(
+                    vertices[:, 0:3] @ matrix[:3, :3].T + matrix[:3, 3],
+                    expected[:, 0:3], atol=1e-4)
+                numpy.testing.assert_allclose(
+                    vertices[:, 3:7], expected[:, 3:7])
+                numpy.testing.assert_allclose(
+                    vertices[:, 7:10] @ matrix[:3, :3].T,
+                    expected[:, 7:10], atol=1e-5)
+
+    def testNotRepeated(self):
+        self.assertIsNone(shape_to_instanced_arrays(Cube(1, Color.Red)))
+        self.assertIsNone(shape_to_instanced_arrays(
+            CubeCross(1, Color.Red, Color.Blue)))
+        single = MultiShape()
+        single.add(Cube(1, Color.Red))
+        self.assertIsNone(shape_to_instanced_arrays(single))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+from unittest import TestCase, main
+
+import numpy
+
+from ...color import Color
+from ...shapes.cube import Cube
+from ...shapes.cube_groups import CubeCluster
+from ..shape_to_glyph import shape_to_arrays
+from ..vertex_format import (
+    FLOAT, FORMATS, PACKED, SHORT, compact_format, format_of, get_format,
+)
+
+
+class TestVertexFormat(TestCase):
+
+    def testLayoutsMatchAttributes(self):
+        for format in FORMATS.values():
+            if format is FLOAT:
+                continue
+            self.assertEqual(format.dtype.itemsize, format.stride)
+            for attribute in format.attributes:
+                self.assertEqual(
+                    format.dtype.fields[attribute.name][1], attribute.offset)
+
+    def testStrides(self):
+        self.assertEqual(FLOAT.stride, 40)
+        self.assertEqual(PACKED.stride, 20)
+        self.assertEqual(SHORT.stride, 16)
+
+    def testPack(self):
+        positions = numpy.array([[1, 2, 3], [-4, 5, 6]], dtype=numpy.float32)
+        colors = numpy.array([[1, 0, 0.5, 1], [0, 1, 0, 0.2]])
+        normals = numpy.array([[1, 0, 0], [0, -1, 0]])
+
+        vertices = PACKED.pack(positions, colors, normals)
+
+        self.assertEqual(vertices['position'].tolist(), positions.tolist())
+        self.assertEqual(
+            vertices['color'].tolist(), [[255, 0, 128, 255], [0, 255, 0, 51]])
+        self.assertEqual(
+            vertices['normal'].tolist(), [[127, 0, 0, 0], [0, -127, 0, 0]])
+        self.assertEqual(
+            SHORT.pack(positions, colors, normals)['position'].tolist(),
+            positions.tolist()
+        )
+        self.assertEqual(
+            FLOAT.pack(positions, colors, normals).tolist()[:10],
+            [1, 2, 3,  1, 0, 0.5, 1,  1, 0, 0]
+        )
+
+    def testCanPack(self):
+        self.assertTrue(SHORT.can_pack(numpy.array([[1, -2, 32767]])))
+        self.assertFalse(SHORT.can_pack(numpy.array([[1, -2, 0.5]])))
+        self.assertFalse(SHORT.can_pack(numpy.array([[1, -2, 32768]])))
+        self.assertTrue(PACKED.can_pack(numpy.array([[1, -2, 0.5]])))
+
+    def testFormatOf(self):
+        for format in FORMATS.values():
+            vertices = format.pack(
+                numpy.zeros((1, 3)), numpy.zeros((1, 4)), numpy.zeros((1, 3)))
+            self.assertIs(format_of(vertices), format)
+        self.assertIs(format_of([1.0] * 10), FLOAT)
+
+    def testGetFormat(self):
+        self.assertIs(get_format('packed'), PACKED)
+        self.assertIsNone(get_format('compact'))
+
+
+class TestShapeToArraysFormats(TestCase):
+
+    def testPackedMatchesFloat(self):
+        shape = Cube(1, Color(0.2, 0.4, 0.6))
+        expected, expected_indices = shape_to_arrays(shape)
+        expected = expected.reshape(-1, 10)
+
+        vertices, indices = shape_to_arrays(shape, PACKED)
+
+        self.assertEqual(indices.tolist(), expected_indices.tolist())
+        self.assertEqual(
+            vertices['position'].tolist(), expected[:, :3].tolist())
+        numpy.testing.assert_allclose(
+            vertices['color'] / 255, expected[:, 3:7], atol=0.5 / 255)
+        numpy.testing.assert_allclose(
+            vertices['normal'][:, :3] / 127, expected[:, 7:10], atol=0.5 / 127)
+
+    def testCompactFormat(self):
+        cluster = CubeCluster(
+            {(0, 0, 0): Color.Red, (2, 0, 0): Color.Blue}, edge=2)
+        vertices, _ = shape_to_arrays(cluster, None)
+        self.assertEqual(vertices.dtype, SHORT.dtype)
+        self.assertEqual(
+            vertices.nbytes * 2.5, shape_to_arrays(cluster)[0].nbytes)
+
+        vertices, _ = shape_to_arrays(Cube(1, Color.Red), None)
+        self.assertEqual(vertices.dtype, PACKED.dtype)
+
+    def testCompactFormatOfPositions(self):
+        self.assertIs(compact_format(numpy.array([[1.0, 2, 3]])), SHORT)
+        self.assertIs(compact_format(numpy.array([[1.5, 2, 3]])), PACKED)
+
+
+if __name__ == '__main__':
+    main()
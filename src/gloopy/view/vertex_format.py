@@ -0,0 +1,219 @@
+'''
+Layouts of the interleaved vertex attributes stored in a Glyph's VBO.
+
+Every layout provides the 'position', 'color' and 'normal' attributes which
+the lighting shader consumes. They differ in how many bytes each takes:
+
+| `FLOAT`: float32 position, color and normal. 40 bytes per vertex.
+| `PACKED`: float32 position, normalized unsigned byte color, normalized
+|     signed byte normal. 20 bytes per vertex, exactly half of FLOAT.
+| `SHORT`: as PACKED, but with int16 positions, for shapes whose vertices
+|     all lie on an integer grid, such as cube clusters. 16 bytes per vertex,
+|     40% of FLOAT.
+
+PACKED is as small as float32 positions allow: the normal already takes
+the four bytes which keep each vertex word-aligned, so packing it more
+tightly, as 2_10_10_10, would save nothing.
+'''
+from ctypes import c_void_p
+
+import numpy
+from OpenGL import GL
+
+
+class Attribute(object):
+    '''
+    Describes how one vertex attribute is stored within each vertex, in the
+    terms of glVertexAttribPointer.
+    '''
+    def __init__(self, name, size, gltype, normalized, offset):
+        self.name = name
+        self.size = size
+        self.gltype = gltype
+        self.normalized = normalized
+        self.offset = offset
+
+
+class VertexFormat(object):
+    '''
+    A layout of interleaved vertex attributes.
+
+    .. function:: __init__(name, dtype, stride, attributes)
+
+        `name`: a short string identifying this format
+
+        `dtype`: numpy dtype of the array returned by `pack`, either a
+        structured dtype with a field per attribute, or float32 for
+        a flat array of floats.
+
+        `stride`: number of bytes per vertex
+
+        `attributes`: a list of :class:`Attribute`
+    '''
+    def __init__(self, name, dtype, stride, attributes):
+        self.name = name
+        self.dtype = numpy.dtype(dtype)
+        self.stride = stride
+        self.attributes = attributes
+        if self.dtype.fields is None:
+            self.position_type = self.dtype
+        else:
+            self.position_type = self.dtype.fields['position'][0].base
+
+
+    def __repr__(self):
+        return '<VertexFormat %s>' % (self.name,)
+
+
+    def asarray(self, vertices):
+        '''
+        Return the given vertices, which may be any sequence or object
+        supporting the buffer protocol, as a contiguous numpy array of
+        self.dtype. Arrays already of the right type are not copied.
+        '''
+        if self.dtype.fields is None:
+            return numpy.ascontiguousarray(vertices, dtype=self.dtype)
+        if getattr(vertices, 'dtype', None) == self.dtype:
+            return numpy.ascontiguousarray(vertices)
+        return numpy.frombuffer(vertices, dtype=self.dtype)
+
+
+    def count(self, vertices):
+        '''
+        Return the number of vertices in the given array.
+        '''
+        return vertices.nbytes // self.stride
+
+
+    def pack(self, positions, colors, normals):
+        '''
+        Return a new array of len(positions) vertices in this format, from
+        arrays of N x 3 positions, N x 4 float colors and N x 3 unit normals.
+        '''
+        if self.dtype.fields is None:
+            vertices = numpy.empty((len(positions), 10), dtype=self.dtype)
+            vertices[:, 0:3] = positions
+            vertices[:, 3:7] = colors
+            vertices[:, 7:10] = normals
+            return vertices.ravel()
+
+        vertices = numpy.zeros(len(positions), dtype=self.dtype)
+        if self.position_type.kind == 'f':
+            vertices['position'] = positions
+        else:
+            vertices['position'] = numpy.round(positions)
+        vertices['color'] = numpy.round(
+            numpy.clip(colors, 0, 1) * 255).astype(numpy.uint8)
+        vertices['normal'][:, :3] = numpy.round(
+            numpy.clip(normals, -1, 1) * 127).astype(numpy.int8)
+        return vertices
+
+
+    def can_pack(self, positions):
+        '''
+        Return True if the given N x 3 positions can be stored exactly, give
+        or take floating point rounding errors.
+        '''
+        if self.position_type.kind == 'f':
+            return True
+        info = numpy.iinfo(self.position_type)
+        rounded = numpy.round(positions)
+        return bool(
+            numpy.allclose(positions, rounded, rtol=0, atol=1e-4) and
+            numpy.all(rounded >= info.min) and
+            numpy.all(rounded <= info.max)
+        )
+
+
+    def set_pointers(self, shader):
+        '''
+        Enable and point each of the given shader's vertex attributes at the
+        currently bound VBO, according to this format.
+        '''
+        for attribute in self.attributes:
+            location = shader.attrib[attribute.name]
+            GL.glEnableVertexAttribArray(location)
+            GL.glVertexAttribPointer(
+                location, attribute.size, attribute.gltype,
+                attribute.normalized, self.stride, c_void_p(attribute.offset)
+            )
+
+
+FLOAT = VertexFormat(
+    'float',
+    numpy.float32,
+    40,
+    [
+        Attribute('position', 3, GL.GL_FLOAT, False, 0),
+        Attribute('color', 4, GL.GL_FLOAT, False, 12),
+        Attribute('normal', 3, GL.GL_FLOAT, False, 28),
+    ],
+)
+
+# normals are padded to four bytes, to keep each vertex word-aligned
+PACKED = VertexFormat(
+    'packed',
+    [
+        ('position', numpy.float32, 3),
+        ('color', numpy.uint8, 4),
+        ('normal', numpy.int8, 4),
+    ],
+    20,
+    [
+        Attribute('position', 3, GL.GL_FLOAT, False, 0),
+        Attribute('color', 4, GL.GL_UNSIGNED_BYTE, True, 12),
+        Attribute('normal', 3, GL.GL_BYTE, True, 16),
+    ],
+)
+
+SHORT = VertexFormat(
+    'short',
+    [
+        ('position', numpy.int16, 3),
+        ('pad', numpy.int16),
+        ('color', numpy.uint8, 4),
+        ('normal', numpy.int8, 4),
+    ],
+    16,
+    [
+        Attribute('position', 3, GL.GL_SHORT, False, 0),
+        Attribute('color', 4, GL.GL_UNSIGNED_BYTE, True, 8),
+        Attribute('normal', 3, GL.GL_BYTE, True, 12),
+    ],
+)
+
+FORMATS = dict((format.name, format) for format in [FLOAT, PACKED, SHORT])
+
+
+def get_format(name):
+    '''
+    Return the vertex format with the given name, or None for 'compact',
+    which asks :func:`~gloopy.view.shape_to_glyph.shape_to_glyph` to choose
+    the most compact format for each shape.
+    '''
+    if name == 'compact':
+        return None
+    return FORMATS[name]
+
+
+def compact_format(positions):
+    '''
+    Return the smallest vertex format which can exactly store the given
+    N x 3 array of positions.
+    '''
+    if SHORT.can_pack(positions):
+        return SHORT
+    return PACKED
+
+
+def format_of(vertices):
+    '''
+    Return the vertex format of the given array of vertices, as returned
+    by some VertexFormat.pack(). Flat float arrays are FLOAT.
+    '''
+    dtype = getattr(vertices, 'dtype', None)
+    for format in FORMATS.values():
+        if dtype == format.dtype:
+            return format
+    return FLOAT
+
@@ -18,13 +18,21 @@ class World(object):
 
     ``self.item_removed``: event which is fired after an item is removed.
 
+    ``self.item_changed``: event which should be fired after an item's shape
+        is replaced or modified, by calling :meth:`changed`. This is done
+        automatically when the `changed` event of an item's shape fires, at
+        the end of each :meth:`~gloopy.shapes.shape.Shape.edit`.
+
     ``self.background_color``: color used to clear the screen before render
     '''
     def __init__(self, background=Color.Orange):
         self.items = {}
         self.item_added = Event()
         self.item_removed = Event()
+        self.item_changed = Event()
         self.background_color = background
+        # item id -> (shape events subscribed to, the listener subscribed)
+        self._watched = {}
 
     def __iter__(self):
         for item in self.items.values():
@@ -45,6 +53,7 @@ class World(object):
                 position = Vector(*position)
             item.position = position
         self.items[item.id] = item
+        self._watch(item)
         self.item_added.fire(item)
 
     def remove(self, item):
@@ -54,5 +63,43 @@ class World(object):
         Fires the self.item_removed event.
         '''
         del self.items[item.id]
+        self._unwatch(item)
         self.item_removed.fire(item)
 
+
+    def changed(self, item):
+        '''
+        Notify the world that the given item's shape has been replaced or
+        modified in-place, so that its glyph should be regenerated.
+
+        Fires the self.item_changed event.
+        '''
+        if item.id in self.items:
+            # the item's shape might have been replaced
+            self._watch(item)
+        self.item_changed.fire(item)
+
+
+    def _watch(self, item):
+        '''
+        Subscribe to the `changed` event of the item's shape, or shapes, so
+        that modifying them calls :meth:`changed`.
+        '''
+        self._unwatch(item)
+        shapes = item.shape if isinstance(item.shape, list) else [item.shape]
+        # MultiShapes, and missing shapes, have no changed event
+        events = [
+            shape.changed for shape in shapes
+            if isinstance(getattr(shape, 'changed', None), Event)
+        ]
+        listener = lambda shape: self.changed(item)
+        for event in events:
+            event += listener
+        self._watched[item.id] = (events, listener)
+
+
+    def _unwatch(self, item):
+        events, listener = self._watched.pop(item.id, ((), None))
+        for event in events:
+            event -= listener
+